@@ -7,9 +7,11 @@ from ...schemas.journals import (
     JournalListResponse
 )
 from ...services.journals_service import journals_service
+from ...services.journal_translations_service import journal_translations_service
 from ...services.semantic_scholar_service import semantic_scholar_service
 from ...services.translation_service import translation_service
 from ...core.auth import get_current_user_optional, get_current_user
+from ...core.exceptions import UpstreamUnavailableError
 
 router = APIRouter()
 
@@ -84,21 +86,19 @@ async def recommend_journals(
             for journal in journals
         ]
 
-        # Translate results if needed
+        # Serve precomputed translations if needed
         if language and language != "en":
             journals_dict = [journal.model_dump() for journal in journal_responses]
-            translated_journals = await translation_service.translate_results(
-                journals_dict,
-                target_language=language,
-                fields=["name", "description"]
-            )
-            journal_responses = [JournalResponse(**journal) for journal in translated_journals]
+            await journal_translations_service.translate_journals(journals_dict, language)
+            journal_responses = [JournalResponse(**journal) for journal in journals_dict]
 
         return JournalListResponse(
             journals=journal_responses,
             count=len(journal_responses)
         )
 
+    except UpstreamUnavailableError:
+        raise  # Mapped to 503 by the app's exception handler
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -136,6 +136,8 @@ async def get_journal(
 
     except HTTPException:
         raise
+    except UpstreamUnavailableError:
+        raise  # Mapped to 503 by the app's exception handler
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -194,21 +196,19 @@ async def search_journals(
             for journal in journals
         ]
 
-        # Translate results if needed
+        # Serve precomputed translations if needed
         if language and language != "en":
             journals_dict = [journal.model_dump() for journal in journal_responses]
-            translated_journals = await translation_service.translate_results(
-                journals_dict,
-                target_language=language,
-                fields=["name", "description"]
-            )
-            journal_responses = [JournalResponse(**journal) for journal in translated_journals]
+            await journal_translations_service.translate_journals(journals_dict, language)
+            journal_responses = [JournalResponse(**journal) for journal in journals_dict]
 
         return JournalListResponse(
             journals=journal_responses,
             count=len(journal_responses)
         )
 
+    except UpstreamUnavailableError:
+        raise  # Mapped to 503 by the app's exception handler
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -4,10 +4,14 @@ Provides faster, better quality paper analysis with real-time translation.
 """
 
 from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, status, Query
+from fastapi.responses import StreamingResponse
 from typing import Optional, List
 from datetime import datetime
+import json
 
 from ...core.auth import get_current_user_optional
+from ...core.exceptions import UpstreamUnavailableError
+from ...services.analysis_jobs import job_status
 from ...services.papers_service_v2 import enhanced_papers_service
 
 router = APIRouter(tags=["Papers (Enhanced)"])
@@ -62,6 +66,8 @@ async def upload_paper(
             "next_step": f"POST /api/v1/papers/{result['id']}/process to analyze"
         }
 
+    except UpstreamUnavailableError:
+        raise  # Mapped to 503 by the app's exception handler
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -69,23 +75,29 @@ async def upload_paper(
         )
 
 
-@router.post("/{paper_id}/process")
+@router.post("/{paper_id}/process", status_code=status.HTTP_202_ACCEPTED)
 async def process_paper(
     paper_id: str,
-    language: str = Query("en", description="Target language code (en, hi, te, ta, etc.)"),
+    language: str = Query("en", description="Ignored - analysis is always stored in English"),
     paper_type: str = Query("research", description="Paper type: research, ml, clinical, review"),
     current_user: Optional[dict] = Depends(get_current_user_optional)
 ):
     """
-    Process paper with Gemini 2.0 Flash Lite.
+    Queue paper analysis with Gemini 2.0 Flash Lite.
 
     **This is the main analysis endpoint!**
 
+    **Flow:**
+    1. Returns a job id immediately (analysis takes 30-90 seconds)
+    2. Poll `GET /jobs/{job_id}` until `status` is `done` or `failed`
+    3. Fetch the analysis with `GET /{paper_id}?language=X`
+
+    Processing a paper that is already queued or running returns its current job.
+
     **Features:**
     - Native PDF processing (no text extraction needed)
-    - 1-3 second processing time
     - Comprehensive structured analysis
-    - Optional translation to 15 languages
+    - On-demand translation to 15 languages
     - Bachelor's major level comprehension
 
     **Paper Types:**
@@ -93,47 +105,52 @@ async def process_paper(
     - `ml`: Machine learning papers (includes architecture details)
     - `clinical`: Clinical/medical papers (includes PICO elements)
     - `review`: Review/survey papers
-
-    **Languages:**
-    - `en`: English
-    - `hi`: Hindi
-    - `te`: Telugu
-    - `ta`: Tamil
-    - `bn`: Bengali
-    - `mr`: Marathi
-    - `zh`: Chinese
-    - `es`: Spanish
-    - `fr`: French
-    - `de`: German
-    - `pt`: Portuguese
-    - `ja`: Japanese
-    - `ko`: Korean
-    - `ru`: Russian
-    - `ar`: Arabic
     """
     try:
         user_id = current_user["user_id"] if current_user else "demo_user"
 
-        # Get PDF bytes
-        pdf_bytes = await enhanced_papers_service.get_paper_pdf(paper_id, user_id)
-
-        # Process with Gemini
-        result = await enhanced_papers_service.process_paper(
-            paper_id,
-            pdf_bytes,
-            paper_type,
-            language
-        )
+        job = await enhanced_papers_service.submit_processing(paper_id, user_id, paper_type)
 
-        return result
+        return {
+            "success": True,
+            **job_status(job),
+            "status_url": f"/api/v1/papers-enhanced/jobs/{job['id']}"
+        }
 
+    except UpstreamUnavailableError:
+        raise  # Mapped to 503 by the app's exception handler
     except Exception as e:
         raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            status_code=status.HTTP_404_NOT_FOUND
+            if "not found" in str(e).lower()
+            else status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Processing failed: {str(e)}"
         )
 
 
+@router.get("/jobs/{job_id}")
+async def get_job_status(
+    job_id: str,
+    current_user: Optional[dict] = Depends(get_current_user_optional)
+):
+    """
+    Get the status of an analysis job: `queued`, `running`, `done` or `failed`.
+
+    Failed jobs include the `error`; the paper's `error_message` is set too.
+    """
+    try:
+        user_id = current_user["user_id"] if current_user else "demo_user"
+
+        job = await enhanced_papers_service.get_job(job_id, user_id)
+
+        return {"success": True, **job_status(job)}
+
+    except UpstreamUnavailableError:
+        raise  # Mapped to 503 by the app's exception handler
+    except Exception as e:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
+
+
 @router.get("/{paper_id}")
 async def get_paper_analysis(
     paper_id: str,
@@ -163,6 +180,8 @@ async def get_paper_analysis(
 
         return result
 
+    except UpstreamUnavailableError:
+        raise  # Mapped to 503 by the app's exception handler
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND
@@ -172,6 +191,49 @@ async def get_paper_analysis(
         )
 
 
+@router.get("/{paper_id}/stream")
+async def stream_paper_analysis(
+    paper_id: str,
+    language: str = Query("en", description="Language code"),
+    current_user: Optional[dict] = Depends(get_current_user_optional)
+):
+    """
+    Stream paper analysis in specified language as NDJSON.
+
+    **Progressive Translation:**
+    - First line: `header` event with metadata, title and TL;DR
+    - Then one `section` event per analysis section as soon as it is translated
+    - Last line: `done` event, once the translation is cached (`complete: false`
+      if some segments are still English; those are not cached and are retried next time)
+    - Cached languages stream everything immediately
+
+    **Usage:**
+    - Render the header right away and fill in sections as they arrive
+    """
+    try:
+        user_id = current_user["user_id"] if current_user else None
+        paper = await enhanced_papers_service.get_paper_record(paper_id, user_id)
+
+    except UpstreamUnavailableError:
+        raise  # Mapped to 503 by the app's exception handler
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND
+            if "not found" in str(e).lower()
+            else status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=str(e)
+        )
+
+    async def events():
+        try:
+            async for event in enhanced_papers_service.stream_paper_analysis(paper, language):
+                yield json.dumps(event, ensure_ascii=False) + "\n"
+        except Exception as e:
+            yield json.dumps({"type": "error", "detail": str(e)}) + "\n"
+
+    return StreamingResponse(events(), media_type="application/x-ndjson")
+
+
 @router.get("/")
 async def list_papers(
     limit: int = Query(50, ge=1, le=100),
@@ -198,6 +260,8 @@ async def list_papers(
             "offset": offset
         }
 
+    except UpstreamUnavailableError:
+        raise  # Mapped to 503 by the app's exception handler
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -220,6 +284,8 @@ async def delete_paper(
 
         return result
 
+    except UpstreamUnavailableError:
+        raise  # Mapped to 503 by the app's exception handler
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -251,6 +317,8 @@ async def translate_to_language(
 
         return result
 
+    except UpstreamUnavailableError:
+        raise  # Mapped to 503 by the app's exception handler
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -262,16 +330,45 @@ async def translate_to_language(
 async def batch_process_papers(
     paper_ids: List[str],
     paper_type: str = Query("research"),
+    stream: bool = Query(False, description="Stream per-paper results as NDJSON as they complete"),
     current_user: Optional[dict] = Depends(get_current_user_optional)
 ):
     """
     Process multiple papers in batch.
 
     **Use Case:** Bulk upload and analysis.
+
+    Papers are downloaded and analyzed concurrently (bounded by the
+    OpenRouter slots analysis jobs leave free); one paper failing or timing
+    out does not hold up the others.
+
+    **Streaming (`stream=true`):**
+    - One `result` event per paper, in completion order
+    - Last line: `done` event with the totals
     """
-    try:
-        user_id = current_user["user_id"] if current_user else "demo_user"
+    user_id = current_user["user_id"] if current_user else "demo_user"
+
+    if stream:
+        async def events():
+            total = successful = 0
+            try:
+                async for result in enhanced_papers_service.stream_batch_process(paper_ids, user_id, paper_type):
+                    total += 1
+                    successful += bool(result.get("success"))
+                    yield json.dumps({"type": "result", **result}, ensure_ascii=False) + "\n"
+            except Exception as e:
+                yield json.dumps({"type": "error", "detail": str(e)}) + "\n"
+                return
+            yield json.dumps({
+                "type": "done",
+                "total": total,
+                "successful": successful,
+                "failed": total - successful
+            }) + "\n"
+
+        return StreamingResponse(events(), media_type="application/x-ndjson")
 
+    try:
         results = await enhanced_papers_service.batch_process_papers(
             paper_ids,
             user_id,
@@ -289,6 +386,8 @@ async def batch_process_papers(
             "results": results
         }
 
+    except UpstreamUnavailableError:
+        raise  # Mapped to 503 by the app's exception handler
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -1,6 +1,6 @@
 """Plagiarism detection endpoints."""
 from fastapi import APIRouter, Depends, HTTPException, status
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from typing import List, Optional
 from ...schemas.plagiarism import (
     PlagiarismCheckRequest,
@@ -9,16 +9,23 @@ from ...schemas.plagiarism import (
 )
 from ...services.plagiarism_service import plagiarism_service
 from ...services.semantic_scholar_service import semantic_scholar_service
+from ...services.translatable_fields import PLAGIARISM_FIELDS, paths_spec
 from ...services.translation_service import translation_service
 from ...core.auth import get_current_user_optional
+from ...core.exceptions import UpstreamUnavailableError
 from ...core.supabase import supabase
 
 router = APIRouter()
 
+# Legacy checker results only carry flagged section text
+LEGACY_TRANSLATABLE_FIELDS = paths_spec(["flagged_sections[].text"])
+
 
 class CitationSuggestRequest(BaseModel):
     """Citation suggestion request."""
     claims: List[str]
+    limit: int = Field(10, ge=1, le=50, description="Maximum number of citations to return")
+    min_relevance: Optional[float] = Field(None, ge=0, le=1, description="Minimum relevance (0-1) for a citation to be returned")
 
 
 @router.post("/check", response_model=PlagiarismCheckResponse)
@@ -68,80 +75,14 @@ async def check_plagiarism(
                 use_winston=True
             )
 
-            # Translate Winston AI results to user's language if needed
+            # Translate Winston AI results to user's language if needed (one batch)
             if request.language and request.language not in ["en", "auto"]:
-                # Translate source titles and snippets
-                if result.get("sources"):
-                    titles = [s["title"] for s in result["sources"] if s.get("title")]
-                    snippets = [s["snippet"] for s in result["sources"] if s.get("snippet")]
-
-                    if titles:
-                        translated_titles = await translation_service.translate_batch(
-                            titles,
-                            target_language=request.language,
-                            source_language="en"
-                        )
-                        # Map back to sources
-                        title_idx = 0
-                        for source in result["sources"]:
-                            if source.get("title"):
-                                source["title"] = translated_titles[title_idx]
-                                title_idx += 1
-
-                    if snippets:
-                        translated_snippets = await translation_service.translate_batch(
-                            snippets,
-                            target_language=request.language,
-                            source_language="en"
-                        )
-                        # Map back to sources
-                        snippet_idx = 0
-                        for source in result["sources"]:
-                            if source.get("snippet"):
-                                source["snippet"] = translated_snippets[snippet_idx]
-                                snippet_idx += 1
-
-                # Translate flagged section texts and snippets
-                if result.get("flagged_sections"):
-                    texts = [s["text"] for s in result["flagged_sections"] if s.get("text")]
-                    sources = [s["source"] for s in result["flagged_sections"] if s.get("source")]
-                    snippets = [s["snippet"] for s in result["flagged_sections"] if s.get("snippet")]
-
-                    if texts:
-                        translated_texts = await translation_service.translate_batch(
-                            texts,
-                            target_language=request.language,
-                            source_language="en"
-                        )
-                        text_idx = 0
-                        for section in result["flagged_sections"]:
-                            if section.get("text"):
-                                section["text"] = translated_texts[text_idx]
-                                text_idx += 1
-
-                    if sources:
-                        translated_sources = await translation_service.translate_batch(
-                            sources,
-                            target_language=request.language,
-                            source_language="en"
-                        )
-                        source_idx = 0
-                        for section in result["flagged_sections"]:
-                            if section.get("source"):
-                                section["source"] = translated_sources[source_idx]
-                                source_idx += 1
-
-                    if snippets:
-                        translated_snippets = await translation_service.translate_batch(
-                            snippets,
-                            target_language=request.language,
-                            source_language="en"
-                        )
-                        snippet_idx = 0
-                        for section in result["flagged_sections"]:
-                            if section.get("snippet"):
-                                section["snippet"] = translated_snippets[snippet_idx]
-                                snippet_idx += 1
+                await translation_service.translate_fields(
+                    result,
+                    PLAGIARISM_FIELDS,
+                    target_language=request.language,
+                    source_language="en"
+                )
         else:
             # Legacy method - requires text
             if not request.text:
@@ -166,17 +107,13 @@ async def check_plagiarism(
             )
 
             # Translate flagged sections back to user's language if needed
-            if request.language and request.language not in ["en", "auto"] and result.get("flagged_sections"):
-                sections_text = [section["text"] for section in result["flagged_sections"]]
-                if sections_text:
-                    translated_sections = await translation_service.translate_batch(
-                        sections_text,
-                        target_language=request.language,
-                        source_language="en"
-                    )
-                    for i, section in enumerate(result["flagged_sections"]):
-                        if i < len(translated_sections):
-                            section["text"] = translated_sections[i]
+            if request.language and request.language not in ["en", "auto"]:
+                await translation_service.translate_fields(
+                    result,
+                    LEGACY_TRANSLATABLE_FIELDS,
+                    target_language=request.language,
+                    source_language="en"
+                )
 
         # Store result in database (for history) - only if user is logged in
         if current_user and request.text:  # Only store text checks (not file/website)
@@ -203,6 +140,8 @@ async def check_plagiarism(
 
     except HTTPException:
         raise  # Re-raise HTTP exceptions
+    except UpstreamUnavailableError:
+        raise  # Mapped to 503 by the app's exception handler
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -249,17 +188,24 @@ async def suggest_citations(
     """
     Get citation suggestions for claims.
 
-    Uses CrossRef API to find relevant papers.
+    Uses CrossRef API to find relevant papers, ranked by semantic
+    similarity to the claims.
     """
     try:
         # Combine all claims into one text
         combined_text = " ".join(request.claims)
 
         # Get citations
-        citations = await plagiarism_service._get_citation_suggestions(combined_text)
+        citations = await plagiarism_service._get_citation_suggestions(
+            combined_text,
+            limit=request.limit,
+            min_relevance=request.min_relevance
+        )
 
         return [CitationSuggestion(**citation) for citation in citations]
 
+    except UpstreamUnavailableError:
+        raise  # Mapped to 503 by the app's exception handler
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -5,8 +5,10 @@ from pydantic import BaseModel
 from ...schemas.topics import TopicQuery, TopicListResponse, TopicResponse
 from ...services.topics_service import topics_service
 from ...services.semantic_scholar_service import semantic_scholar_service
+from ...services.translatable_fields import TOPIC_FIELDS
 from ...services.translation_service import translation_service
 from ...core.auth import get_current_user, get_current_user_optional
+from ...core.exceptions import UpstreamUnavailableError
 
 router = APIRouter()
 
@@ -60,18 +62,20 @@ async def get_trending_topics(
         # Translate results if needed
         if language != "en":
             topics_dict = [topic.model_dump() for topic in topic_responses]
-            translated_topics = await translation_service.translate_results(
+            await translation_service.translate_fields(
                 topics_dict,
-                target_language=language,
-                fields=["title", "description"]
+                TOPIC_FIELDS,
+                target_language=language
             )
-            topic_responses = [TopicResponse(**topic) for topic in translated_topics]
+            topic_responses = [TopicResponse(**topic) for topic in topics_dict]
 
         return TopicListResponse(
             topics=topic_responses,
             count=len(topic_responses)
         )
 
+    except UpstreamUnavailableError:
+        raise  # Mapped to 503 by the app's exception handler
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to fetch topics: {str(e)}")
 
@@ -129,6 +133,8 @@ async def get_personalized_topics(
             count=len(topic_responses)
         )
 
+    except UpstreamUnavailableError:
+        raise  # Mapped to 503 by the app's exception handler
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to get personalized topics: {str(e)}")
 
@@ -151,5 +157,7 @@ async def get_topic_evolution(
 
         return evolution
 
+    except UpstreamUnavailableError:
+        raise  # Mapped to 503 by the app's exception handler
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to get topic evolution: {str(e)}")
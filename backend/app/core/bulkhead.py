@@ -0,0 +1,79 @@
+"""
+Bulkheads: per-upstream concurrency limits.
+
+Each provider gets its own pool of call slots, so one slow provider (for
+example OpenRouter during long paper analyses) cannot tie up every
+connection and coroutine while calls to fast providers wait. A call that
+cannot get a slot within the queue-wait timeout fails fast with
+BulkheadFullError.
+"""
+
+import asyncio
+from typing import Any, Dict, Optional
+
+from .exceptions import UpstreamUnavailableError
+from .metrics import metrics
+
+
+class BulkheadFullError(UpstreamUnavailableError):
+    """Raised when an upstream's concurrency limit stays saturated for the whole queue wait."""
+
+
+class Bulkhead:
+    """Async semaphore with a bounded queue wait. Use as `async with bulkhead:`."""
+
+    def __init__(self, name: str, max_concurrent: int, max_wait: float):
+        """
+        Args:
+            name: Upstream name (used in errors and metrics)
+            max_concurrent: Calls allowed in flight at once
+            max_wait: Seconds a call may queue for a slot before failing
+        """
+        self.name = name
+        self.max_concurrent = max(1, max_concurrent)
+        self.max_wait = max_wait
+
+        self.active = 0
+        self.waiting = 0
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def _get_semaphore(self) -> asyncio.Semaphore:
+        # Semaphores are bound to one event loop (tests and scripts run several)
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._semaphore = asyncio.Semaphore(self.max_concurrent)
+            self._loop = loop
+            self.active = 0
+            self.waiting = 0
+        return self._semaphore
+
+    async def __aenter__(self) -> "Bulkhead":
+        semaphore = self._get_semaphore()
+
+        self.waiting += 1
+        try:
+            await asyncio.wait_for(semaphore.acquire(), timeout=self.max_wait)
+        except asyncio.TimeoutError:
+            metrics.increment("bulkhead_rejections", upstream=self.name)
+            raise BulkheadFullError(
+                self.name,
+                f"{self.name} is at capacity ({self.max_concurrent} concurrent calls), try again shortly"
+            )
+        finally:
+            self.waiting -= 1
+
+        self.active += 1
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        self.active -= 1
+        self._semaphore.release()
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Slot usage, for /health."""
+        return {
+            "max_concurrent": self.max_concurrent,
+            "active": self.active,
+            "waiting": self.waiting
+        }
@@ -0,0 +1,152 @@
+"""
+Per-upstream circuit breakers.
+
+A breaker watches the outcome and latency of recent calls to an upstream.
+When too many of them fail or are slow it opens, and calls are rejected
+immediately (so callers switch to their fallback) instead of waiting out
+the upstream's timeout. After a cool-down it lets a few probe calls
+through (half-open) and closes again once they succeed.
+"""
+
+import time
+from collections import deque
+from typing import Any, Deque, Dict, Optional, Tuple
+
+from .exceptions import UpstreamUnavailableError
+from .metrics import metrics
+
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(UpstreamUnavailableError):
+    """Raised instead of calling an upstream whose breaker is open."""
+
+
+class CircuitBreaker:
+    """Sliding-window breaker with error-rate and slow-call thresholds."""
+
+    def __init__(
+        self,
+        name: str,
+        window_size: int = 20,
+        min_calls: int = 5,
+        failure_rate: float = 0.5,
+        slow_call_seconds: Optional[float] = None,
+        slow_call_rate: float = 0.5,
+        open_seconds: float = 30.0,
+        half_open_calls: int = 1
+    ):
+        """
+        Args:
+            name: Upstream name (used in errors and metrics)
+            window_size: Number of recent calls considered
+            min_calls: Calls needed in the window before the breaker can trip
+            failure_rate: Fraction of failed calls that opens the breaker
+            slow_call_seconds: Calls slower than this count as slow (None disables)
+            slow_call_rate: Fraction of slow calls that opens the breaker
+            open_seconds: Time spent open before probe calls are allowed
+            half_open_calls: Probe calls allowed concurrently while half-open
+        """
+        self.name = name
+        self.window_size = window_size
+        self.min_calls = min_calls
+        self.failure_rate = failure_rate
+        self.slow_call_seconds = slow_call_seconds
+        self.slow_call_rate = slow_call_rate
+        self.open_seconds = open_seconds
+        self.half_open_calls = half_open_calls
+
+        self._calls: Deque[Tuple[bool, bool]] = deque(maxlen=window_size)
+        self._state = CLOSED
+        self._opened_at = 0.0
+        self._probes = 0
+
+    @property
+    def state(self) -> str:
+        """Current state, moving from open to half-open once the cool-down has passed."""
+        if self._state == OPEN and time.monotonic() - self._opened_at >= self.open_seconds:
+            self._state = HALF_OPEN
+            self._probes = 0
+        return self._state
+
+    def allow(self) -> None:
+        """
+        Admit a call or raise CircuitOpenError.
+
+        Every admitted call must be followed by exactly one record() or
+        release() call.
+        """
+        state = self.state
+
+        if state == CLOSED:
+            return
+
+        if state == HALF_OPEN and self._probes < self.half_open_calls:
+            self._probes += 1
+            return
+
+        metrics.increment("circuit_breaker_rejections", upstream=self.name)
+        retry_in = max(0.0, self.open_seconds - (time.monotonic() - self._opened_at))
+        raise CircuitOpenError(
+            self.name,
+            f"{self.name} is temporarily unavailable (circuit open, retry in {retry_in:.0f}s)"
+        )
+
+    def record(self, success: bool, duration: float) -> None:
+        """
+        Record the outcome of an admitted call.
+
+        Args:
+            success: False for network errors and 5xx responses
+            duration: Call latency in seconds
+        """
+        slow = self.slow_call_seconds is not None and duration > self.slow_call_seconds
+
+        if self._state == HALF_OPEN:
+            self._probes = max(0, self._probes - 1)
+            if success and not slow:
+                self._close()
+            else:
+                self._open()
+            return
+
+        self._calls.append((success, slow))
+
+        if self._state == CLOSED and len(self._calls) >= self.min_calls:
+            failures = sum(1 for ok, _ in self._calls if not ok)
+            slow_calls = sum(1 for _, is_slow in self._calls if is_slow)
+
+            if (failures / len(self._calls) >= self.failure_rate
+                    or slow_calls / len(self._calls) >= self.slow_call_rate):
+                self._open()
+
+    def release(self) -> None:
+        """Give back an admitted call that was cancelled before it had an outcome."""
+        if self._state == HALF_OPEN:
+            self._probes = max(0, self._probes - 1)
+
+    def _open(self) -> None:
+        if self._state != OPEN:
+            print(f"🔌 Circuit opened for {self.name}")
+            metrics.increment("circuit_breaker_opened", upstream=self.name)
+        self._state = OPEN
+        self._opened_at = time.monotonic()
+        self._probes = 0
+
+    def _close(self) -> None:
+        print(f"✅ Circuit closed for {self.name}")
+        self._state = CLOSED
+        self._calls.clear()
+        self._probes = 0
+
+    def snapshot(self) -> Dict[str, Any]:
+        """State and recent error/slow-call counts, for /health."""
+        return {
+            "state": self.state,
+            "recent_calls": len(self._calls),
+            "recent_failures": sum(1 for ok, _ in self._calls if not ok),
+            "recent_slow_calls": sum(1 for _, slow in self._calls if slow)
+        }
@@ -1,7 +1,7 @@
 """Application configuration."""
 from pydantic_settings import BaseSettings
 from pydantic import ConfigDict
-from typing import List
+from typing import Dict, List
 
 
 class Settings(BaseSettings):
@@ -33,6 +33,62 @@ class Settings(BaseSettings):
     CROSSREF_EMAIL: str = ""
     WINSTON_API_KEY: str = ""  # Winston AI plagiarism detection
 
+    # Upstream HTTP clients (HTTP/2 requires the h2 package)
+    HTTP2_ENABLED: bool = False
+
+    # Semantic Scholar rate limiting (0 = derive from S2's published quotas)
+    S2_RATE_LIMIT_RPS: float = 0
+    S2_RATE_LIMIT_BURST: int = 0
+    S2_RATE_LIMIT_SHARED_PATH: str = ""  # SQLite file to share the quota across worker processes
+    S2_MAX_RETRIES: int = 4
+
+    # Local citation store (SQLite/FTS5). Empty path disables it.
+    CITATION_STORE_PATH: str = "data/citations.db"
+    CITATION_STORE_MAX_MB: int = 512
+
+    # Upstream response cache: "memory", "sqlite" (shared by workers) or "none"
+    RESPONSE_CACHE_BACKEND: str = "memory"
+    RESPONSE_CACHE_PATH: str = "data/response_cache.db"
+    RESPONSE_CACHE_MAX_ENTRIES: int = 2000
+    RESPONSE_CACHE_MAX_MB: int = 256
+
+    # Per-upstream concurrency limits, e.g. "openrouter=4,semantic_scholar=10"
+    # (empty = built-in defaults)
+    BULKHEAD_LIMITS: str = ""
+    BULKHEAD_MAX_WAIT: float = 0  # Seconds to queue for a slot (0 = per-upstream default)
+
+    # Google Translate: worker threads, and chunks translated concurrently per batch
+    TRANSLATION_THREADS: int = 8
+    TRANSLATION_PARALLELISM: int = 4
+
+    # Translation providers the router may pick from ("google", "gemini");
+    # order breaks ties until latencies have been observed
+    TRANSLATION_PROVIDERS: str = "google,gemini"
+
+    # Translation memory: in-process LRU + SQLite (empty path = LRU only)
+    TRANSLATION_MEMORY_PATH: str = "data/translation_memory.db"
+    TRANSLATION_MEMORY_MAX_ENTRIES: int = 20000
+    TRANSLATION_MEMORY_MAX_MB: int = 256
+
+    # Background pre-translation of the journals catalog (0 = disabled)
+    JOURNAL_TRANSLATION_REFRESH_SECONDS: float = 3600
+
+    # Institution-wide languages every processed paper is pre-translated into,
+    # e.g. "hi,te" (in addition to the uploader's users.preferred_languages)
+    PREFETCH_TRANSLATION_LANGUAGES: str = ""
+
+    # Background paper analysis: SQLite job table, jobs run concurrently per
+    # process, and attempts per job (provider rejections and interrupted runs)
+    ANALYSIS_JOBS_PATH: str = "data/analysis_jobs.db"
+    ANALYSIS_WORKERS: int = 2
+    ANALYSIS_JOB_MAX_ATTEMPTS: int = 3
+
+    # Batch processing: papers analyzed at once (0 = the openrouter bulkhead
+    # slots left over by ANALYSIS_WORKERS, which also caps it) and seconds
+    # allowed per download/analysis
+    BATCH_PROCESS_CONCURRENCY: int = 0
+    BATCH_PAPER_TIMEOUT: float = 180
+
     # Server
     HOST: str = "0.0.0.0"
     PORT: int = 8000
@@ -46,6 +102,26 @@ class Settings(BaseSettings):
         """Parse CORS origins into list."""
         return [origin.strip() for origin in self.CORS_ORIGINS.split(",")]
 
+    @property
+    def bulkhead_limits(self) -> Dict[str, int]:
+        """Parse BULKHEAD_LIMITS into {upstream: max_concurrent}."""
+        limits = {}
+        for item in self.BULKHEAD_LIMITS.split(","):
+            name, _, value = item.partition("=")
+            if name.strip() and value.strip():
+                limits[name.strip()] = int(value)
+        return limits
+
+    @property
+    def translation_providers(self) -> List[str]:
+        """Parse TRANSLATION_PROVIDERS into provider names."""
+        return [name.strip() for name in self.TRANSLATION_PROVIDERS.split(",") if name.strip()]
+
+    @property
+    def prefetch_translation_languages(self) -> List[str]:
+        """Parse PREFETCH_TRANSLATION_LANGUAGES into language codes."""
+        return [code.strip() for code in self.PREFETCH_TRANSLATION_LANGUAGES.split(",") if code.strip()]
+
     # API
     API_V1_PREFIX: str = "/api/v1"
     PROJECT_NAME: str = "ARSP API"
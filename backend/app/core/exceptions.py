@@ -0,0 +1,9 @@
+"""Exceptions raised by the shared upstream client layer."""
+
+
+class UpstreamUnavailableError(Exception):
+    """An upstream call was rejected locally because the provider is unhealthy or saturated."""
+
+    def __init__(self, upstream: str, message: str):
+        super().__init__(message)
+        self.upstream = upstream
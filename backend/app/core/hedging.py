@@ -0,0 +1,106 @@
+"""
+Latency tracking and hedged requests.
+
+A hedged request sends a second identical request if the first has not
+answered within the upstream's recent p90 latency, and takes whichever
+good response arrives first (a fast 429 or 5xx does not beat a slower
+200). Only safe for idempotent, read-only calls.
+"""
+
+import asyncio
+import math
+from collections import deque
+from typing import Awaitable, Callable, Deque, Optional, TypeVar
+
+from .metrics import metrics
+
+
+T = TypeVar("T")
+
+
+class LatencyTracker:
+    """Recent successful-call latencies for one upstream."""
+
+    def __init__(self, window_size: int = 200, min_samples: int = 20):
+        self.min_samples = min_samples
+        self._samples: Deque[float] = deque(maxlen=window_size)
+
+    def record(self, seconds: float) -> None:
+        self._samples.append(seconds)
+
+    def percentile(self, q: float) -> Optional[float]:
+        """
+        Latency at quantile q (0-1) over the window.
+
+        Returns:
+            Seconds, or None until enough samples have been recorded
+        """
+        if len(self._samples) < self.min_samples:
+            return None
+
+        ordered = sorted(self._samples)
+        index = min(len(ordered) - 1, math.ceil(q * len(ordered)) - 1)
+        return ordered[max(0, index)]
+
+
+async def hedged(
+    name: str,
+    call: Callable[[], Awaitable[T]],
+    delay: float,
+    can_hedge: Callable[[], Awaitable[bool]],
+    is_loss: Optional[Callable[[T], bool]] = None
+) -> T:
+    """
+    Run call(), and a second call() if the first is still pending after delay.
+
+    Args:
+        name: Upstream name (metrics label)
+        call: Factory for the request coroutine
+        delay: Seconds to wait before hedging
+        can_hedge: Awaited before hedging (e.g. takes a rate-limit token);
+            returning False skips the hedge
+        is_loss: Results it returns True for (e.g. a retryable status) do not
+            win while the other call is still pending
+
+    Returns:
+        The first successful result. If neither call succeeds, the first
+        losing result is returned, or else the first error is raised.
+    """
+    primary = asyncio.ensure_future(call())
+    tasks = [primary]
+
+    try:
+        done, _ = await asyncio.wait({primary}, timeout=delay)
+        if done:
+            return primary.result()
+
+        if not await can_hedge():
+            metrics.increment("hedges_skipped", upstream=name)
+            return await primary
+
+        metrics.increment("hedges_fired", upstream=name)
+        hedge = asyncio.ensure_future(call())
+        tasks.append(hedge)
+
+        pending = set(tasks)
+        error = None
+        losses = []
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if task.exception() is not None:
+                    error = error or task.exception()
+                elif is_loss is not None and is_loss(task.result()):
+                    losses.append(task.result())
+                else:
+                    if task is hedge:
+                        metrics.increment("hedge_wins", upstream=name)
+                    return task.result()
+
+        if losses:
+            return losses[0]
+        raise error
+    finally:
+        for task in tasks:
+            if not task.done():
+                task.cancel()
@@ -0,0 +1,458 @@
+"""
+Shared, pooled HTTP clients for upstream APIs.
+
+One httpx.AsyncClient is kept per upstream so repeated calls to the same
+host reuse keep-alive connections instead of paying TCP+TLS setup on every
+request. Clients are opened in the FastAPI lifespan and closed on shutdown.
+
+Upstreams with a "cache" policy have their successful GET responses cached
+for `ttl` seconds, then served stale for up to `stale_ttl` more seconds
+while a background task refreshes them.
+
+Every upstream has a circuit breaker: once too many recent calls fail or
+are slow, calls raise CircuitOpenError immediately so callers fall back
+without waiting out the timeout.
+
+Read-only GETs can opt into hedging (hedge=True): if the upstream has not
+answered within its recent p90 latency, a second identical request is sent
+(if the rate limiter has a token to spare) and the first response wins.
+
+Bulkheads cap how many calls each provider may have in flight, including
+providers called through their own SDKs (Google Translate, OpenRouter),
+so one slow provider cannot starve the others.
+"""
+
+import asyncio
+import time
+from typing import Any, Dict, Optional
+
+import httpx
+
+from .bulkhead import Bulkhead
+from .circuit_breaker import CircuitBreaker
+from .config import settings
+from .hedging import LatencyTracker, hedged
+from .metrics import metrics
+from .rate_limiter import TokenBucket, backoff_delay, build_s2_rate_limiter, parse_retry_after
+from .response_cache import ResponseCache, build_cache_backend
+from .single_flight import SingleFlight, request_key
+
+
+# Per-upstream client settings
+UPSTREAMS: Dict[str, Dict[str, Any]] = {
+    "semantic_scholar": {
+        "timeout": 60.0,
+        "max_connections": 20,
+        "max_keepalive_connections": 10,
+        "rate_limiter": build_s2_rate_limiter,
+        "coalesce": True,
+        "cache": {"ttl": 3600.0, "stale_ttl": 86400.0},
+        "breaker": {"slow_call_seconds": 20.0},
+        "retry": {
+            "max_retries": settings.S2_MAX_RETRIES,
+            "base_delay": 1.0,
+            "max_delay": 30.0,
+            "max_total_wait": 60.0,
+        },
+    },
+    "huggingface": {
+        "timeout": 60.0,
+        "max_connections": 10,
+        "max_keepalive_connections": 5,
+        "breaker": {"slow_call_seconds": 20.0},
+    },
+    "crossref": {
+        "timeout": 30.0,
+        "max_connections": 10,
+        "max_keepalive_connections": 5,
+        "coalesce": True,
+        "cache": {"ttl": 86400.0, "stale_ttl": 7 * 86400.0},
+        "breaker": {"slow_call_seconds": 15.0},
+    },
+    "winston": {
+        "timeout": 120.0,
+        "max_connections": 10,
+        "max_keepalive_connections": 5,
+        "breaker": {"slow_call_seconds": 90.0, "open_seconds": 60.0},
+    },
+    "arxiv": {
+        "timeout": 30.0,
+        "max_connections": 10,
+        "max_keepalive_connections": 5,
+        "follow_redirects": True,
+        "coalesce": True,
+        "cache": {"ttl": 1800.0, "stale_ttl": 6 * 3600.0},
+        "breaker": {"slow_call_seconds": 15.0},
+    },
+}
+
+
+# Concurrency limits (max in-flight calls, max seconds queued for a slot).
+# Upstreams not listed default to their connection pool size.
+BULKHEADS: Dict[str, Dict[str, Any]] = {
+    "semantic_scholar": {"max_concurrent": 10, "max_wait": 10.0},
+    "huggingface": {"max_concurrent": 8, "max_wait": 10.0},
+    "crossref": {"max_concurrent": 8, "max_wait": 5.0},
+    "winston": {"max_concurrent": 4, "max_wait": 5.0},
+    "arxiv": {"max_concurrent": 6, "max_wait": 10.0},
+    # Called through their SDKs, not a pooled client
+    "google_translate": {"max_concurrent": 8, "max_wait": 10.0},
+    "openrouter": {"max_concurrent": 4, "max_wait": 5.0},
+    # Gemini translation gets its own slots so it never starves paper analysis
+    "openrouter_translate": {"max_concurrent": 2, "max_wait": 5.0},
+}
+
+
+def _build_bulkheads(upstreams: Dict[str, Dict[str, Any]]) -> Dict[str, Bulkhead]:
+    """Bulkheads for every upstream, with BULKHEAD_LIMITS / BULKHEAD_MAX_WAIT overrides."""
+    bulkheads = {}
+    for name in list(upstreams) + [n for n in BULKHEADS if n not in upstreams]:
+        config = BULKHEADS.get(name, {})
+        max_concurrent = settings.bulkhead_limits.get(
+            name, config.get("max_concurrent", upstreams.get(name, {}).get("max_connections", 10))
+        )
+        max_wait = settings.BULKHEAD_MAX_WAIT or config.get("max_wait", 10.0)
+        bulkheads[name] = Bulkhead(name, max_concurrent, max_wait)
+    return bulkheads
+
+
+def _is_retryable(status: int, idempotent: bool) -> bool:
+    """Rate limited, or (for idempotent requests) a transient server error."""
+    return status == 429 or (idempotent and status in (500, 502, 503, 504))
+
+
+def _http2_available() -> bool:
+    """HTTP/2 needs the optional h2 package (pip install httpx[http2])."""
+    try:
+        import h2  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+
+class HTTPClientRegistry:
+    """Registry of pooled AsyncClients, one per upstream."""
+
+    def __init__(
+        self,
+        upstreams: Optional[Dict[str, Dict[str, Any]]] = None,
+        response_cache: Optional[ResponseCache] = None
+    ):
+        self.upstreams = upstreams or UPSTREAMS
+        self.connect_timeout = 10.0
+        self.keepalive_expiry = 30.0
+
+        self.http2 = settings.HTTP2_ENABLED and _http2_available()
+        if settings.HTTP2_ENABLED and not self.http2:
+            print("⚠️  HTTP2_ENABLED is set but h2 is not installed - using HTTP/1.1")
+
+        self._clients: Dict[str, httpx.AsyncClient] = {}
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+        # Process-wide (or cross-process) rate limiters
+        self.rate_limiters: Dict[str, TokenBucket] = {
+            name: config["rate_limiter"]()
+            for name, config in self.upstreams.items()
+            if config.get("rate_limiter")
+        }
+
+        # Fail fast while an upstream is unhealthy
+        self.breakers: Dict[str, CircuitBreaker] = {
+            name: CircuitBreaker(name, **config.get("breaker", {}))
+            for name, config in self.upstreams.items()
+        }
+
+        # Per-provider concurrency limits
+        self.bulkheads: Dict[str, Bulkhead] = _build_bulkheads(self.upstreams)
+
+        # Recent latencies, used to time hedged requests
+        self.latency: Dict[str, LatencyTracker] = {name: LatencyTracker() for name in self.upstreams}
+
+        # Identical concurrent GETs share one upstream request
+        self.single_flight = SingleFlight()
+
+        # Cached GET responses and the background refreshes of stale ones
+        self.response_cache = response_cache or ResponseCache(build_cache_backend())
+        self._refreshing: Dict[str, asyncio.Task] = {}
+
+    def _create_client(self, name: str) -> httpx.AsyncClient:
+        """Build a client from the upstream's settings."""
+        config = self.upstreams[name]
+
+        return httpx.AsyncClient(
+            timeout=httpx.Timeout(config["timeout"], connect=self.connect_timeout),
+            limits=httpx.Limits(
+                max_connections=config["max_connections"],
+                max_keepalive_connections=config["max_keepalive_connections"],
+                keepalive_expiry=self.keepalive_expiry
+            ),
+            http2=self.http2,
+            follow_redirects=config.get("follow_redirects", False)
+        )
+
+    def bulkhead(self, name: str) -> Bulkhead:
+        """
+        Get a provider's bulkhead, for calls made outside the pooled clients.
+
+        Usage: `async with http_clients.bulkhead("openrouter"): ...`
+        """
+        return self.bulkheads[name]
+
+    def client(self, name: str) -> httpx.AsyncClient:
+        """
+        Get the pooled client for an upstream, creating it on first use.
+
+        Connection pools are bound to the event loop that created them, so
+        clients are rebuilt if the running loop changes (tests, scripts).
+        """
+        if name not in self.upstreams:
+            raise KeyError(f"Unknown upstream: {name}")
+
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._clients = {}
+            self._loop = loop
+
+        client = self._clients.get(name)
+        if client is None or client.is_closed:
+            client = self._create_client(name)
+            self._clients[name] = client
+
+        return client
+
+    async def request(
+        self,
+        name: str,
+        method: str,
+        url: str,
+        *,
+        cache: bool = True,
+        hedge: bool = False,
+        **kwargs
+    ) -> httpx.Response:
+        """
+        Send a request through an upstream's pooled client.
+
+        On upstreams with a "cache" policy, GETs are answered from the
+        response cache when possible (fresh, or stale while a refresh runs
+        in the background). On upstreams with "coalesce" enabled, concurrent
+        identical GETs (same URL and normalized query parameters) share one
+        in-flight request and receive the same response. Hedged GETs send a
+        backup request once the upstream's p90 latency has passed.
+
+        Args:
+            name: Upstream name (key of UPSTREAMS)
+            method: HTTP method
+            url: Absolute URL
+            cache: Set to False to bypass the response cache for this call
+            hedge: Hedge this call (read-only GET/HEAD requests only)
+            **kwargs: Passed to httpx.AsyncClient.request (params, json, headers, timeout, ...)
+        """
+        policy = self.upstreams[name].get("cache")
+
+        if method.upper() == "GET" and cache and policy and self.response_cache.enabled:
+            key = repr(request_key(name, method, url, kwargs.get("params")))
+            entry = await self.response_cache.get(key)
+
+            if entry is not None:
+                age = time.time() - entry["stored_at"]
+
+                if age < policy["ttl"]:
+                    metrics.increment("response_cache_hits", upstream=name)
+                    return ResponseCache.to_response(entry, method, url)
+
+                if age < policy["ttl"] + policy["stale_ttl"]:
+                    metrics.increment("response_cache_stale_hits", upstream=name)
+                    self._schedule_refresh(name, key, url, kwargs)
+                    return ResponseCache.to_response(entry, method, url)
+
+            metrics.increment("response_cache_misses", upstream=name)
+            return await self._fetch(name, method, url, cache_key=key, hedge=hedge, **kwargs)
+
+        return await self._fetch(name, method, url, hedge=hedge, **kwargs)
+
+    async def _fetch(
+        self,
+        name: str,
+        method: str,
+        url: str,
+        cache_key: Optional[str] = None,
+        hedge: bool = False,
+        **kwargs
+    ) -> httpx.Response:
+        """Send a request (coalesced if enabled, hedged if asked) and store it under cache_key."""
+        async def send() -> httpx.Response:
+            if hedge and method.upper() in ("GET", "HEAD"):
+                response = await self._send_hedged(name, method, url, **kwargs)
+            else:
+                response = await self._send(name, method, url, **kwargs)
+            if cache_key is not None:
+                await self.response_cache.set(cache_key, response)
+            return response
+
+        if method.upper() == "GET" and self.upstreams[name].get("coalesce"):
+            key = request_key(name, method, url, kwargs.get("params"))
+            return await self.single_flight.do(key, send)
+
+        return await send()
+
+    def _schedule_refresh(self, name: str, key: str, url: str, kwargs: Dict[str, Any]) -> None:
+        """Refresh a stale cache entry in the background (once per key)."""
+        if key in self._refreshing:
+            return
+
+        async def refresh() -> None:
+            try:
+                await self._fetch(name, "GET", url, cache_key=key, **kwargs)
+                metrics.increment("response_cache_refreshes", upstream=name)
+            except Exception as e:
+                print(f"⚠️  Background refresh of {name} response failed: {e}")
+
+        task = asyncio.create_task(refresh())
+        self._refreshing[key] = task
+        task.add_done_callback(lambda _: self._refreshing.pop(key, None))
+
+    async def _send_hedged(self, name: str, method: str, url: str, **kwargs) -> httpx.Response:
+        """Send a request, hedging it once the upstream's p90 latency has passed."""
+        delay = self.latency[name].percentile(0.9)
+        if delay is None:
+            return await self._send(name, method, url, **kwargs)
+
+        limiter = self.rate_limiters.get(name)
+
+        async def can_hedge() -> bool:
+            # Hedges only spend spare rate-limit budget; they never queue for it
+            return limiter is None or await limiter.try_acquire()
+
+        calls = 0
+
+        async def call() -> httpx.Response:
+            nonlocal calls
+            calls += 1
+            # The hedge's first token was already taken by can_hedge()
+            return await self._send(name, method, url, token_taken=calls > 1, **kwargs)
+
+        def is_loss(response: httpx.Response) -> bool:
+            return _is_retryable(response.status_code, idempotent=method.upper() in ("GET", "HEAD"))
+
+        return await hedged(name, call, delay, can_hedge, is_loss)
+
+    async def _send(
+        self,
+        name: str,
+        method: str,
+        url: str,
+        *,
+        token_taken: bool = False,
+        **kwargs
+    ) -> httpx.Response:
+        """
+        Send one logical request, applying circuit breaking, rate limiting,
+        bulkheads and retries.
+
+        Every attempt must be admitted by the upstream's circuit breaker
+        (CircuitOpenError otherwise) and get a slot in its bulkhead
+        (BulkheadFullError otherwise); its outcome and latency are recorded.
+        Upstreams with a rate limiter take a token before every attempt
+        (token_taken means the caller already took one for the first
+        attempt). Upstreams with a retry policy retry 429s (and, for GETs,
+        5xx and network errors) with exponential backoff and jitter,
+        honoring Retry-After, until the retry budget is spent. The last
+        response is returned (or the last network error raised) once it is.
+        """
+        retry = self.upstreams[name].get("retry")
+        limiter = self.rate_limiters.get(name)
+        breaker = self.breakers.get(name)
+        bulkhead = self.bulkheads[name]
+        idempotent = method.upper() in ("GET", "HEAD")
+
+        attempt = 0
+        waited = 0.0
+
+        while True:
+            if limiter and not (token_taken and attempt == 0):
+                await limiter.acquire()
+
+            if breaker:
+                breaker.allow()
+
+            try:
+                async with bulkhead:
+                    # Latency excludes time queued for a slot
+                    started = time.monotonic()
+                    response = await self.client(name).request(method, url, **kwargs)
+            except httpx.TransportError:
+                if breaker:
+                    breaker.record(False, time.monotonic() - started)
+                if not retry or not idempotent or attempt >= retry["max_retries"]:
+                    raise
+                delay = backoff_delay(attempt, retry["base_delay"], retry["max_delay"])
+                if waited + delay > retry["max_total_wait"]:
+                    raise
+            except BaseException:
+                if breaker:
+                    breaker.release()
+                raise
+            else:
+                status = response.status_code
+                elapsed = time.monotonic() - started
+                if breaker:
+                    breaker.record(status < 500, elapsed)
+                if status < 500:
+                    self.latency[name].record(elapsed)
+
+                retryable = _is_retryable(status, idempotent)
+
+                if not retry or not retryable or attempt >= retry["max_retries"]:
+                    return response
+
+                delay = backoff_delay(
+                    attempt,
+                    retry["base_delay"],
+                    retry["max_delay"],
+                    parse_retry_after(response.headers.get("Retry-After"))
+                )
+                if waited + delay > retry["max_total_wait"]:
+                    return response
+
+            print(f"⏳ {name} retry {attempt + 1}/{retry['max_retries']} in {delay:.1f}s")
+            await asyncio.sleep(delay)
+            waited += delay
+            attempt += 1
+
+    def health(self) -> Dict[str, Dict[str, Any]]:
+        """Circuit breaker state and bulkhead usage per upstream."""
+        health = {}
+        for name, bulkhead in self.bulkheads.items():
+            breaker = self.breakers.get(name)
+            health[name] = {
+                **(breaker.snapshot() if breaker else {}),
+                "bulkhead": bulkhead.snapshot()
+            }
+        return health
+
+    async def start(self) -> None:
+        """Open clients for every upstream."""
+        for name in self.upstreams:
+            self.client(name)
+
+    async def aclose(self) -> None:
+        """Cancel background refreshes, close every open client and the cache."""
+        for task in list(self._refreshing.values()):
+            task.cancel()
+        self._refreshing = {}
+
+        clients = list(self._clients.values())
+        self._clients = {}
+
+        for client in clients:
+            try:
+                await client.aclose()
+            except Exception as e:
+                print(f"Error closing HTTP client: {e}")
+
+        self.response_cache.close()
+
+
+# Global registry instance
+http_clients = HTTPClientRegistry()
@@ -0,0 +1,53 @@
+"""In-process operational metrics."""
+import threading
+from collections import defaultdict
+from typing import Any, Dict, Tuple
+
+
+class Metrics:
+    """Thread-safe counters, optionally labelled (e.g. by upstream)."""
+
+    def __init__(self):
+        self._counters: Dict[Tuple[str, Tuple[Tuple[str, str], ...]], float] = defaultdict(float)
+        self._lock = threading.Lock()
+
+    def increment(self, name: str, value: float = 1, **labels: str) -> None:
+        """Add `value` to a counter."""
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self._counters[key] += value
+
+    def get(self, name: str, **labels: str) -> float:
+        """Current value of a counter (0 if never incremented)."""
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            return self._counters.get(key, 0)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        All counters as a JSON-friendly dict.
+
+        Unlabelled counters map to their value; labelled counters map to
+        {"label=value,...": count}.
+        """
+        result: Dict[str, Any] = {}
+        with self._lock:
+            items = list(self._counters.items())
+
+        for (name, labels), value in sorted(items):
+            if not labels:
+                result[name] = value
+            else:
+                label_key = ",".join(f"{k}={v}" for k, v in labels)
+                result.setdefault(name, {})[label_key] = value
+
+        return result
+
+    def reset(self) -> None:
+        """Clear all counters."""
+        with self._lock:
+            self._counters.clear()
+
+
+# Global metrics instance
+metrics = Metrics()
@@ -0,0 +1,222 @@
+"""
+Token-bucket rate limiting and retry backoff for upstream APIs.
+
+TokenBucket limits calls within one process. SharedTokenBucket keeps the
+bucket in a SQLite file so every worker process on the host draws from a
+single quota.
+"""
+
+import asyncio
+import random
+import threading
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Optional
+
+from .config import settings
+from .sqlite import connect_sqlite
+
+
+class TokenBucket:
+    """Async token bucket shared by all tasks in the process."""
+
+    def __init__(self, rate: float, burst: int):
+        """
+        Args:
+            rate: Tokens added per second
+            burst: Bucket capacity (max calls allowed back to back)
+        """
+        self.rate = rate
+        self.burst = max(1, burst)
+        self._tokens = float(self.burst)
+        self._updated_at = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(self.burst, self._tokens + (now - self._updated_at) * self.rate)
+        self._updated_at = now
+
+    def _take(self) -> float:
+        """Take a token if available; otherwise return seconds until one is."""
+        self._refill()
+        if self._tokens >= 1:
+            self._tokens -= 1
+            return 0.0
+        return (1 - self._tokens) / self.rate
+
+    async def try_acquire(self) -> bool:
+        """
+        Take a token without waiting. Returns False if none is available.
+
+        Callers queued in acquire() go first: while one is waiting, no
+        token is taken.
+        """
+        if self._lock.locked():
+            return False
+        return self._take() == 0.0
+
+    async def acquire(self) -> None:
+        """Wait until a token is available and take it."""
+        async with self._lock:
+            while True:
+                wait = self._take()
+                if wait == 0.0:
+                    return
+                await asyncio.sleep(wait)
+
+
+class SharedTokenBucket(TokenBucket):
+    """Token bucket stored in SQLite so several processes share one quota."""
+
+    def __init__(self, rate: float, burst: int, path: str, name: str = "default"):
+        super().__init__(rate, burst)
+        self.path = path
+        self.name = name
+        self._conn = None
+        # acquire() and try_acquire() run _take in worker threads on one connection
+        self._conn_lock = threading.Lock()
+
+    def _connection(self):
+        if self._conn is None:
+            conn = connect_sqlite(self.path)
+            conn.execute(
+                """CREATE TABLE IF NOT EXISTS token_buckets (
+                    name TEXT PRIMARY KEY,
+                    tokens REAL NOT NULL,
+                    updated_at REAL NOT NULL
+                )"""
+            )
+            self._conn = conn
+        return self._conn
+
+    def _take(self) -> float:
+        with self._conn_lock:
+            return self._take_locked()
+
+    def _take_locked(self) -> float:
+        # Wall clock, since monotonic clocks are not comparable across processes
+        now = time.time()
+        conn = self._connection()
+
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            row = conn.execute(
+                "SELECT tokens, updated_at FROM token_buckets WHERE name = ?",
+                (self.name,)
+            ).fetchone()
+
+            if row is None:
+                tokens = float(self.burst)
+            else:
+                elapsed = max(0.0, now - row["updated_at"])
+                tokens = min(self.burst, row["tokens"] + elapsed * self.rate)
+
+            wait = 0.0
+            if tokens >= 1:
+                tokens -= 1
+            else:
+                wait = (1 - tokens) / self.rate
+
+            conn.execute(
+                """INSERT INTO token_buckets (name, tokens, updated_at) VALUES (?, ?, ?)
+                   ON CONFLICT(name) DO UPDATE SET tokens = excluded.tokens, updated_at = excluded.updated_at""",
+                (self.name, tokens, now)
+            )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+        return wait
+
+    async def try_acquire(self) -> bool:
+        """Take a shared token without waiting (the SQLite transaction runs in a thread)."""
+        if self._lock.locked():
+            return False
+        return await asyncio.to_thread(self._take) == 0.0
+
+    async def acquire(self) -> None:
+        """Wait until a token is available in the shared bucket and take it."""
+        async with self._lock:
+            while True:
+                wait = await asyncio.to_thread(self._take)
+                if wait == 0.0:
+                    return
+                await asyncio.sleep(wait)
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """
+    Parse a Retry-After header (delay in seconds or an HTTP date).
+
+    Returns:
+        Seconds to wait, or None if the header is missing or invalid
+    """
+    if not value:
+        return None
+
+    value = value.strip()
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+
+def backoff_delay(
+    attempt: int,
+    base_delay: float,
+    max_delay: float,
+    retry_after: Optional[float] = None
+) -> float:
+    """
+    Exponential backoff with full jitter.
+
+    Args:
+        attempt: Retry number, starting at 0
+        base_delay: Delay ceiling for the first retry
+        max_delay: Upper bound on the jittered delay
+        retry_after: Server-requested delay, used as a lower bound
+
+    Returns:
+        Seconds to sleep before the next attempt
+    """
+    delay = random.uniform(0, min(max_delay, base_delay * (2 ** attempt)))
+
+    if retry_after is not None:
+        delay = max(delay, retry_after)
+
+    return delay
+
+
+def build_s2_rate_limiter() -> TokenBucket:
+    """
+    Token bucket matching Semantic Scholar's quotas.
+
+    With an API key S2 allows 1 request per second; unauthenticated traffic
+    shares a global pool, so a conservative per-host default is used.
+    Both can be overridden with S2_RATE_LIMIT_RPS / S2_RATE_LIMIT_BURST.
+    """
+    if settings.SEMANTIC_SCHOLAR_API_KEY:
+        rate, burst = 1.0, 1
+    else:
+        rate, burst = 10.0, 10
+
+    rate = settings.S2_RATE_LIMIT_RPS or rate
+    burst = settings.S2_RATE_LIMIT_BURST or burst
+
+    if settings.S2_RATE_LIMIT_SHARED_PATH:
+        return SharedTokenBucket(rate, burst, settings.S2_RATE_LIMIT_SHARED_PATH, name="semantic_scholar")
+
+    return TokenBucket(rate, burst)
@@ -0,0 +1,224 @@
+"""
+TTL response cache for upstream GET requests.
+
+Entries have a fresh TTL and a stale window: fresh entries are served
+directly, stale ones are served immediately while a background refresh
+fetches a new copy (stale-while-revalidate). Backends are pluggable: an
+in-process LRU, or a SQLite file shared by every worker on the host.
+"""
+
+import asyncio
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+import httpx
+
+from .config import settings
+from .sqlite import connect_sqlite
+
+
+class MemoryCacheBackend:
+    """Size-bounded in-process LRU."""
+
+    blocking = False
+
+    def __init__(self, max_entries: int, max_bytes: int):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def set(self, key: str, entry: Dict[str, Any]) -> None:
+        size = len(entry["content"])
+        if size > self.max_bytes:
+            return
+
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._size -= len(old["content"])
+
+            self._entries[key] = entry
+            self._size += size
+
+            while self._entries and (len(self._entries) > self.max_entries or self._size > self.max_bytes):
+                _, evicted = self._entries.popitem(last=False)
+                self._size -= len(evicted["content"])
+
+    def close(self) -> None:
+        pass
+
+
+class SQLiteCacheBackend:
+    """Size-bounded cache in a SQLite file shared by worker processes."""
+
+    blocking = True
+
+    def __init__(self, path: str, max_bytes: int):
+        self.path = path
+        self.max_bytes = max_bytes
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._conn is None:
+            conn = connect_sqlite(self.path)
+            conn.execute(
+                """CREATE TABLE IF NOT EXISTS response_cache (
+                    key TEXT PRIMARY KEY,
+                    status INTEGER NOT NULL,
+                    headers TEXT NOT NULL,
+                    content BLOB NOT NULL,
+                    stored_at REAL NOT NULL,
+                    last_used REAL NOT NULL,
+                    size INTEGER NOT NULL
+                )"""
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_response_cache_last_used ON response_cache(last_used)")
+            self._conn = conn
+        return self._conn
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            conn = self._connection()
+            row = conn.execute(
+                "SELECT status, headers, content, stored_at FROM response_cache WHERE key = ?",
+                (key,)
+            ).fetchone()
+
+            if row is None:
+                return None
+
+            conn.execute("UPDATE response_cache SET last_used = ? WHERE key = ?", (time.time(), key))
+
+        return {
+            "status": row["status"],
+            "headers": json.loads(row["headers"]),
+            "content": bytes(row["content"]),
+            "stored_at": row["stored_at"]
+        }
+
+    def set(self, key: str, entry: Dict[str, Any]) -> None:
+        size = len(entry["content"])
+        if size > self.max_bytes:
+            return
+
+        with self._lock:
+            conn = self._connection()
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                conn.execute(
+                    """INSERT OR REPLACE INTO response_cache
+                       (key, status, headers, content, stored_at, last_used, size)
+                       VALUES (?, ?, ?, ?, ?, ?, ?)""",
+                    (key, entry["status"], json.dumps(entry["headers"]), entry["content"],
+                     entry["stored_at"], time.time(), size)
+                )
+
+                # Evict least recently used entries beyond the size budget
+                total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM response_cache").fetchone()[0]
+                if total > self.max_bytes:
+                    excess = total - self.max_bytes
+                    conn.execute(
+                        """DELETE FROM response_cache WHERE key IN (
+                               SELECT key FROM (
+                                   SELECT key, SUM(size) OVER (ORDER BY last_used ASC) AS running
+                                   FROM response_cache
+                               ) WHERE running - size < ?
+                           )""",
+                        (excess,)
+                    )
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+def build_cache_backend():
+    """Create the backend selected by RESPONSE_CACHE_BACKEND (memory, sqlite or none)."""
+    backend = settings.RESPONSE_CACHE_BACKEND.lower()
+    max_bytes = settings.RESPONSE_CACHE_MAX_MB * 1024 * 1024
+
+    if backend == "none":
+        return None
+    if backend == "sqlite":
+        return SQLiteCacheBackend(settings.RESPONSE_CACHE_PATH, max_bytes)
+
+    return MemoryCacheBackend(settings.RESPONSE_CACHE_MAX_ENTRIES, max_bytes)
+
+
+class ResponseCache:
+    """Cache of upstream responses with per-entry freshness."""
+
+    def __init__(self, backend=None):
+        self.backend = backend
+
+    @property
+    def enabled(self) -> bool:
+        return self.backend is not None
+
+    async def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Look up an entry ({"status", "headers", "content", "stored_at"})."""
+        if self.backend is None:
+            return None
+
+        try:
+            if self.backend.blocking:
+                return await asyncio.to_thread(self.backend.get, key)
+            return self.backend.get(key)
+        except Exception as e:
+            print(f"Response cache read failed: {e}")
+            return None
+
+    async def set(self, key: str, response: httpx.Response) -> None:
+        """Store a successful response."""
+        if self.backend is None or response.status_code != 200:
+            return
+
+        entry = {
+            "status": response.status_code,
+            # content is already decoded, so only the content type is kept
+            "headers": {"content-type": response.headers.get("content-type", "")},
+            "content": response.content,
+            "stored_at": time.time()
+        }
+
+        try:
+            if self.backend.blocking:
+                await asyncio.to_thread(self.backend.set, key, entry)
+            else:
+                self.backend.set(key, entry)
+        except Exception as e:
+            print(f"Response cache write failed: {e}")
+
+    @staticmethod
+    def to_response(entry: Dict[str, Any], method: str, url: str) -> httpx.Response:
+        """Rebuild an httpx.Response from a cache entry."""
+        return httpx.Response(
+            entry["status"],
+            headers=entry["headers"],
+            content=entry["content"],
+            request=httpx.Request(method, url)
+        )
+
+    def close(self) -> None:
+        if self.backend is not None:
+            self.backend.close()
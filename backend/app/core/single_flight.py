@@ -0,0 +1,80 @@
+"""
+Single-flight coalescing of identical in-flight calls.
+
+Concurrent callers asking for the same key share one in-flight task
+instead of each triggering its own upstream request.
+"""
+
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple
+
+import httpx
+
+from .metrics import metrics
+
+
+def request_key(
+    upstream: str,
+    method: str,
+    url: str,
+    params: Optional[Any] = None
+) -> Tuple[str, str, str, Tuple[Tuple[str, str], ...]]:
+    """
+    Build a coalescing key from an upstream request.
+
+    Query parameters (from the URL and `params`) are sorted and their
+    whitespace collapsed, so equivalent requests map to the same key.
+    """
+    full_url = httpx.URL(url)
+    items = list(full_url.params.multi_items())
+    if params:
+        items.extend(httpx.QueryParams(params).multi_items())
+
+    query = tuple(sorted((k, " ".join(str(v).split())) for k, v in items))
+    base = str(full_url.copy_with(query=None))
+
+    return (upstream, method.upper(), base, query)
+
+
+class SingleFlight:
+    """Share one in-flight task between concurrent calls with the same key."""
+
+    def __init__(self):
+        self._inflight: Dict[Hashable, asyncio.Task] = {}
+
+    async def do(self, key: Tuple[Hashable, ...], fn: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Run `fn` unless an identical call is already in flight, then await its result.
+
+        The shared task is shielded, so one caller being cancelled does not
+        cancel the call for everyone else.
+
+        Args:
+            key: Coalescing key; key[0] is used as the metrics label
+            fn: Coroutine factory performing the call
+        """
+        label = str(key[0])
+        metrics.increment("single_flight_calls", upstream=label)
+
+        task = self._inflight.get(key)
+        if task is not None and not task.done() and task.get_loop() is asyncio.get_running_loop():
+            metrics.increment("single_flight_collapsed", upstream=label)
+            return await asyncio.shield(task)
+
+        task = asyncio.ensure_future(fn())
+        self._inflight[key] = task
+
+        def _forget(done: asyncio.Task) -> None:
+            if self._inflight.get(key) is done:
+                del self._inflight[key]
+            # Mark the exception as retrieved if every caller was cancelled
+            if not done.cancelled():
+                done.exception()
+
+        task.add_done_callback(_forget)
+
+        return await asyncio.shield(task)
+
+    def inflight(self) -> int:
+        """Number of distinct calls currently in flight."""
+        return len(self._inflight)
@@ -0,0 +1,47 @@
+"""SQLite helpers for local on-disk stores."""
+import os
+import sqlite3
+
+
+def connect_sqlite(path: str) -> sqlite3.Connection:
+    """
+    Open a SQLite database shared by threads (and other worker processes).
+
+    Uses WAL mode so readers never block the single writer, and autocommit
+    so callers can group writes with explicit BEGIN/COMMIT.
+
+    Args:
+        path: Database file path (parent directories are created)
+
+    Returns:
+        Open connection with row access by column name
+    """
+    if path != ":memory:":
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+
+    conn = sqlite3.connect(
+        path,
+        timeout=30.0,
+        check_same_thread=False,
+        isolation_level=None
+    )
+    conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute("PRAGMA busy_timeout=30000")
+
+    return conn
+
+
+def database_size_bytes(conn: sqlite3.Connection) -> int:
+    """
+    Return the number of bytes holding live data in the main database file.
+
+    Free pages are excluded: SQLite reuses them for new rows, so the file
+    does not grow while live data stays under a budget.
+    """
+    page_count = conn.execute("PRAGMA page_count").fetchone()[0]
+    freelist_count = conn.execute("PRAGMA freelist_count").fetchone()[0]
+    page_size = conn.execute("PRAGMA page_size").fetchone()[0]
+    return (page_count - freelist_count) * page_size
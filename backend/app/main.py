@@ -1,10 +1,32 @@
 """Main FastAPI application."""
-from fastapi import FastAPI
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 from .core.config import settings
+from .core.exceptions import UpstreamUnavailableError
+from .core.http_clients import http_clients
+from .core.metrics import metrics
+from .services.journal_translations_service import journal_translations_service
+from .services.papers_service_v2 import enhanced_papers_service
+from .services.translation_service import translation_service
 from .api.v1 import api_router
 
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Open shared upstream HTTP clients and background jobs on startup; close them on shutdown."""
+    await http_clients.start()
+    journal_translations_service.start()
+    await enhanced_papers_service.jobs.start()
+    yield
+    await enhanced_papers_service.jobs.stop()
+    await journal_translations_service.stop()
+    await enhanced_papers_service.prefetcher.stop()
+    await http_clients.aclose()
+    translation_service.shutdown()
+
+
 def create_app() -> FastAPI:
     """Create and configure FastAPI application."""
     app = FastAPI(
@@ -13,7 +35,8 @@ def create_app() -> FastAPI:
         description="AI-Enabled Research Support Platform API",
         docs_url="/api/docs",
         redoc_url="/api/redoc",
-        openapi_url="/api/openapi.json"
+        openapi_url="/api/openapi.json",
+        lifespan=lifespan
     )
 
     # CORS middleware
@@ -25,6 +48,15 @@ def create_app() -> FastAPI:
         allow_headers=["*"],
     )
 
+    @app.exception_handler(UpstreamUnavailableError)
+    async def upstream_unavailable_handler(request: Request, exc: UpstreamUnavailableError):
+        """Fail fast with 503 when a provider is saturated or its circuit is open."""
+        return JSONResponse(
+            status_code=503,
+            content={"detail": str(exc), "upstream": exc.upstream},
+            headers={"Retry-After": "5"}
+        )
+
     # Include API router
     app.include_router(api_router, prefix=settings.API_V1_PREFIX)
 
@@ -39,13 +71,23 @@ def create_app() -> FastAPI:
 
     @app.get("/health")
     async def health():
-        """Detailed health check."""
+        """Detailed health check, including upstream circuit breaker state."""
         return {
             "status": "healthy",
             "environment": settings.ENVIRONMENT,
-            "api_version": "v1"
+            "api_version": "v1",
+            "upstreams": http_clients.health(),
+            "translation_providers": translation_service.router.snapshot()
         }
 
+    @app.get("/metrics")
+    async def get_metrics():
+        """Operational counters (upstream request coalescing, ...)."""
+        snapshot = metrics.snapshot()
+        snapshot["translation_skip_rate"] = translation_service.skip_rate()
+        snapshot["analysis_jobs"] = enhanced_papers_service.jobs.store.counts()
+        return snapshot
+
     return app
 
 
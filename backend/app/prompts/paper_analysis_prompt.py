@@ -411,6 +411,20 @@ Original analysis:
 Return ONLY the translated JSON with no additional text."""
 
 
+SEGMENT_TRANSLATION_PROMPT_TEMPLATE = """Translate the following text from {source_language} to {target_language}.
+
+Requirements:
+1. Keep every numbered marker such as [[0]], [[1]] exactly as written, in the same order
+2. Translate the text after each marker; never merge, split or drop segments
+3. Keep numbers, equations, citations and URLs unchanged
+4. Use academic terminology appropriate for {target_language}
+
+Text:
+{text}
+
+Return ONLY the translated text with no additional commentary."""
+
+
 def get_analysis_prompt(
     paper_type: str = "research",
     length: str = "full"
@@ -450,3 +464,26 @@ def get_translation_prompt(
         target_language=target_language,
         analysis_json=analysis_json
     )
+
+
+def get_segment_translation_prompt(
+    text: str,
+    source_language: str,
+    target_language: str
+) -> str:
+    """
+    Get the prompt for translating plain (marker-tagged) text segments.
+
+    Args:
+        text: Text to translate, possibly several segments tagged [[n]]
+        source_language: Source language code (e.g., "en", or "auto")
+        target_language: Target language code (e.g., "hi", "zh-CN")
+
+    Returns:
+        Formatted translation prompt
+    """
+    return SEGMENT_TRANSLATION_PROMPT_TEMPLATE.format(
+        source_language="its original language" if source_language == "auto" else source_language,
+        target_language=target_language,
+        text=text
+    )
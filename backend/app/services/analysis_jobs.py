@@ -0,0 +1,405 @@
+"""
+Durable job queue for paper analysis.
+
+Analyzing a paper takes 30-90 seconds, too long to hold an HTTP request
+open. Processing requests become jobs in a local SQLite table and return
+immediately; a small pool of worker tasks runs them in the background.
+
+Jobs move through queued -> running -> done | failed. Running jobs
+heartbeat while they work, so a job whose process died (restart, crash)
+is put back in the queue once its heartbeat goes stale, by any worker
+process sharing the database. Jobs rejected by a saturated or unhealthy
+provider are retried with backoff, up to ANALYSIS_JOB_MAX_ATTEMPTS.
+"""
+
+import asyncio
+import sqlite3
+import threading
+import time
+import uuid
+from datetime import datetime, timezone
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from ..core.config import settings
+from ..core.exceptions import UpstreamUnavailableError
+from ..core.metrics import metrics
+from ..core.rate_limiter import backoff_delay
+from ..core.sqlite import connect_sqlite
+
+
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+
+SCHEMA = [
+    """CREATE TABLE IF NOT EXISTS analysis_jobs (
+        id TEXT PRIMARY KEY,
+        paper_id TEXT NOT NULL,
+        user_id TEXT NOT NULL,
+        paper_type TEXT NOT NULL,
+        status TEXT NOT NULL,
+        attempts INTEGER NOT NULL DEFAULT 0,
+        error TEXT,
+        created_at REAL NOT NULL,
+        run_after REAL NOT NULL,
+        started_at REAL,
+        heartbeat_at REAL,
+        finished_at REAL
+    )""",
+    "CREATE INDEX IF NOT EXISTS idx_analysis_jobs_status ON analysis_jobs(status, run_after)",
+    "CREATE INDEX IF NOT EXISTS idx_analysis_jobs_paper ON analysis_jobs(paper_id, created_at)",
+]
+
+
+def _iso(timestamp: Optional[float]) -> Optional[str]:
+    return datetime.fromtimestamp(timestamp, timezone.utc).isoformat() if timestamp else None
+
+
+def job_status(job: Dict[str, Any]) -> Dict[str, Any]:
+    """API view of a job (ISO timestamps, no scheduling internals)."""
+    return {
+        "job_id": job["id"],
+        "paper_id": job["paper_id"],
+        "status": job["status"],
+        "attempts": job["attempts"],
+        "error": job["error"],
+        "created_at": _iso(job["created_at"]),
+        "started_at": _iso(job["started_at"]),
+        "finished_at": _iso(job["finished_at"]),
+    }
+
+
+class JobStore:
+    """SQLite table of analysis jobs, shared by worker processes."""
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path if path is not None else settings.ANALYSIS_JOBS_PATH
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+
+    def _connection(self) -> sqlite3.Connection:
+        """Open the database and create the schema on first use."""
+        if self._conn is None:
+            conn = connect_sqlite(self.path)
+            for statement in SCHEMA:
+                conn.execute(statement)
+            self._conn = conn
+        return self._conn
+
+    def _fetch(self, conn: sqlite3.Connection, job_id: str) -> Optional[Dict[str, Any]]:
+        row = conn.execute("SELECT * FROM analysis_jobs WHERE id = ?", (job_id,)).fetchone()
+        return dict(row) if row else None
+
+    def create(self, paper_id: str, user_id: str, paper_type: str) -> Tuple[Dict[str, Any], bool]:
+        """
+        Queue a job for a paper, unless one is already queued or running.
+
+        Returns:
+            (job, created) - the existing job and False for duplicates
+        """
+        with self._lock:
+            conn = self._connection()
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                existing = conn.execute(
+                    "SELECT * FROM analysis_jobs WHERE paper_id = ? AND status IN (?, ?) "
+                    "ORDER BY created_at DESC LIMIT 1",
+                    (paper_id, QUEUED, RUNNING)
+                ).fetchone()
+                if existing:
+                    conn.execute("COMMIT")
+                    return dict(existing), False
+
+                now = time.time()
+                job_id = str(uuid.uuid4())
+                conn.execute(
+                    "INSERT INTO analysis_jobs (id, paper_id, user_id, paper_type, status, created_at, run_after) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (job_id, paper_id, user_id, paper_type, QUEUED, now, now)
+                )
+                job = self._fetch(conn, job_id)
+                conn.execute("COMMIT")
+                return job, True
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            return self._fetch(self._connection(), job_id)
+
+    def latest(self, paper_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Most recent job of each paper ({paper_id: job}, papers without jobs omitted)."""
+        if not paper_ids:
+            return {}
+        placeholders = ", ".join("?" for _ in paper_ids)
+        with self._lock:
+            rows = self._connection().execute(
+                f"SELECT * FROM analysis_jobs WHERE paper_id IN ({placeholders}) ORDER BY created_at, rowid",
+                list(paper_ids)
+            ).fetchall()
+        return {row["paper_id"]: dict(row) for row in rows}
+
+    def claim(self) -> Optional[Dict[str, Any]]:
+        """Atomically take the oldest due queued job and mark it running (None if idle)."""
+        with self._lock:
+            conn = self._connection()
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                now = time.time()
+                row = conn.execute(
+                    "SELECT id FROM analysis_jobs WHERE status = ? AND run_after <= ? "
+                    "ORDER BY run_after, created_at LIMIT 1",
+                    (QUEUED, now)
+                ).fetchone()
+                if row is None:
+                    conn.execute("COMMIT")
+                    return None
+
+                conn.execute(
+                    "UPDATE analysis_jobs SET status = ?, attempts = attempts + 1, "
+                    "started_at = ?, heartbeat_at = ?, error = NULL WHERE id = ?",
+                    (RUNNING, now, now, row["id"])
+                )
+                job = self._fetch(conn, row["id"])
+                conn.execute("COMMIT")
+                return job
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+
+    def heartbeat(self, job_id: str) -> None:
+        with self._lock:
+            self._connection().execute(
+                "UPDATE analysis_jobs SET heartbeat_at = ? WHERE id = ? AND status = ?",
+                (time.time(), job_id, RUNNING)
+            )
+
+    def finish(self, job_id: str, error: Optional[str] = None) -> None:
+        """Mark a running job done, or failed with an error."""
+        with self._lock:
+            self._connection().execute(
+                "UPDATE analysis_jobs SET status = ?, error = ?, finished_at = ? WHERE id = ?",
+                (FAILED if error else DONE, error, time.time(), job_id)
+            )
+
+    def requeue(self, job_id: str, delay: float = 0.0, error: Optional[str] = None) -> None:
+        """Put a running job back in the queue, to run again after delay seconds."""
+        with self._lock:
+            self._connection().execute(
+                "UPDATE analysis_jobs SET status = ?, error = ?, run_after = ?, heartbeat_at = NULL "
+                "WHERE id = ?",
+                (QUEUED, error, time.time() + delay, job_id)
+            )
+
+    def recover(self, stale_seconds: float, max_attempts: int) -> Tuple[int, List[Dict[str, Any]]]:
+        """
+        Requeue running jobs whose worker stopped heartbeating.
+
+        Jobs that were already interrupted max_attempts times are failed
+        instead, so a paper that crashes the worker cannot loop forever.
+
+        Returns:
+            (number of requeued jobs, jobs that were failed)
+        """
+        with self._lock:
+            conn = self._connection()
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                now = time.time()
+                stale = conn.execute(
+                    "SELECT * FROM analysis_jobs WHERE status = ? AND heartbeat_at < ?",
+                    (RUNNING, now - stale_seconds)
+                ).fetchall()
+
+                requeued = 0
+                failed = []
+                for row in stale:
+                    if row["attempts"] >= max_attempts:
+                        error = f"Processing was interrupted {row['attempts']} times"
+                        conn.execute(
+                            "UPDATE analysis_jobs SET status = ?, error = ?, finished_at = ? WHERE id = ?",
+                            (FAILED, error, now, row["id"])
+                        )
+                        failed.append({**dict(row), "status": FAILED, "error": error, "finished_at": now})
+                    else:
+                        conn.execute(
+                            "UPDATE analysis_jobs SET status = ?, run_after = ?, heartbeat_at = NULL "
+                            "WHERE id = ?",
+                            (QUEUED, now, row["id"])
+                        )
+                        requeued += 1
+
+                conn.execute("COMMIT")
+                return requeued, failed
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+
+    def counts(self) -> Dict[str, int]:
+        """Jobs per status, for /metrics."""
+        with self._lock:
+            rows = self._connection().execute(
+                "SELECT status, COUNT(*) AS n FROM analysis_jobs GROUP BY status"
+            ).fetchall()
+        return {row["status"]: row["n"] for row in rows}
+
+
+class AnalysisJobQueue:
+    """Worker pool that runs queued analysis jobs in the background."""
+
+    def __init__(
+        self,
+        run: Callable[[Dict[str, Any]], Awaitable[Any]],
+        on_failure: Optional[Callable[[Dict[str, Any]], None]] = None,
+        store: Optional[JobStore] = None,
+        workers: Optional[int] = None,
+        max_attempts: Optional[int] = None,
+        poll_seconds: float = 5.0,
+        heartbeat_seconds: float = 15.0,
+        stale_seconds: float = 120.0
+    ):
+        """
+        Args:
+            run: Coroutine function that processes a job; raising fails it
+                (UpstreamUnavailableError retries it with backoff)
+            on_failure: Called (in a thread) with a job once it has failed for good
+            store: Job table (default: SQLite at ANALYSIS_JOBS_PATH)
+            workers: Jobs run concurrently by this process (default: ANALYSIS_WORKERS)
+            max_attempts: Attempts per job (default: ANALYSIS_JOB_MAX_ATTEMPTS)
+            poll_seconds: How often idle workers look for due jobs
+            heartbeat_seconds: How often running jobs refresh their heartbeat
+            stale_seconds: Running jobs without a heartbeat for this long are requeued
+        """
+        self.run = run
+        self.on_failure = on_failure
+        self.store = store or JobStore()
+        self.workers = max(1, workers if workers is not None else settings.ANALYSIS_WORKERS)
+        self.max_attempts = max(1, max_attempts if max_attempts is not None else settings.ANALYSIS_JOB_MAX_ATTEMPTS)
+        self.poll_seconds = poll_seconds
+        self.heartbeat_seconds = heartbeat_seconds
+        self.stale_seconds = stale_seconds
+
+        self._tasks: List[asyncio.Task] = []
+        self._wakeup: Optional[asyncio.Event] = None
+
+    def _ensure_workers(self) -> None:
+        if self._wakeup is None:
+            self._wakeup = asyncio.Event()
+        self._tasks = [task for task in self._tasks if not task.done()]
+        while len(self._tasks) < self.workers:
+            self._tasks.append(asyncio.create_task(self._work()))
+
+    async def start(self) -> None:
+        """Recover jobs interrupted by a restart and start the workers."""
+        await self._recover()
+        self._ensure_workers()
+
+    async def submit(self, paper_id: str, user_id: str, paper_type: str = "research") -> Dict[str, Any]:
+        """
+        Queue a paper for analysis and return its job at once.
+
+        A paper that is already queued or running keeps its current job.
+        """
+        job, created = await asyncio.to_thread(self.store.create, paper_id, user_id, paper_type)
+        if created:
+            metrics.increment("analysis_jobs_submitted")
+        self._ensure_workers()
+        self._wakeup.set()
+        return job
+
+    async def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        return await asyncio.to_thread(self.store.get, job_id)
+
+    async def latest(self, paper_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        return await asyncio.to_thread(self.store.latest, paper_ids)
+
+    async def _recover(self) -> None:
+        try:
+            requeued, failed = await asyncio.to_thread(
+                self.store.recover, self.stale_seconds, self.max_attempts
+            )
+        except Exception as e:
+            print(f"⚠️  Analysis job recovery failed: {e}")
+            return
+
+        if requeued:
+            print(f"♻️  Requeued {requeued} interrupted analysis job(s)")
+            metrics.increment("analysis_jobs_recovered", requeued)
+        for job in failed:
+            await self._failed(job)
+
+    async def _failed(self, job: Dict[str, Any]) -> None:
+        metrics.increment("analysis_jobs_failed")
+        if self.on_failure is None:
+            return
+        try:
+            await asyncio.to_thread(self.on_failure, job)
+        except Exception as e:
+            print(f"⚠️  Could not record failure of job {job['id']}: {e}")
+
+    async def _heartbeat(self, job_id: str) -> None:
+        while True:
+            await asyncio.sleep(self.heartbeat_seconds)
+            try:
+                await asyncio.to_thread(self.store.heartbeat, job_id)
+            except Exception as e:
+                print(f"⚠️  Heartbeat for job {job_id} failed: {e}")
+
+    async def _execute(self, job: Dict[str, Any]) -> None:
+        heartbeat = asyncio.create_task(self._heartbeat(job["id"]))
+        try:
+            await self.run(job)
+        except UpstreamUnavailableError as e:
+            if job["attempts"] < self.max_attempts:
+                delay = backoff_delay(job["attempts"] - 1, base_delay=10.0, max_delay=120.0)
+                await asyncio.to_thread(self.store.requeue, job["id"], delay, str(e))
+                metrics.increment("analysis_jobs_retried")
+                print(f"⏳ Job {job['id']} retried in {delay:.0f}s: {e}")
+            else:
+                await asyncio.to_thread(self.store.finish, job["id"], str(e))
+                await self._failed({**job, "status": FAILED, "error": str(e)})
+        except asyncio.CancelledError:
+            # Shutting down: hand the job back instead of waiting for its heartbeat to go stale
+            self.store.requeue(job["id"])
+            raise
+        except Exception as e:
+            print(f"❌ Analysis job {job['id']} failed: {e}")
+            await asyncio.to_thread(self.store.finish, job["id"], str(e))
+            await self._failed({**job, "status": FAILED, "error": str(e)})
+        else:
+            await asyncio.to_thread(self.store.finish, job["id"])
+            metrics.increment("analysis_jobs_completed")
+        finally:
+            heartbeat.cancel()
+
+    async def _work(self) -> None:
+        while True:
+            self._wakeup.clear()
+            try:
+                job = await asyncio.to_thread(self.store.claim)
+            except Exception as e:
+                print(f"⚠️  Could not claim an analysis job: {e}")
+                job = None
+
+            if job is not None:
+                await self._execute(job)
+                continue
+
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.poll_seconds)
+            except asyncio.TimeoutError:
+                await self._recover()
+
+    async def stop(self) -> None:
+        """Stop the workers; running jobs go back to the queue."""
+        tasks, self._tasks = self._tasks, []
+        for task in tasks:
+            task.cancel()
+        for task in tasks:
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+        self._wakeup = None
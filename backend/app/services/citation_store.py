@@ -0,0 +1,256 @@
+"""
+Local citation metadata store.
+
+Keeps CrossRef work metadata in an on-disk SQLite database with an FTS5
+full-text index so citation lookups can be answered without a network
+round trip. The store is filled from live CrossRef responses and from
+bulk-imported metadata dumps (see scripts/import_citations.py).
+"""
+
+import re
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Iterable, List, Optional
+
+from ..core.config import settings
+from ..core.sqlite import connect_sqlite, database_size_bytes
+
+
+SCHEMA = [
+    """CREATE TABLE IF NOT EXISTS works (
+        doi TEXT PRIMARY KEY,
+        title TEXT NOT NULL,
+        abstract TEXT,
+        authors TEXT,
+        year INTEGER,
+        journal TEXT,
+        last_used REAL NOT NULL
+    )""",
+    "CREATE INDEX IF NOT EXISTS idx_works_last_used ON works(last_used)",
+    """CREATE VIRTUAL TABLE IF NOT EXISTS works_fts USING fts5(
+        title, abstract, content='works', content_rowid='rowid'
+    )""",
+    """CREATE TRIGGER IF NOT EXISTS works_ai AFTER INSERT ON works BEGIN
+        INSERT INTO works_fts(rowid, title, abstract) VALUES (new.rowid, new.title, new.abstract);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS works_ad AFTER DELETE ON works BEGIN
+        INSERT INTO works_fts(works_fts, rowid, title, abstract) VALUES ('delete', old.rowid, old.title, old.abstract);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS works_au AFTER UPDATE ON works BEGIN
+        INSERT INTO works_fts(works_fts, rowid, title, abstract) VALUES ('delete', old.rowid, old.title, old.abstract);
+        INSERT INTO works_fts(rowid, title, abstract) VALUES (new.rowid, new.title, new.abstract);
+    END""",
+]
+
+
+def work_from_crossref(item: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """
+    Normalize a CrossRef work item into a store record.
+
+    Returns None for items without a DOI or title.
+    """
+    doi = (item.get("DOI") or "").strip().lower()
+
+    title = item.get("title", "")
+    if isinstance(title, list):
+        title = title[0] if title else ""
+    title = (title or "").strip()
+
+    if not doi or not title:
+        return None
+
+    # Format author names
+    authors = []
+    for author in item.get("author", [])[:3]:  # First 3 authors
+        given = author.get("given", "")
+        family = author.get("family", "")
+        if family:
+            authors.append(f"{given} {family}".strip())
+
+    # Get publication year
+    year = None
+    for date_key in ("published", "published-print", "published-online", "issued"):
+        date_parts = (item.get(date_key) or {}).get("date-parts", [[]])
+        if date_parts and date_parts[0] and date_parts[0][0]:
+            year = date_parts[0][0]
+            break
+
+    # Get journal name
+    journal = None
+    if item.get("container-title"):
+        journal = item["container-title"][0]
+
+    # CrossRef abstracts are JATS XML
+    abstract = re.sub(r"<[^>]+>", " ", item.get("abstract", "") or "")
+    abstract = re.sub(r"\s+", " ", abstract).strip()
+
+    return {
+        "doi": doi,
+        "title": title,
+        "abstract": abstract or None,
+        "authors": ", ".join(authors) if authors else None,
+        "year": year,
+        "journal": journal
+    }
+
+
+class CitationStore:
+    """SQLite/FTS5 store of citation metadata with bounded disk usage."""
+
+    def __init__(self, path: Optional[str] = None, max_mb: Optional[int] = None):
+        self.path = path or settings.CITATION_STORE_PATH
+        self.max_bytes = (max_mb if max_mb is not None else settings.CITATION_STORE_MAX_MB) * 1024 * 1024
+
+        # Evict this fraction of rows (least recently used first) when over the limit
+        self.eviction_fraction = 0.1
+
+        self.enabled = bool(self.path)
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+
+    def _connection(self) -> Optional[sqlite3.Connection]:
+        """Open the database and create the schema on first use."""
+        if self._conn is not None or not self.enabled:
+            return self._conn
+
+        try:
+            conn = connect_sqlite(self.path)
+            for statement in SCHEMA:
+                conn.execute(statement)
+            self._conn = conn
+        except sqlite3.Error as e:
+            # FTS5 missing from the SQLite build, unwritable path, ...
+            print(f"⚠️  Citation store disabled: {e}")
+            self.enabled = False
+
+        return self._conn
+
+    def add_works(self, works: Iterable[Dict[str, Any]]) -> int:
+        """
+        Insert or update work records.
+
+        Args:
+            works: Records as returned by work_from_crossref
+
+        Returns:
+            Number of records written
+        """
+        now = time.time()
+        rows = [
+            (w["doi"], w["title"], w.get("abstract"), w.get("authors"),
+             w.get("year"), w.get("journal"), now)
+            for w in works if w
+        ]
+
+        if not rows:
+            return 0
+
+        with self._lock:
+            conn = self._connection()
+            if conn is None:
+                return 0
+
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                conn.executemany(
+                    """INSERT INTO works (doi, title, abstract, authors, year, journal, last_used)
+                       VALUES (?, ?, ?, ?, ?, ?, ?)
+                       ON CONFLICT(doi) DO UPDATE SET
+                           title = excluded.title,
+                           abstract = COALESCE(excluded.abstract, works.abstract),
+                           authors = COALESCE(excluded.authors, works.authors),
+                           year = COALESCE(excluded.year, works.year),
+                           journal = COALESCE(excluded.journal, works.journal)""",
+                    rows
+                )
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+
+            self._enforce_size_limit(conn)
+
+        return len(rows)
+
+    def search(self, terms: List[str], limit: int = 20, match_all: bool = False) -> List[Dict[str, Any]]:
+        """
+        Full-text search over titles and abstracts.
+
+        Args:
+            terms: Query terms (BM25-ranked)
+            limit: Max results
+            match_all: Only return works matching every term (default: any term)
+
+        Returns:
+            Work records with a "score" (higher is better)
+        """
+        tokens = [re.sub(r'[^\w]', '', t) for t in terms]
+        tokens = [t for t in tokens if t]
+
+        if not tokens:
+            return []
+
+        match = (" AND " if match_all else " OR ").join(f'"{t}"' for t in tokens)
+
+        with self._lock:
+            conn = self._connection()
+            if conn is None:
+                return []
+
+            rows = conn.execute(
+                """SELECT w.doi, w.title, w.abstract, w.authors, w.year, w.journal,
+                          -bm25(works_fts) AS score
+                   FROM works_fts JOIN works w ON w.rowid = works_fts.rowid
+                   WHERE works_fts MATCH ?
+                   ORDER BY bm25(works_fts)
+                   LIMIT ?""",
+                (match, limit)
+            ).fetchall()
+
+            if rows:
+                conn.executemany(
+                    "UPDATE works SET last_used = ? WHERE doi = ?",
+                    [(time.time(), row["doi"]) for row in rows]
+                )
+
+        return [dict(row) for row in rows]
+
+    def count(self) -> int:
+        """Number of works in the store."""
+        with self._lock:
+            conn = self._connection()
+            if conn is None:
+                return 0
+            return conn.execute("SELECT COUNT(*) FROM works").fetchone()[0]
+
+    def _enforce_size_limit(self, conn: sqlite3.Connection) -> None:
+        """Evict least recently used works until the database fits in max_bytes."""
+        if self.max_bytes <= 0:
+            return
+
+        while database_size_bytes(conn) > self.max_bytes:
+            total = conn.execute("SELECT COUNT(*) FROM works").fetchone()[0]
+            if total == 0:
+                break
+
+            evict = max(1, int(total * self.eviction_fraction))
+            conn.execute(
+                """DELETE FROM works WHERE doi IN (
+                       SELECT doi FROM works ORDER BY last_used ASC LIMIT ?
+                   )""",
+                (evict,)
+            )
+            # Merge FTS segments so deleted rows stop taking up index pages
+            conn.execute("INSERT INTO works_fts(works_fts) VALUES ('optimize')")
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+# Global store instance
+citation_store = CitationStore()
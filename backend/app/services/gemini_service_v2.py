@@ -12,9 +12,12 @@ import asyncio
 from PyPDF2 import PdfReader
 
 from ..core.config import settings
+from ..core.exceptions import UpstreamUnavailableError
+from ..core.http_clients import http_clients
 from ..prompts.paper_analysis_prompt import (
     get_analysis_prompt,
     get_translation_prompt,
+    get_segment_translation_prompt,
     PAPER_ANALYSIS_SCHEMA
 )
 
@@ -64,6 +67,21 @@ def calculate_max_tokens(page_count: int) -> int:
     return tokens
 
 
+def calculate_translation_max_tokens(text: str) -> int:
+    """
+    Calculate max_tokens for translating text.
+
+    Args:
+        text: Text to translate
+
+    Returns:
+        Appropriate max_tokens value
+    """
+    # Non-Latin scripts (Devanagari, Tamil, ...) can take ~2 tokens per character
+    tokens_per_char = 2
+    return max(1000, min(len(text) * tokens_per_char, 16000))
+
+
 class EnhancedGeminiService:
     """
     Service for analyzing research papers using Gemini 2.5 Flash Lite.
@@ -137,47 +155,48 @@ class EnhancedGeminiService:
 
             # Send PDF directly to Gemini 2.5 Flash Lite via OpenRouter
             # Use the correct "file" content type with pdf-text engine (free)
-            response = await asyncio.wait_for(
-                self.client.chat.completions.create(
-                    model=self.analysis_model,
-                    messages=[
-                        {
-                            "role": "system",
-                            "content": system_prompt
-                        },
-                        {
-                            "role": "user",
-                            "content": [
-                                {
-                                    "type": "text",
-                                    "text": "Please analyze this research paper PDF following the structured format."
-                                },
+            async with http_clients.bulkhead("openrouter"):
+                response = await asyncio.wait_for(
+                    self.client.chat.completions.create(
+                        model=self.analysis_model,
+                        messages=[
+                            {
+                                "role": "system",
+                                "content": system_prompt
+                            },
+                            {
+                                "role": "user",
+                                "content": [
+                                    {
+                                        "type": "text",
+                                        "text": "Please analyze this research paper PDF following the structured format."
+                                    },
+                                    {
+                                        "type": "file",
+                                        "file": {
+                                            "filename": "paper.pdf",
+                                            "file_data": f"data:application/pdf;base64,{pdf_base64}"
+                                        }
+                                    }
+                                ]
+                            }
+                        ],
+                        temperature=self.analysis_temperature,
+                        response_format={"type": "json_object"},
+                        max_tokens=max_tokens,  # Dynamic allocation based on page count
+                        extra_body={
+                            "plugins": [
                                 {
-                                    "type": "file",
-                                    "file": {
-                                        "filename": "paper.pdf",
-                                        "file_data": f"data:application/pdf;base64,{pdf_base64}"
+                                    "id": "file-parser",
+                                    "pdf": {
+                                        "engine": "pdf-text"  # Free text extraction
                                     }
                                 }
                             ]
                         }
-                    ],
-                    temperature=self.analysis_temperature,
-                    response_format={"type": "json_object"},
-                    max_tokens=max_tokens,  # Dynamic allocation based on page count
-                    extra_body={
-                        "plugins": [
-                            {
-                                "id": "file-parser",
-                                "pdf": {
-                                    "engine": "pdf-text"  # Free text extraction
-                                }
-                            }
-                        ]
-                    }
-                ),
-                timeout=self.analysis_timeout
-            )
+                    ),
+                    timeout=self.analysis_timeout
+                )
 
             # Check if response was truncated
             finish_reason = response.choices[0].finish_reason
@@ -235,6 +254,8 @@ class EnhancedGeminiService:
 
             return analysis
 
+        except UpstreamUnavailableError:
+            raise
         except asyncio.TimeoutError:
             raise Exception(f"Analysis timeout after {self.analysis_timeout} seconds")
         except json.JSONDecodeError as e:
@@ -274,21 +295,22 @@ class EnhancedGeminiService:
             )
 
             # Call Gemini for translation
-            response = await asyncio.wait_for(
-                self.client.chat.completions.create(
-                    model=self.translation_model,
-                    messages=[
-                        {
-                            "role": "user",
-                            "content": prompt
-                        }
-                    ],
-                    temperature=self.translation_temperature,
-                    response_format={"type": "json_object"},
-                    max_tokens=4000
-                ),
-                timeout=self.translation_timeout
-            )
+            async with http_clients.bulkhead("openrouter"):
+                response = await asyncio.wait_for(
+                    self.client.chat.completions.create(
+                        model=self.translation_model,
+                        messages=[
+                            {
+                                "role": "user",
+                                "content": prompt
+                            }
+                        ],
+                        temperature=self.translation_temperature,
+                        response_format={"type": "json_object"},
+                        max_tokens=4000
+                    ),
+                    timeout=self.translation_timeout
+                )
 
             # Parse translated response
             content = response.choices[0].message.content
@@ -304,6 +326,8 @@ class EnhancedGeminiService:
 
             return translated
 
+        except UpstreamUnavailableError:
+            raise
         except asyncio.TimeoutError:
             raise Exception(f"Translation timeout after {self.translation_timeout} seconds")
         except json.JSONDecodeError as e:
@@ -311,6 +335,58 @@ class EnhancedGeminiService:
         except Exception as e:
             raise Exception(f"Translation failed: {str(e)}")
 
+    async def translate_text(
+        self,
+        text: str,
+        target_language: str,
+        source_language: str = "en"
+    ) -> str:
+        """
+        Translate plain text, keeping [[n]] segment markers intact.
+
+        Used as a translation provider alongside Google Translate, so the
+        text may hold several marker-tagged segments of one batch.
+
+        Args:
+            text: Text to translate
+            target_language: Target language code (e.g., "hi", "zh-CN")
+            source_language: Source language code (default: "en")
+
+        Returns:
+            Translated text
+
+        Raises:
+            Exception: If the API key is missing or translation fails
+        """
+        if not self.api_key_configured:
+            raise Exception("OPENROUTER_API_KEY not configured")
+
+        try:
+            async with http_clients.bulkhead("openrouter_translate"):
+                response = await asyncio.wait_for(
+                    self.client.chat.completions.create(
+                        model=self.translation_model,
+                        messages=[
+                            {
+                                "role": "user",
+                                "content": get_segment_translation_prompt(text, source_language, target_language)
+                            }
+                        ],
+                        temperature=self.translation_temperature,
+                        max_tokens=calculate_translation_max_tokens(text)
+                    ),
+                    timeout=self.translation_timeout
+                )
+
+            return (response.choices[0].message.content or "").strip()
+
+        except UpstreamUnavailableError:
+            raise
+        except asyncio.TimeoutError:
+            raise Exception(f"Translation timeout after {self.translation_timeout} seconds")
+        except Exception as e:
+            raise Exception(f"Translation failed: {str(e)}")
+
     async def analyze_and_translate(
         self,
         pdf_bytes: bytes,
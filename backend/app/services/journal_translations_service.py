@@ -0,0 +1,217 @@
+"""
+Precomputed translations of the journals catalog.
+
+The journals table is small and rarely changes, so instead of translating
+journal names and descriptions on every non-English request, a background
+job materializes them for every supported language into the
+journal_translations table. Only journals whose name/description changed
+since the last run are re-translated. Routers overlay the precomputed
+translations from an in-process snapshot, so a non-English response costs
+the same as an English one.
+"""
+
+import asyncio
+import hashlib
+from typing import Any, Dict, List, Optional
+
+from ..core.config import settings
+from ..core.metrics import metrics
+from ..core.supabase import supabase
+from .translatable_fields import JOURNAL_FIELDS
+from .translation_service import TranslationService, translation_service as default_translation_service
+
+
+TRANSLATABLE_FIELDS = ["name", "description"]
+
+
+def source_hash(journal: Dict[str, Any]) -> str:
+    """Hash of the English fields a translation was made from."""
+    source = "\x1f".join(journal.get(field) or "" for field in TRANSLATABLE_FIELDS)
+    return hashlib.sha256(source.encode("utf-8")).hexdigest()
+
+
+class JournalTranslationsService:
+    """Materializes and serves per-language journal names and descriptions."""
+
+    def __init__(
+        self,
+        translation_service: Optional[TranslationService] = None,
+        refresh_seconds: Optional[float] = None
+    ):
+        self.translation_service = translation_service or default_translation_service
+        self.refresh_seconds = (
+            refresh_seconds if refresh_seconds is not None
+            else settings.JOURNAL_TRANSLATION_REFRESH_SECONDS
+        )
+        # {language: {journal_id: {"name", "description", "source_hash"}}}
+        self._snapshot: Dict[str, Dict[str, Dict[str, Any]]] = {}
+        self._task: Optional[asyncio.Task] = None
+        self._lock = asyncio.Lock()
+
+    @property
+    def languages(self) -> List[str]:
+        """Every supported language other than the catalog's own (English)."""
+        return [code for code in self.translation_service.lang_map if code != "en"]
+
+    def _fetch_catalog(self) -> List[Dict[str, Any]]:
+        result = supabase.table("journals").select("id, name, description").execute()
+        return result.data or []
+
+    def _fetch_translations(self) -> List[Dict[str, Any]]:
+        result = supabase.table("journal_translations").select(
+            "journal_id, language, name, description, source_hash"
+        ).execute()
+        return result.data or []
+
+    def _save_translations(self, rows: List[Dict[str, Any]]) -> None:
+        supabase.table("journal_translations").upsert(
+            rows, on_conflict="journal_id,language"
+        ).execute()
+
+    async def load(self) -> None:
+        """Load stored translations into the in-process snapshot."""
+        rows = await asyncio.to_thread(self._fetch_translations)
+        snapshot: Dict[str, Dict[str, Dict[str, Any]]] = {}
+        for row in rows:
+            snapshot.setdefault(row["language"], {})[str(row["journal_id"])] = {
+                "name": row.get("name"),
+                "description": row.get("description"),
+                "source_hash": row.get("source_hash"),
+            }
+        self._snapshot = snapshot
+
+    async def refresh(self) -> int:
+        """
+        Translate journals that are new or changed since their stored translation.
+
+        Returns:
+            Number of (journal, language) rows written
+        """
+        async with self._lock:
+            catalog = await asyncio.to_thread(self._fetch_catalog)
+            written = 0
+
+            for language in self.languages:
+                stored = self._snapshot.get(language, {})
+                stale = []
+                for journal in catalog:
+                    digest = source_hash(journal)
+                    cached = stored.get(str(journal["id"]))
+                    if cached is None or cached["source_hash"] != digest:
+                        stale.append({
+                            "journal_id": str(journal["id"]),
+                            "language": language,
+                            "name": journal.get("name"),
+                            "description": journal.get("description"),
+                            "source_hash": digest,
+                        })
+
+                if not stale:
+                    continue
+
+                _, failed = await self.translation_service.translate_fields_with_failures(
+                    stale, JOURNAL_FIELDS, target_language=language
+                )
+
+                # Leave rows with a failed field for the next run. Rows that translate
+                # to themselves (brand names like "Nature") are stored like any other.
+                failed_rows = {path[0] for path in failed}
+                stale = [row for index, row in enumerate(stale) if index not in failed_rows]
+                if not stale:
+                    continue
+
+                await asyncio.to_thread(self._save_translations, stale)
+
+                language_snapshot = dict(stored)
+                for row in stale:
+                    language_snapshot[row["journal_id"]] = {
+                        field: row[field] for field in TRANSLATABLE_FIELDS + ["source_hash"]
+                    }
+                self._snapshot[language] = language_snapshot
+                written += len(stale)
+
+            metrics.increment("journal_translations_refreshed", written)
+            return written
+
+    def apply(self, journals: List[Dict[str, Any]], language: str) -> List[Dict[str, Any]]:
+        """
+        Overlay precomputed translations onto journal dicts in place.
+
+        A translation is only used while it still matches the journal's
+        current English name and description.
+
+        Args:
+            journals: Journal dicts with id, name and description
+            language: Target language code
+
+        Returns:
+            The journals that had no up-to-date translation
+        """
+        stored = self._snapshot.get(language, {})
+        misses = []
+
+        for journal in journals:
+            cached = stored.get(str(journal.get("id")))
+            if cached is None or cached["source_hash"] != source_hash(journal):
+                misses.append(journal)
+                continue
+            for field in TRANSLATABLE_FIELDS:
+                if cached.get(field) is not None:
+                    journal[field] = cached[field]
+
+        metrics.increment("journal_translation_hits", len(journals) - len(misses), language=language)
+        metrics.increment("journal_translation_misses", len(misses), language=language)
+        return misses
+
+    async def translate_journals(self, journals: List[Dict[str, Any]], language: str) -> List[Dict[str, Any]]:
+        """
+        Translate journal names and descriptions for a response.
+
+        Precomputed translations are used where available; journals added
+        or edited since the last refresh are translated on the fly.
+        """
+        if not language or language == "en":
+            return journals
+
+        misses = self.apply(journals, language)
+        if misses:
+            await self.translation_service.translate_fields(
+                misses, JOURNAL_FIELDS, target_language=language
+            )
+        return journals
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                if not self._snapshot:
+                    await self.load()
+                written = await self.refresh()
+                if written:
+                    print(f"🌐 Pre-translated {written} journal entries")
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"⚠️  Journal pre-translation failed: {e}")
+
+            await asyncio.sleep(self.refresh_seconds)
+
+    def start(self) -> None:
+        """Start the periodic refresh job (no-op when disabled)."""
+        if self.refresh_seconds <= 0 or self._task is not None:
+            return
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Cancel the refresh job."""
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+
+# Global service instance
+journal_translations_service = JournalTranslationsService()
@@ -1,15 +1,17 @@
 """Journal recommendation service."""
-import httpx
 import numpy as np
 from typing import List, Dict, Any, Optional
 from ..core.config import settings
+from ..core.exceptions import UpstreamUnavailableError
+from ..core.http_clients import HTTPClientRegistry, http_clients as default_http_clients
 from ..core.supabase import supabase
 
 
 class JournalsService:
     """Service for recommending academic journals based on abstract."""
 
-    def __init__(self):
+    def __init__(self, http_clients: Optional[HTTPClientRegistry] = None):
+        self.http_clients = http_clients or default_http_clients
         self.hf_api_url = "https://api-inference.huggingface.co/models"
         # Use active model - paraphrase-MiniLM-L6-v2 is smaller, faster, and currently supported
         self.model = "sentence-transformers/paraphrase-MiniLM-L6-v2"
@@ -64,6 +66,8 @@ class JournalsService:
 
             return scored_journals[:10]  # Return top 10
 
+        except UpstreamUnavailableError:
+            raise
         except Exception as e:
             print(f"Error recommending journals: {e}")
             # Fallback to simple matching
@@ -110,27 +114,30 @@ class JournalsService:
             return []
 
         try:
-            async with httpx.AsyncClient(timeout=60.0) as client:
-                response = await client.post(
-                    f"{self.hf_api_url}/{self.model}",
-                    headers=self.hf_headers,
-                    json={"inputs": texts}
-                )
-
-                if response.status_code == 200:
-                    embeddings = response.json()
-                    # HF returns different formats, normalize to list of lists
-                    if isinstance(embeddings, list):
-                        if embeddings and isinstance(embeddings[0], list):
-                            return embeddings
-                        elif embeddings and isinstance(embeddings[0], (int, float)):
-                            # Single embedding returned as flat list
-                            return [embeddings]
-                    return []
-                else:
-                    print(f"Embeddings API error: {response.status_code}")
-                    return []
+            response = await self.http_clients.request(
+                "huggingface",
+                "POST",
+                f"{self.hf_api_url}/{self.model}",
+                headers=self.hf_headers,
+                json={"inputs": texts}
+            )
+
+            if response.status_code == 200:
+                embeddings = response.json()
+                # HF returns different formats, normalize to list of lists
+                if isinstance(embeddings, list):
+                    if embeddings and isinstance(embeddings[0], list):
+                        return embeddings
+                    elif embeddings and isinstance(embeddings[0], (int, float)):
+                        # Single embedding returned as flat list
+                        return [embeddings]
+                return []
+            else:
+                print(f"Embeddings API error: {response.status_code}")
+                return []
 
+        except UpstreamUnavailableError:
+            raise
         except Exception as e:
             print(f"Error generating embeddings: {e}")
             return []
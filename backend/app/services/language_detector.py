@@ -0,0 +1,256 @@
+"""
+Local language identification.
+
+Lets the translation service skip upstream round trips for text that is
+already in the target language (e.g. an English query typed while the UI
+is set to Hindi). Non-Latin scripts are identified by Unicode block; Latin
+script languages are told apart by a character trigram model built once
+from the embedded reference texts below. The detector is deliberately
+conservative: it returns None when the text is short or ambiguous, and
+callers then translate as usual.
+"""
+
+import math
+import re
+import unicodedata
+from collections import Counter
+from typing import Dict, Optional
+
+
+# Reference texts for the Latin-script languages the app supports
+REFERENCE_TEXTS = {
+    "en": (
+        "the results of this study show that the proposed method improves the accuracy of the model "
+        "we present a new approach for learning from data and evaluate it on several benchmarks "
+        "in this paper we analyze the effect of training on the performance of deep neural networks "
+        "our findings suggest that these models can be used to predict outcomes with high confidence "
+        "research question what is the impact of climate change on health and which factors matter most "
+        "machine learning computer vision natural language processing graph networks transformers "
+        "this is an open problem and there are many ways to address it with other techniques "
+        "however previous work has not considered how such systems behave when the data are noisy "
+        "we would like to thank the reviewers for their helpful comments about the analysis "
+        "we propose a novel framework that combines attention mechanisms with graph structure to improve "
+        "prediction quality experiments on standard datasets demonstrate significant improvements over "
+        "strong baselines and prior methods the main contribution of this work is a simple and efficient "
+        "algorithm that scales to large problems participants were recruited from hospitals and randomly "
+        "assigned to the treatment or control group future work should investigate whether these effects "
+        "hold in other populations and settings limitations include the small sample size and the lack of "
+        "external validation protein structure prediction drug discovery quantum computing error "
+        "correction crop yields climate policy leading journal in life sciences multidisciplinary science "
+        "journal for engineering and medicine reinforcement learning robotics security privacy economics "
+        "psychology education social media"
+    ),
+    "es": (
+        "los resultados de este estudio muestran que el método propuesto mejora la precisión del modelo "
+        "presentamos un nuevo enfoque para el aprendizaje a partir de datos y lo evaluamos en varios conjuntos "
+        "en este artículo analizamos el efecto del entrenamiento sobre el rendimiento de las redes neuronales "
+        "nuestros hallazgos sugieren que estos modelos pueden utilizarse para predecir resultados con alta confianza "
+        "pregunta de investigación cuál es el impacto del cambio climático en la salud y qué factores importan más "
+        "aprendizaje automático visión por computadora procesamiento del lenguaje natural redes de grafos "
+        "sin embargo los trabajos anteriores no han considerado cómo se comportan estos sistemas cuando los datos son ruidosos "
+        "proponemos un marco novedoso que combina mecanismos de atención con la estructura del grafo para "
+        "mejorar la calidad de la predicción los experimentos en conjuntos de datos estándar demuestran "
+        "mejoras significativas respecto a métodos anteriores la principal contribución de este trabajo "
+        "es un algoritmo sencillo y eficiente que escala a problemas grandes los participantes fueron "
+        "reclutados en hospitales y asignados aleatoriamente al grupo de tratamiento o de control el "
+        "trabajo futuro debería investigar si estos efectos se mantienen en otras poblaciones y contextos "
+        "las limitaciones incluyen el pequeño tamaño de la muestra y la falta de validación externa "
+        "predicción de la estructura de proteínas descubrimiento de fármacos computación cuántica "
+        "corrección de errores revista líder en ciencias de la vida revista científica multidisciplinaria "
+        "ingeniería y medicina"
+    ),
+    "fr": (
+        "les résultats de cette étude montrent que la méthode proposée améliore la précision du modèle "
+        "nous présentons une nouvelle approche pour l'apprentissage à partir des données et nous l'évaluons sur plusieurs jeux "
+        "dans cet article nous analysons l'effet de l'entraînement sur les performances des réseaux de neurones profonds "
+        "nos résultats suggèrent que ces modèles peuvent être utilisés pour prédire les issues avec une grande confiance "
+        "question de recherche quel est l'impact du changement climatique sur la santé et quels facteurs comptent le plus "
+        "apprentissage automatique vision par ordinateur traitement du langage naturel réseaux de graphes "
+        "cependant les travaux précédents n'ont pas examiné le comportement de ces systèmes lorsque les données sont bruitées "
+        "nous proposons un nouveau cadre qui combine les mécanismes d'attention avec la structure du "
+        "graphe pour améliorer la qualité des prédictions les expériences sur des jeux de données "
+        "standards montrent des améliorations significatives par rapport aux méthodes antérieures la "
+        "principale contribution de ce travail est un algorithme simple et efficace qui passe à l'échelle "
+        "sur de grands problèmes les participants ont été recrutés dans des hôpitaux et répartis au "
+        "hasard entre le groupe traité et le groupe témoin les travaux futurs devraient vérifier si ces "
+        "effets se maintiennent dans d'autres populations et contextes les limites comprennent la petite "
+        "taille de l'échantillon et l'absence de validation externe prédiction de la structure des "
+        "protéines découverte de médicaments informatique quantique correction d'erreurs revue de "
+        "référence en sciences de la vie revue scientifique pluridisciplinaire ingénierie et médecine"
+    ),
+    "de": (
+        "die ergebnisse dieser studie zeigen dass die vorgeschlagene methode die genauigkeit des modells verbessert "
+        "wir stellen einen neuen ansatz für das lernen aus daten vor und bewerten ihn auf mehreren datensätzen "
+        "in diesem artikel untersuchen wir die wirkung des trainings auf die leistung tiefer neuronaler netze "
+        "unsere ergebnisse deuten darauf hin dass diese modelle zur vorhersage von ergebnissen mit hoher sicherheit verwendet werden können "
+        "forschungsfrage welche auswirkungen hat der klimawandel auf die gesundheit und welche faktoren sind am wichtigsten "
+        "maschinelles lernen bildverarbeitung verarbeitung natürlicher sprache graphennetzwerke "
+        "frühere arbeiten haben jedoch nicht berücksichtigt wie sich solche systeme bei verrauschten daten verhalten "
+        "wir schlagen ein neues rahmenwerk vor das aufmerksamkeitsmechanismen mit der graphstruktur "
+        "kombiniert um die vorhersagequalität zu verbessern experimente auf standarddatensätzen zeigen "
+        "deutliche verbesserungen gegenüber früheren methoden der hauptbeitrag dieser arbeit ist ein "
+        "einfacher und effizienter algorithmus der auf große probleme skaliert die teilnehmer wurden in "
+        "krankenhäusern rekrutiert und zufällig der behandlungs oder kontrollgruppe zugewiesen künftige "
+        "arbeiten sollten untersuchen ob diese effekte auch in anderen populationen und umgebungen gelten "
+        "zu den einschränkungen gehören die kleine stichprobe und die fehlende externe validierung "
+        "vorhersage der proteinstruktur entdeckung von arzneimitteln quantencomputer fehlerkorrektur "
+        "führende zeitschrift für biowissenschaften multidisziplinäre wissenschaftliche zeitschrift "
+        "technik und medizin"
+    ),
+    "pt": (
+        "os resultados deste estudo mostram que o método proposto melhora a precisão do modelo "
+        "apresentamos uma nova abordagem para a aprendizagem a partir de dados e a avaliamos em vários conjuntos "
+        "neste artigo analisamos o efeito do treinamento sobre o desempenho das redes neurais profundas "
+        "nossos resultados sugerem que esses modelos podem ser usados para prever resultados com alta confiança "
+        "questão de pesquisa qual é o impacto das mudanças climáticas na saúde e quais fatores são mais importantes "
+        "aprendizado de máquina visão computacional processamento de linguagem natural redes de grafos "
+        "no entanto os trabalhos anteriores não consideraram como esses sistemas se comportam quando os dados são ruidosos "
+        "propomos uma nova estrutura que combina mecanismos de atenção com a estrutura do grafo para "
+        "melhorar a qualidade das previsões os experimentos em conjuntos de dados padrão demonstram "
+        "melhorias significativas em relação aos métodos anteriores a principal contribuição deste "
+        "trabalho é um algoritmo simples e eficiente que escala para problemas grandes os participantes "
+        "foram recrutados em hospitais e distribuídos aleatoriamente entre os grupos de tratamento e de "
+        "controle trabalhos futuros devem investigar se esses efeitos se mantêm em outras populações e "
+        "contextos as limitações incluem o pequeno tamanho da amostra e a falta de validação externa "
+        "previsão da estrutura de proteínas descoberta de medicamentos computação quântica correção de "
+        "erros revista líder em ciências da vida revista científica multidisciplinar engenharia e "
+        "medicina"
+    ),
+}
+
+# Unicode script (first word of the character name) -> language code.
+# Devanagari is shared by Hindi and Marathi, so it is left undecided;
+# Han characters mixed with kana are Japanese.
+SCRIPT_LANGUAGES = {
+    "BENGALI": "bn",
+    "TELUGU": "te",
+    "TAMIL": "ta",
+    "HANGUL": "ko",
+    "KANA": "ja",
+    "CJK": "zh",
+    "CYRILLIC": "ru",
+    "ARABIC": "ar",
+    "DEVANAGARI": None,
+    "LATIN": "latin",
+}
+
+WORD = re.compile(r"[^\W\d_]+")
+
+
+def _trigrams(text: str) -> Counter:
+    """Character trigrams of each word, padded with spaces at word boundaries."""
+    grams: Counter = Counter()
+    for word in WORD.findall(text.lower()):
+        padded = f" {word} "
+        for i in range(len(padded) - 2):
+            grams[padded[i:i + 3]] += 1
+    return grams
+
+
+class LanguageDetector:
+    """Script + character trigram language identifier."""
+
+    def __init__(
+        self,
+        min_letters: int = 12,
+        min_margin: float = 0.15,
+        max_chars: int = 400
+    ):
+        """
+        Args:
+            min_letters: Latin texts with fewer letters are left undecided
+            min_margin: Required lead (nats per trigram) of the best language
+                over the runner-up
+            max_chars: Only this prefix of a text is examined
+        """
+        self.min_letters = min_letters
+        self.min_margin = min_margin
+        self.max_chars = max_chars
+        self._profiles: Optional[Dict[str, Dict[str, float]]] = None
+        self._unseen: Dict[str, float] = {}
+
+    def _load(self) -> Dict[str, Dict[str, float]]:
+        """Build log-probability trigram profiles (once)."""
+        if self._profiles is None:
+            profiles = {}
+            vocabulary = set()
+            counts = {language: _trigrams(text) for language, text in REFERENCE_TEXTS.items()}
+            for grams in counts.values():
+                vocabulary.update(grams)
+
+            for language, grams in counts.items():
+                total = sum(grams.values()) + len(vocabulary)
+                profiles[language] = {gram: math.log((count + 1) / total) for gram, count in grams.items()}
+                self._unseen[language] = math.log(1 / total)
+            self._profiles = profiles
+
+        return self._profiles
+
+    def _script(self, text: str) -> Optional[str]:
+        """Dominant script of the text's letters, mapped to a language (or "latin")."""
+        scripts: Counter = Counter()
+        for char in text:
+            if char.isalpha():
+                name = unicodedata.name(char, "")
+                scripts[name.split(" ", 1)[0]] += 1
+
+        if not scripts:
+            return None
+
+        # Japanese mixes Han characters with kana
+        kana = scripts.pop("HIRAGANA", 0) + scripts.pop("KATAKANA", 0)
+        if kana:
+            scripts["KANA"] = kana + scripts.pop("CJK", 0)
+
+        script, count = scripts.most_common(1)[0]
+        if count < 0.8 * sum(scripts.values()):
+            return None  # Mixed scripts
+
+        return SCRIPT_LANGUAGES.get(script)
+
+    def detect(self, text: str) -> Optional[str]:
+        """
+        Identify the language of a text.
+
+        Returns:
+            Language code, or None when the text is too short or ambiguous
+        """
+        if not text:
+            return None
+
+        sample = text[:self.max_chars]
+        script = self._script(sample)
+        if script != "latin":
+            return script
+
+        grams = _trigrams(sample)
+        if sum(len(word) for word in WORD.findall(sample)) < self.min_letters:
+            return None
+
+        profiles = self._load()
+        n = sum(grams.values())
+        scores = sorted(
+            (
+                sum(count * profile.get(gram, self._unseen[language]) for gram, count in grams.items()) / n,
+                language
+            )
+            for language, profile in profiles.items()
+        )
+
+        (best_score, best), (runner_up_score, _) = scores[-1], scores[-2]
+        if best_score - runner_up_score < self.min_margin:
+            return None
+        return best
+
+    def is_language(self, text: str, language: str) -> bool:
+        """True only when the text is confidently identified as `language`."""
+        if not text:
+            return False
+        if language in REFERENCE_TEXTS:
+            return self.detect(text) == language
+        # Non-Latin targets only need the (cheap) script check
+        return self._script(text[:self.max_chars]) == language
+
+
+# Global detector instance (profiles are built on first use)
+language_detector = LanguageDetector()
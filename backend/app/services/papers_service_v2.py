@@ -4,15 +4,28 @@ Replaces legacy PyPDF2 + BART approach with faster, better quality analysis.
 """
 
 import io
-import copy
-from typing import Dict, Any, Optional, List
+import time
+import asyncio
+from typing import AsyncContextManager, AsyncIterator, Dict, Any, Optional, List, Tuple
 from datetime import datetime, timezone
 import json
 
 from ..core.config import settings
+from ..core.exceptions import UpstreamUnavailableError
+from ..core.http_clients import http_clients
+from ..core.metrics import metrics
+from ..core.rate_limiter import backoff_delay
 from ..core.supabase import supabase, supabase_admin
+from .analysis_jobs import AnalysisJobQueue, job_status
 from .gemini_service_v2 import enhanced_gemini_service
-from .translation_service import translation_service
+from .translatable_fields import PAPER_ANALYSIS_FIELDS, extract
+from .translation_overlay import apply_overlay, json_pointer
+from .translation_prefetch import TranslationPrefetcher
+from .translation_service import MARKER_OVERHEAD, translation_service
+
+
+# Analysis fields sent first when streaming a translation
+STREAM_HEADER_FIELDS = ["title", "tldr"]
 
 
 class EnhancedPapersService:
@@ -30,6 +43,12 @@ class EnhancedPapersService:
     def __init__(self):
         self.gemini = enhanced_gemini_service
 
+        # Runs paper analyses in the background (POST /process returns a job id)
+        self.jobs = AnalysisJobQueue(self._run_analysis_job, on_failure=self._mark_job_failed)
+
+        # Pre-translates processed papers in the background, at low priority
+        self.prefetcher = TranslationPrefetcher(self._prefetch_translation)
+
         # Language mapping for on-demand translations
         self.language_names = {
             "en": "English",
@@ -159,14 +178,13 @@ class EnhancedPapersService:
             key_findings = analysis.get("results", {}).get("key_findings", []) if isinstance(analysis.get("results"), dict) else []
 
             # Store in database with both new and legacy fields
-            # Translation cache starts empty - will fill on-demand when user requests
+            # Translations are filled on-demand (paper_translations) when user requests
             update_data = {
                 "processed": True,
                 "analysis": analysis,  # English analysis only
                 "original_language": "en",
                 "paper_type": paper_type,
                 "processed_at": datetime.now(timezone.utc).isoformat(),
-                "translation_cache": {},  # Empty - filled on-demand when user requests
                 # Metadata
                 "paper_title": paper_title,
                 "year": year,
@@ -184,6 +202,15 @@ class EnhancedPapersService:
 
             supabase_admin.table("uploads").update(update_data).eq("id", paper_id).execute()
 
+            # Translations of a previous analysis no longer apply
+            try:
+                supabase_admin.table("paper_translations").delete().eq("paper_id", paper_id).execute()
+            except Exception as e:
+                print(f"⚠️  Could not clear old translations for paper {paper_id}: {e}")
+
+            # Speculatively translate into the languages this paper is likely viewed in
+            self.prefetcher.schedule(paper_id)
+
             return {
                 "success": True,
                 "paper_id": paper_id,
@@ -193,6 +220,9 @@ class EnhancedPapersService:
                 "performance": "30-40 seconds (50% faster - no pre-translation!)"
             }
 
+        except UpstreamUnavailableError:
+            # Provider saturated or unhealthy - the paper can be processed again later
+            raise
         except Exception as e:
             # Mark as failed in database
             try:
@@ -209,11 +239,100 @@ class EnhancedPapersService:
 
             raise Exception(f"Paper processing failed: {str(e)}")
 
+    async def submit_processing(
+        self,
+        paper_id: str,
+        user_id: str,
+        paper_type: str = "research"
+    ) -> Dict[str, Any]:
+        """
+        Queue a paper for background analysis.
+
+        Args:
+            paper_id: Database ID of the paper
+            user_id: User ID (for authorization)
+            paper_type: Type of paper (research, ml, clinical, review)
+
+        Returns:
+            The analysis job (already queued or running jobs are reused)
+
+        Raises:
+            Exception: If the paper does not exist or belongs to another user
+        """
+        result = supabase_admin.table("uploads").select("id").eq("id", paper_id).eq("user_id", user_id).execute()
+        if not result.data:
+            raise Exception("Paper not found or access denied")
+
+        job = await self.jobs.submit(paper_id, user_id, paper_type)
+
+        # A new attempt clears the previous failure
+        try:
+            supabase_admin.table("uploads").update({"error_message": None}).eq("id", paper_id).execute()
+        except Exception as e:
+            print(f"⚠️  Could not clear error message for paper {paper_id}: {e}")
+
+        return job
+
+    async def get_job(self, job_id: str, user_id: str) -> Dict[str, Any]:
+        """
+        Get an analysis job.
+
+        Raises:
+            Exception: If the job does not exist or belongs to another user
+        """
+        job = await self.jobs.get(job_id)
+        if job is None or job["user_id"] != user_id:
+            raise Exception("Job not found or access denied")
+        return job
+
+    async def _run_analysis_job(self, job: Dict[str, Any]) -> None:
+        pdf_bytes = await self.get_paper_pdf(job["paper_id"], job["user_id"])
+        await self.process_paper(job["paper_id"], pdf_bytes, job["paper_type"])
+
+    def _mark_job_failed(self, job: Dict[str, Any]) -> None:
+        self._mark_failed(job["paper_id"], job["error"])
+
+    def _mark_failed(self, paper_id: str, error: str) -> None:
+        supabase_admin.table("uploads").update({
+            "processed": False,
+            "error_message": error,
+            "processed_at": datetime.now(timezone.utc).isoformat()
+        }).eq("id", paper_id).execute()
+
+    async def get_paper_record(self, paper_id: str, user_id: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Load a processed paper's English analysis and metadata.
+
+        Raises:
+            Exception: If the paper does not exist, belongs to another user
+                or has not been processed yet
+        """
+        # Only the English analysis and metadata, not the whole row
+        query = supabase_admin.table("uploads").select(
+            "id, processed, analysis, paper_title, year, authors, venue"
+        ).eq("id", paper_id)
+
+        if user_id:
+            query = query.eq("user_id", user_id)
+
+        result = query.execute()
+
+        if not result.data:
+            raise Exception("Paper not found or access denied")
+
+        paper = result.data[0]
+
+        if not paper.get("processed"):
+            raise Exception("Paper not yet processed")
+
+        return paper
+
     async def get_paper_analysis(
         self,
         paper_id: str,
         language: str = "en",
-        user_id: Optional[str] = None
+        user_id: Optional[str] = None,
+        slots: Optional[AsyncContextManager[Any]] = None
     ) -> Dict[str, Any]:
         """
         Get paper analysis in specified language.
@@ -224,27 +343,14 @@ class EnhancedPapersService:
             paper_id: Database ID of paper
             language: Target language code
             user_id: Optional user ID for authorization
+            slots: Held around each upstream translation request (see
+                TranslationService.translate_batch_with_failures)
 
         Returns:
             Paper analysis in requested language
         """
         try:
-            # Get paper from database
-            query = supabase_admin.table("uploads").select("*").eq("id", paper_id)
-
-            if user_id:
-                query = query.eq("user_id", user_id)
-
-            result = query.execute()
-
-            if not result.data:
-                raise Exception("Paper not found or access denied")
-
-            paper = result.data[0]
-
-            if not paper.get("processed"):
-                raise Exception("Paper not yet processed")
-
+            paper = await self.get_paper_record(paper_id, user_id)
             analysis = paper.get("analysis")
 
             # Extract metadata
@@ -268,8 +374,9 @@ class EnhancedPapersService:
                 }
 
             # Check translation cache (instant switching!)
-            cache = paper.get("translation_cache", {})
-            if language in cache:
+            cached = self._get_translation(paper_id, language)
+            if cached is not None:
+                cached = self._merge_translation(analysis, cached)
                 print(f"⚡ INSTANT return from cache: {self.language_names.get(language, language)} for paper: {paper_title}")
                 return {
                     "paper_id": paper_id,
@@ -277,7 +384,7 @@ class EnhancedPapersService:
                     "year": year,
                     "authors": authors,
                     "venue": venue,
-                    "analysis": cache[language],
+                    "analysis": cached,
                     "language": language,
                     "from_cache": True,
                     "instant": True
@@ -286,119 +393,35 @@ class EnhancedPapersService:
             # Translate on-demand using Google Translate (fastest!)
             print(f"🌍 Cache miss! Translating to {self.language_names.get(language, language)} using Google Translate...")
 
-            # Prepare texts to translate
-            texts_to_translate = []
-            text_keys = []
-
-            # Simple string fields
-            for key in ["title", "abstract", "tldr", "introduction", "research_question",
-                       "discussion", "conclusion"]:
-                if key in analysis and analysis[key]:
-                    texts_to_translate.append(str(analysis[key]))
-                    text_keys.append(key)
-
-            # Array fields (translate each item)
-            for key in ["contributions", "limitations", "practical_takeaways", "future_work"]:
-                if key in analysis and isinstance(analysis[key], list):
-                    for idx, item in enumerate(analysis[key]):
-                        if item:
-                            texts_to_translate.append(str(item))
-                            text_keys.append(f"{key}[{idx}]")
-
-            # Glossary (translate definitions)
-            if "glossary" in analysis and isinstance(analysis["glossary"], dict):
-                for term, definition in analysis["glossary"].items():
-                    if definition:
-                        texts_to_translate.append(str(definition))
-                        text_keys.append(f"glossary.{term}")
-
-            # Nested methods fields
-            if "methods" in analysis and isinstance(analysis["methods"], dict):
-                for method_key in ["overview", "study_design", "data_sources", "sample_size"]:
-                    if method_key in analysis["methods"] and analysis["methods"][method_key]:
-                        texts_to_translate.append(str(analysis["methods"][method_key]))
-                        text_keys.append(f"methods.{method_key}")
-
-            # Nested results fields
-            if "results" in analysis and isinstance(analysis["results"], dict):
-                if "summary" in analysis["results"] and analysis["results"]["summary"]:
-                    texts_to_translate.append(str(analysis["results"]["summary"]))
-                    text_keys.append("results.summary")
-
-                # Translate key_findings array
-                if "key_findings" in analysis["results"] and isinstance(analysis["results"]["key_findings"], list):
-                    for idx, item in enumerate(analysis["results"]["key_findings"]):
-                        if item:
-                            texts_to_translate.append(str(item))
-                            text_keys.append(f"results.key_findings[{idx}]")
-
-                # Translate quantitative_results array
-                if "quantitative_results" in analysis["results"] and isinstance(analysis["results"]["quantitative_results"], list):
-                    for idx, item in enumerate(analysis["results"]["quantitative_results"]):
-                        if item:
-                            texts_to_translate.append(str(item))
-                            text_keys.append(f"results.quantitative_results[{idx}]")
+            # Collect every translatable leaf of the analysis in one traversal
+            leaves = extract(analysis, PAPER_ANALYSIS_FIELDS)
+            texts_to_translate = [text for _, text in leaves]
 
             # Translate using Google Translate
             print(f"📝 Translating {len(texts_to_translate)} text segments...")
-            translated_texts = await translation_service.translate_batch(
+            translated_texts, failed = await translation_service.translate_batch_with_failures(
                 texts_to_translate,
                 target_language=language,
-                source_language="en"
+                source_language="en",
+                slots=slots
             )
 
-            # Build translated analysis object (deep copy to avoid mutations)
-            translated = copy.deepcopy(analysis)
-
-            for i, key in enumerate(text_keys):
-                if "[" in key:  # Array item
-                    # Parse "key_findings[0]" or "results.key_findings[0]"
-                    if "." in key:
-                        parts = key.split(".")
-                        field_name = parts[0]
-                        array_part = parts[1]
-                        array_name = array_part.split("[")[0]
-                        idx = int(array_part.split("[")[1].rstrip("]"))
-                        if field_name not in translated:
-                            translated[field_name] = {}
-                        if array_name not in translated[field_name]:
-                            translated[field_name][array_name] = []
-                        # Ensure array is long enough
-                        while len(translated[field_name][array_name]) <= idx:
-                            translated[field_name][array_name].append(None)
-                        translated[field_name][array_name][idx] = translated_texts[i]
-                    else:
-                        array_name = key.split("[")[0]
-                        idx = int(key.split("[")[1].rstrip("]"))
-                        if array_name not in translated:
-                            translated[array_name] = []
-                        # Ensure array is long enough
-                        while len(translated[array_name]) <= idx:
-                            translated[array_name].append(None)
-                        translated[array_name][idx] = translated_texts[i]
-                elif "." in key:  # Nested field (including glossary)
-                    parts = key.split(".")
-                    if parts[0] == "glossary":
-                        # Glossary term: key is "glossary.term_name"
-                        term_name = parts[1]
-                        if "glossary" not in translated:
-                            translated["glossary"] = {}
-                        translated["glossary"][term_name] = translated_texts[i]
-                    else:
-                        # Other nested fields
-                        if parts[0] not in translated:
-                            translated[parts[0]] = {}
-                        translated[parts[0]][parts[1]] = translated_texts[i]
-                else:  # Simple field
-                    translated[key] = translated_texts[i]
-
-            # Cache the translation for next time
-            cache[language] = translated
-            supabase_admin.table("uploads").update({
-                "translation_cache": cache
-            }).eq("id", paper_id).execute()
-
-            print(f"✅ Translation complete! Cached for next time.")
+            # Sparse overlay: only the strings that actually changed
+            overlay = {
+                json_pointer(list(path)): text
+                for (path, original), text in zip(leaves, translated_texts)
+                if text and text != original
+            }
+            translated = apply_overlay(analysis, overlay)
+
+            # Cache the translation for next time; a partial one (some segments
+            # left in English) is not stored, so the next request retries them
+            if failed:
+                metrics.increment("paper_translation_incomplete", language=language)
+                print(f"⚠️  {len(failed)} segments could not be translated; not caching")
+            else:
+                self._save_translation(paper_id, language, overlay)
+                print(f"✅ Translation complete! Cached for next time.")
 
             return {
                 "paper_id": paper_id,
@@ -409,12 +432,163 @@ class EnhancedPapersService:
                 "analysis": translated,
                 "language": language,
                 "from_cache": False,
+                "complete": not failed,
                 "translation_time": "~1-2 seconds (Google Translate)"
             }
 
+        except UpstreamUnavailableError:
+            raise
         except Exception as e:
             raise Exception(f"Failed to get paper analysis: {str(e)}")
 
+    async def stream_paper_analysis(
+        self,
+        paper: Dict[str, Any],
+        language: str
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Stream a paper analysis section by section while it is translated.
+
+        Yields a "header" event with the metadata and translated header
+        fields (title, tldr) first, then one "section" event per top-level
+        analysis field as soon as its translation completes (untranslatable
+        sections immediately, translated ones in completion order), and a
+        final "done" event once the assembled translation is cached. If some
+        segments could not be translated, nothing is cached and "done"
+        carries complete=False.
+
+        Args:
+            paper: Record from get_paper_record
+            language: Target language code
+
+        Yields:
+            {"type": "header" | "section" | "done", ...} events
+        """
+        paper_id = str(paper["id"])
+        analysis = paper.get("analysis") or {}
+        metadata = {
+            "paper_id": paper_id,
+            "paper_title": paper.get("paper_title"),
+            "year": paper.get("year"),
+            "authors": paper.get("authors"),
+            "venue": paper.get("venue"),
+            "language": language,
+        }
+        header_keys = [key for key in STREAM_HEADER_FIELDS if key in analysis]
+
+        translated = None
+        if language == "en":
+            translated = analysis
+        else:
+            cached = self._get_translation(paper_id, language)
+            if cached is not None:
+                translated = self._merge_translation(analysis, cached)
+
+        if translated is not None:
+            yield {"type": "header", **metadata, "analysis": {key: translated[key] for key in header_keys}}
+            for key, value in translated.items():
+                if key not in header_keys:
+                    yield {"type": "section", "section": key, "content": value}
+            yield {"type": "done", "language": language, "from_cache": True, "complete": True}
+            return
+
+        # Group translatable leaves by top-level section
+        sections: Dict[str, list] = {}
+        for path, text in extract(analysis, PAPER_ANALYSIS_FIELDS):
+            sections.setdefault(path[0], []).append((path, text))
+
+        overlay: Dict[str, str] = {}
+        failed_segments = 0
+
+        async def translate_section(keys: List[str]) -> Tuple[List[str], Dict[str, Any]]:
+            nonlocal failed_segments
+            leaves = [leaf for key in keys for leaf in sections.get(key, [])]
+            texts, failed = await translation_service.translate_batch_with_failures(
+                [text for _, text in leaves], target_language=language, source_language="en"
+            )
+            failed_segments += len(failed)
+            part = {
+                json_pointer(list(path)): text
+                for (path, original), text in zip(leaves, texts)
+                if text and text != original
+            }
+            overlay.update(part)
+            return keys, apply_overlay({key: analysis[key] for key in keys}, part)
+
+        _, header = await translate_section(header_keys)
+        yield {"type": "header", **metadata, "analysis": header}
+
+        for key, value in analysis.items():
+            if key not in header_keys and key not in sections:
+                yield {"type": "section", "section": key, "content": value}
+
+        # Small sections share a request: group them up to one translation chunk,
+        # so streaming costs about as many upstream calls as a full translation
+        groups: List[List[str]] = []
+        group_chars = 0
+        for key in analysis:
+            if key in header_keys or key not in sections:
+                continue
+            chars = sum(len(text) + MARKER_OVERHEAD for _, text in sections[key])
+            if groups and group_chars + chars <= translation_service.chunk_chars:
+                groups[-1].append(key)
+                group_chars += chars
+            else:
+                groups.append([key])
+                group_chars = chars
+
+        tasks = [asyncio.ensure_future(translate_section(keys)) for keys in groups]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                keys, content = await next_done
+                for key in keys:
+                    yield {"type": "section", "section": key, "content": content[key]}
+        finally:
+            # Client went away mid-stream: stop translating the rest
+            for task in tasks:
+                task.cancel()
+
+        # Cache the assembled translation for next time, unless some of it is still English
+        if failed_segments:
+            metrics.increment("paper_translation_incomplete", language=language)
+            print(f"⚠️  {failed_segments} segments could not be translated; not caching")
+        else:
+            self._save_translation(paper_id, language, overlay)
+        yield {"type": "done", "language": language, "from_cache": False, "complete": not failed_segments}
+
+    async def _prefetch_translation(self, paper_id: str, language: str) -> None:
+        """Translate and cache a paper's analysis ahead of the first request."""
+        result = await self.get_paper_analysis(paper_id, language, slots=self.prefetcher.slot)
+        if not result.get("complete", True):
+            raise Exception("some segments could not be translated; nothing was cached")
+
+    def _merge_translation(self, analysis: Dict[str, Any], cached: Dict[str, Any]) -> Dict[str, Any]:
+        """Merge a stored overlay over the English analysis (legacy rows hold a full copy)."""
+        if cached.get("overlay") is not None:
+            return apply_overlay(analysis, cached["overlay"])
+        return cached["analysis"]
+
+    def _get_translation(self, paper_id: str, language: str) -> Optional[Dict[str, Any]]:
+        """Fetch the cached translation of a paper for one language, if any."""
+        result = supabase_admin.table("paper_translations").select(
+            "overlay, analysis"
+        ).eq("paper_id", paper_id).eq("language", language).limit(1).execute()
+
+        return result.data[0] if result.data else None
+
+    def _save_translation(self, paper_id: str, language: str, overlay: Dict[str, str]) -> None:
+        """
+        Cache a translation overlay as its own (paper_id, language) row.
+
+        Concurrent first-time requests for other languages write other rows;
+        for the same language the first stored translation wins.
+        """
+        supabase_admin.table("paper_translations").upsert(
+            {"paper_id": paper_id, "language": language, "overlay": overlay},
+            on_conflict="paper_id,language",
+            ignore_duplicates=True
+        ).execute()
+
     async def list_user_papers(
         self,
         user_id: str,
@@ -430,7 +604,8 @@ class EnhancedPapersService:
             offset: Pagination offset
 
         Returns:
-            List of paper metadata
+            List of paper metadata; papers not yet analyzed carry their
+            latest analysis job (or None) under "job"
         """
         try:
             result = supabase_admin.table("uploads").select(
@@ -444,7 +619,16 @@ class EnhancedPapersService:
                 offset, offset + limit - 1
             ).execute()
 
-            return result.data
+            papers = result.data
+            pending = [str(paper["id"]) for paper in papers if not paper.get("processed")]
+            if pending:
+                jobs = await self.jobs.latest(pending)
+                for paper in papers:
+                    if not paper.get("processed"):
+                        job = jobs.get(str(paper["id"]))
+                        paper["job"] = job_status(job) if job else None
+
+            return papers
 
         except Exception as e:
             raise Exception(f"Failed to list papers: {str(e)}")
@@ -498,6 +682,9 @@ class EnhancedPapersService:
         """
         Get the original PDF file.
 
+        The Supabase download is blocking, so it runs in a worker thread and
+        other requests (and analyses in a batch) keep going meanwhile.
+
         Args:
             paper_id: Paper ID
             user_id: User ID (for authorization)
@@ -506,65 +693,157 @@ class EnhancedPapersService:
             PDF bytes
         """
         try:
-            # Get paper file path
-            result = supabase_admin.table("uploads").select(
-                "file_path"
-            ).eq("id", paper_id).eq("user_id", user_id).execute()
+            return await asyncio.to_thread(self._download_pdf, paper_id, user_id)
 
-            if not result.data:
-                raise Exception("Paper not found or access denied")
+        except Exception as e:
+            raise Exception(f"Failed to get PDF: {str(e)}")
 
-            file_path = result.data[0]["file_path"]
+    def _download_pdf(self, paper_id: str, user_id: str) -> bytes:
+        # Get paper file path
+        result = supabase_admin.table("uploads").select(
+            "file_path"
+        ).eq("id", paper_id).eq("user_id", user_id).execute()
+
+        if not result.data:
+            raise Exception("Paper not found or access denied")
+
+        file_path = result.data[0]["file_path"]
+
+        # Download from storage
+        return supabase_admin.storage.from_("papers").download(file_path)
+
+    def batch_concurrency(self) -> int:
+        """
+        Papers analyzed at once in a batch: BATCH_PROCESS_CONCURRENCY, capped by
+        the OpenRouter bulkhead slots that analysis job workers leave free.
+        """
+        budget = max(1, http_clients.bulkhead("openrouter").max_concurrent - settings.ANALYSIS_WORKERS)
+        return max(1, min(settings.BATCH_PROCESS_CONCURRENCY or budget, budget))
+
+    async def _process_one(
+        self,
+        paper_id: str,
+        user_id: str,
+        paper_type: str,
+        slots: asyncio.Semaphore,
+        analysis_slots: asyncio.Semaphore
+    ) -> Dict[str, Any]:
+        """
+        Download and analyze one paper of a batch; failures become a result, never an exception.
 
-            # Download from storage
-            response = supabase_admin.storage.from_("papers").download(file_path)
+        The OpenRouter bulkhead is shared with analysis jobs and other batches,
+        so a saturated provider (UpstreamUnavailableError) is retried with
+        backoff for up to BATCH_PAPER_TIMEOUT, long enough for a running
+        analysis to free its slot. Every failure ends up on the paper's
+        error_message (process_paper records its own).
+        """
+        recorded = False
+        try:
+            async with slots:
+                pdf_bytes = await asyncio.wait_for(
+                    self.get_paper_pdf(paper_id, user_id), timeout=settings.BATCH_PAPER_TIMEOUT
+                )
+                retry_until = time.monotonic() + settings.BATCH_PAPER_TIMEOUT
+                attempt = 0
+                while True:
+                    try:
+                        async with analysis_slots:
+                            return await asyncio.wait_for(
+                                self.process_paper(paper_id, pdf_bytes, paper_type),
+                                timeout=settings.BATCH_PAPER_TIMEOUT
+                            )
+                    except UpstreamUnavailableError as e:
+                        remaining = retry_until - time.monotonic()
+                        if remaining <= 0:
+                            raise
+                        delay = min(backoff_delay(attempt, 5.0, 30.0), remaining)
+                        attempt += 1
+                        metrics.increment("batch_upstream_retries")
+                        print(f"⏳ Paper {paper_id}: {e}, retrying in {delay:.1f}s")
+                        await asyncio.sleep(delay)
+                    except asyncio.TimeoutError:
+                        raise
+                    except Exception:
+                        recorded = True
+                        raise
+
+        except asyncio.TimeoutError:
+            error = f"Timed out after {settings.BATCH_PAPER_TIMEOUT:.0f} seconds"
+        except Exception as e:
+            error = str(e)
 
-            return response
+        if recorded:
+            return {"success": False, "paper_id": paper_id, "error": error}
 
+        try:
+            await asyncio.to_thread(self._mark_failed, paper_id, error)
         except Exception as e:
-            raise Exception(f"Failed to get PDF: {str(e)}")
+            print(f"⚠️  Could not record failure for paper {paper_id}: {e}")
+        return {"success": False, "paper_id": paper_id, "error": error}
 
-    async def batch_process_papers(
+    async def stream_batch_process(
         self,
         paper_ids: List[str],
         user_id: str,
         paper_type: str = "research"
-    ) -> List[Dict[str, Any]]:
+    ) -> AsyncIterator[Dict[str, Any]]:
         """
-        Process multiple papers in batch.
+        Process multiple papers concurrently, yielding each result as it completes.
+
+        Up to batch_concurrency() papers are analyzed at once, and as many
+        more are downloaded ahead so the next analysis can start as soon as
+        a slot frees up. Each paper has its own BATCH_PAPER_TIMEOUT; a
+        failure or timeout is reported for that paper and the rest carry on.
+        Closing the generator early cancels the papers still in progress.
 
         Args:
             paper_ids: List of paper IDs
             user_id: User ID (for authorization)
             paper_type: Type of papers
 
-        Returns:
-            List of processing results
+        Yields:
+            Per-paper results, in completion order
         """
-        results = []
+        concurrency = self.batch_concurrency()
+        analysis_slots = asyncio.Semaphore(concurrency)
+        slots = asyncio.Semaphore(2 * concurrency)  # Analyzing + downloaded ahead
 
-        for paper_id in paper_ids:
-            try:
-                # Get PDF
-                pdf_bytes = await self.get_paper_pdf(paper_id, user_id)
-
-                # Process
-                result = await self.process_paper(
-                    paper_id,
-                    pdf_bytes,
-                    paper_type
-                )
+        paper_ids = list(dict.fromkeys(paper_ids))
+        tasks = [
+            asyncio.create_task(self._process_one(paper_id, user_id, paper_type, slots, analysis_slots))
+            for paper_id in paper_ids
+        ]
 
-                results.append(result)
+        print(f"📚 Processing {len(paper_ids)} papers, {concurrency} at a time...")
+        try:
+            for next_result in asyncio.as_completed(tasks):
+                yield await next_result
+        finally:
+            for task in tasks:
+                task.cancel()
 
-            except Exception as e:
-                results.append({
-                    "success": False,
-                    "paper_id": paper_id,
-                    "error": str(e)
-                })
+    async def batch_process_papers(
+        self,
+        paper_ids: List[str],
+        user_id: str,
+        paper_type: str = "research"
+    ) -> List[Dict[str, Any]]:
+        """
+        Process multiple papers in batch (concurrently, see stream_batch_process).
+
+        Args:
+            paper_ids: List of paper IDs
+            user_id: User ID (for authorization)
+            paper_type: Type of papers
+
+        Returns:
+            List of processing results, in paper_ids order
+        """
+        results = {}
+        async for result in self.stream_batch_process(paper_ids, user_id, paper_type):
+            results[result["paper_id"]] = result
 
-        return results
+        return [results[paper_id] for paper_id in dict.fromkeys(paper_ids)]
 
 
 # Singleton instance
@@ -1,22 +1,28 @@
 """Plagiarism detection service using Winston AI and Sentence Transformers."""
-import httpx
+import asyncio
 import numpy as np
 import re
-from typing import List, Dict, Any, Tuple, Optional
+from typing import List, Dict, Any, Optional
 from datetime import datetime, timezone
 import time
 from ..core.config import settings
+from ..core.exceptions import UpstreamUnavailableError
+from ..core.http_clients import HTTPClientRegistry, http_clients as default_http_clients
 from .winston_service import winston_service
+from .citation_store import citation_store, work_from_crossref
 
 
 class PlagiarismService:
     """Service for detecting plagiarism using Winston AI and semantic similarity."""
 
-    def __init__(self):
+    def __init__(self, http_clients: Optional[HTTPClientRegistry] = None):
+        self.http_clients = http_clients or default_http_clients
         self.hf_api_url = "https://api-inference.huggingface.co/models"
         # Use active model - paraphrase-MiniLM-L6-v2 is smaller, faster, and currently supported
         self.model = "sentence-transformers/paraphrase-MiniLM-L6-v2"
         self.crossref_url = "https://api.crossref.org/works"
+        # Minimum embedding similarity for a citation to be suggested
+        self.citation_min_relevance = 0.3
 
         self.hf_headers = {}
         if settings.HF_API_KEY:
@@ -131,7 +137,10 @@ class PlagiarismService:
                                         "source_url": source.get("url")
                                     })
 
-            # Step 5: Calculate originality score
+            # Step 5: Get citation suggestions
+            citations = await self._get_citation_suggestions(text)
+
+            # Step 6: Calculate originality score
             if flagged_sections:
                 # Calculate average similarity of flagged sections
                 avg_similarity = sum(section["similarity"] for section in flagged_sections) / len(flagged_sections)
@@ -150,9 +159,6 @@ class PlagiarismService:
                 else:
                     originality_score = 100.0
 
-            # Step 6: Get citation suggestions
-            citations = await self._get_citation_suggestions(text)
-
             processing_time = time.time() - start_time
 
             return {
@@ -164,6 +170,8 @@ class PlagiarismService:
                 "provider": "legacy"
             }
 
+        except UpstreamUnavailableError:
+            raise
         except Exception as e:
             raise Exception(f"Plagiarism check failed: {str(e)}")
 
@@ -208,27 +216,30 @@ class PlagiarismService:
             return []
 
         try:
-            async with httpx.AsyncClient(timeout=60.0) as client:
-                response = await client.post(
-                    f"{self.hf_api_url}/{self.model}",
-                    headers=self.hf_headers,
-                    json={"inputs": texts}
-                )
-
-                if response.status_code == 200:
-                    embeddings = response.json()
-                    # HF returns different formats, normalize to list of lists
-                    if isinstance(embeddings, list):
-                        if embeddings and isinstance(embeddings[0], list):
-                            return embeddings
-                        elif embeddings and isinstance(embeddings[0], (int, float)):
-                            # Single embedding returned as flat list
-                            return [embeddings]
-                    return []
-                else:
-                    print(f"Embeddings API error: {response.status_code}")
-                    return []
+            response = await self.http_clients.request(
+                "huggingface",
+                "POST",
+                f"{self.hf_api_url}/{self.model}",
+                headers=self.hf_headers,
+                json={"inputs": texts}
+            )
+
+            if response.status_code == 200:
+                embeddings = response.json()
+                # HF returns different formats, normalize to list of lists
+                if isinstance(embeddings, list):
+                    if embeddings and isinstance(embeddings[0], list):
+                        return embeddings
+                    elif embeddings and isinstance(embeddings[0], (int, float)):
+                        # Single embedding returned as flat list
+                        return [embeddings]
+                return []
+            else:
+                print(f"Embeddings API error: {response.status_code}")
+                return []
 
+        except UpstreamUnavailableError:
+            raise
         except Exception as e:
             print(f"Error generating embeddings: {e}")
             return []
@@ -259,99 +270,207 @@ class PlagiarismService:
         Returns list of potentially plagiarized sources.
         """
         try:
-            async with httpx.AsyncClient(timeout=30.0) as client:
-                url = "https://api.semanticscholar.org/graph/v1/paper/search"
-                params = {
-                    "query": query,
-                    "limit": 10,
-                    "fields": "title,abstract,url,year,authors"
-                }
+            url = "https://api.semanticscholar.org/graph/v1/paper/search"
+            params = {
+                "query": query,
+                "limit": 10,
+                "fields": "title,abstract,url,year,authors"
+            }
 
-                headers = {}
-                if settings.SEMANTIC_SCHOLAR_API_KEY:
-                    headers["x-api-key"] = settings.SEMANTIC_SCHOLAR_API_KEY
+            headers = {}
+            if settings.SEMANTIC_SCHOLAR_API_KEY:
+                headers["x-api-key"] = settings.SEMANTIC_SCHOLAR_API_KEY
 
-                response = await client.get(url, params=params, headers=headers)
+            response = await self.http_clients.request(
+                "semantic_scholar", "GET", url, params=params, headers=headers, timeout=30.0, hedge=True
+            )
 
-                if response.status_code == 200:
-                    data = response.json()
-                    return data.get("data", [])
+            if response.status_code == 200:
+                data = response.json()
+                return data.get("data", [])
 
-                return []
+            return []
 
+        except UpstreamUnavailableError:
+            raise
         except Exception as e:
             print(f"Error searching similar content: {e}")
             return []
 
-    async def _get_citation_suggestions(self, text: str) -> List[Dict[str, Any]]:
+    async def _get_citation_suggestions(
+        self,
+        text: str,
+        limit: int = 10,
+        min_relevance: Optional[float] = None
+    ) -> List[Dict[str, Any]]:
         """
-        Get citation suggestions using CrossRef API.
-
-        Suggests relevant papers to cite based on content.
+        Get citation suggestions from the local citation store and CrossRef.
+
+        The local store is queried first for works matching every keyword;
+        CrossRef is only called when the store has fewer than `limit` of
+        them, and its results are added to the store. Works matching only
+        some keywords are used if CrossRef returns nothing. Candidates are
+        ranked by embedding similarity between the text and each
+        candidate's title/abstract, and only the top `limit` results
+        scoring at least `min_relevance` are returned.
         """
+        if min_relevance is None:
+            min_relevance = self.citation_min_relevance
+
         # Extract keywords from text
         keywords = self._extract_keywords(text)
 
         if not keywords:
             return []
 
+        rows = min(max(limit * 3, 20), 50)
+
         try:
-            async with httpx.AsyncClient(timeout=30.0) as client:
-                # Search CrossRef
-                params = {
-                    "query": " ".join(keywords[:5]),  # Use top 5 keywords
-                    "rows": 10,
-                    "sort": "relevance"
-                }
+            # Any-keyword matches are almost always plentiful once the store
+            # is populated, so only all-keyword matches can skip CrossRef
+            works = await asyncio.to_thread(citation_store.search, keywords[:5], rows, True)
+            for work in works:
+                work["source"] = "store"
 
-                # Add polite pool access if email configured
-                if settings.CROSSREF_EMAIL:
-                    params["mailto"] = settings.CROSSREF_EMAIL
+            if len(works) < limit:
+                online_works = await self._search_crossref(keywords, rows)
 
-                response = await client.get(self.crossref_url, params=params)
+                if online_works:
+                    await asyncio.to_thread(citation_store.add_works, online_works)
+                else:
+                    works = await asyncio.to_thread(citation_store.search, keywords[:5], rows)
+                    for work in works:
+                        work["source"] = "store"
 
-                if response.status_code != 200:
-                    return []
+                known_dois = {w["doi"] for w in works}
+                works.extend(
+                    {**w, "source": "crossref"} for w in online_works if w["doi"] not in known_dois
+                )
 
-                data = response.json()
-                citations = []
-
-                for item in data.get("message", {}).get("items", []):
-                    # Format author names
-                    authors = []
-                    for author in item.get("author", [])[:3]:  # First 3 authors
-                        given = author.get("given", "")
-                        family = author.get("family", "")
-                        if family:
-                            authors.append(f"{given} {family}".strip())
-
-                    # Get publication year
-                    year = None
-                    if "published" in item:
-                        date_parts = item["published"].get("date-parts", [[]])[0]
-                        if date_parts:
-                            year = date_parts[0]
-
-                    # Get journal name
-                    journal = None
-                    if "container-title" in item and item["container-title"]:
-                        journal = item["container-title"][0]
-
-                    citations.append({
-                        "doi": item.get("DOI", ""),
-                        "title": item.get("title", [""])[0] if isinstance(item.get("title"), list) else item.get("title", ""),
-                        "authors": ", ".join(authors) if authors else None,
-                        "year": year,
-                        "journal": journal,
-                        "relevance": 0.8  # Placeholder - would calculate based on text similarity
-                    })
-
-                return citations
+            candidates = [
+                {
+                    "citation": {
+                        "doi": work["doi"],
+                        "title": work["title"],
+                        "authors": work.get("authors"),
+                        "year": work.get("year"),
+                        "journal": work.get("journal"),
+                        "relevance": 0.0
+                    },
+                    "text": f"{work['title']}. {work.get('abstract') or ''}".strip(),
+                    "score": float(work.get("score") or 0),
+                    "source": work["source"]
+                }
+                for work in works
+            ]
+
+            return await self._rank_citations(text, candidates, limit, min_relevance)
 
         except Exception as e:
             print(f"Error getting citations: {e}")
             return []
 
+    async def _search_crossref(self, keywords: List[str], rows: int) -> List[Dict[str, Any]]:
+        """Search CrossRef and return normalized work records."""
+        try:
+            # Over-fetch so re-ranking has candidates to choose from
+            params = {
+                "query": " ".join(keywords[:5]),  # Use top 5 keywords
+                "rows": rows,
+                "sort": "relevance",
+                "select": "DOI,title,author,published,container-title,abstract,score"
+            }
+
+            # Add polite pool access if email configured
+            if settings.CROSSREF_EMAIL:
+                params["mailto"] = settings.CROSSREF_EMAIL
+
+            response = await self.http_clients.request("crossref", "GET", self.crossref_url, params=params)
+
+            if response.status_code != 200:
+                return []
+
+            data = response.json()
+
+        except Exception as e:
+            print(f"Error searching CrossRef: {e}")
+            return []
+
+        works = []
+        for item in data.get("message", {}).get("items", []):
+            work = work_from_crossref(item)
+            if work:
+                work["score"] = float(item.get("score", 0) or 0)
+                works.append(work)
+
+        return works
+
+    async def _rank_citations(
+        self,
+        text: str,
+        candidates: List[Dict[str, Any]],
+        limit: int,
+        min_relevance: float
+    ) -> List[Dict[str, Any]]:
+        """
+        Score citation candidates against the text and keep the best ones.
+
+        The text and all candidate texts are embedded in a single batched
+        request. If embeddings are unavailable, each source's own relevance
+        score (store BM25 or CrossRef score, normalized to 0-1 per source)
+        is used instead.
+        """
+        if not candidates:
+            return []
+
+        embeddings = await self._generate_embeddings(
+            [text[:2000]] + [c["text"] for c in candidates]
+        )
+
+        if len(embeddings) == len(candidates) + 1:
+            scores = self._similarity_matrix(embeddings[:1], embeddings[1:])[0]
+        else:
+            # Scores from different sources are on different scales
+            raw = np.array([c["score"] for c in candidates], dtype=float)
+            sources = np.array([c.get("source", "crossref") for c in candidates])
+            scores = np.zeros(len(candidates))
+            for source in set(sources):
+                mask = sources == source
+                top = raw[mask].max()
+                if top > 0:
+                    scores[mask] = raw[mask] / top
+
+        scores = np.clip(scores, 0.0, 1.0)
+
+        # Keep only the top-k above the cutoff, best first
+        order = np.argsort(-scores, kind="stable")[:limit]
+
+        citations = []
+        for idx in order:
+            if scores[idx] < min_relevance:
+                break
+            citation = candidates[idx]["citation"]
+            citation["relevance"] = round(float(scores[idx]), 4)
+            citations.append(citation)
+
+        return citations
+
+    def _similarity_matrix(
+        self,
+        queries: List[List[float]],
+        candidates: List[List[float]]
+    ) -> np.ndarray:
+        """Cosine similarity between every query and every candidate (rows x columns)."""
+        a = np.asarray(queries, dtype=float)
+        b = np.asarray(candidates, dtype=float)
+
+        a_norm = np.linalg.norm(a, axis=1, keepdims=True)
+        b_norm = np.linalg.norm(b, axis=1, keepdims=True)
+        a_norm[a_norm == 0] = 1.0
+        b_norm[b_norm == 0] = 1.0
+
+        return (a / a_norm) @ (b / b_norm).T
+
     def _extract_keywords(self, text: str, num_keywords: int = 10) -> List[str]:
         """
         Extract keywords from text.
@@ -7,19 +7,29 @@ Implements hybrid approaches for:
 3. Trending topics (S2 + arXiv with citation velocity)
 """
 
-import httpx
 import asyncio
 import numpy as np
-from typing import List, Dict, Any, Optional
+from contextlib import aclosing
+from typing import AsyncIterator, List, Dict, Any, Optional
 from datetime import datetime, timedelta, timezone
 import time
 from ..core.config import settings
+from ..core.exceptions import UpstreamUnavailableError
+from ..core.http_clients import HTTPClientRegistry, http_clients as default_http_clients
 
 
+# Plagiarism retrieval: candidate papers fetched at most, page size, and
+# flagged sections after which no further pages are fetched. A page that
+# flags nothing new also ends the search, so clean text costs one request.
+PLAGIARISM_MAX_CANDIDATES = 100
+PLAGIARISM_PAGE_SIZE = 20
+PLAGIARISM_MAX_FLAGGED = 10
+
 class SemanticScholarService:
     """Enhanced service using Semantic Scholar Academic Graph API."""
 
-    def __init__(self):
+    def __init__(self, http_clients: Optional[HTTPClientRegistry] = None):
+        self.http_clients = http_clients or default_http_clients
         self.base_url = "https://api.semanticscholar.org/graph/v1"
         self.headers = {}
 
@@ -35,23 +45,37 @@ class SemanticScholarService:
         else:
             self.hf_headers = {}
 
-    async def search_papers_bulk(
+    async def iter_papers_bulk(
         self,
         query: str,
-        limit: int = 100,
+        limit: Optional[int] = None,
         fields: Optional[List[str]] = None,
         year_filter: Optional[str] = None,
-        sort: str = "citationCount"
-    ) -> List[Dict[str, Any]]:
+        sort: str = "citationCount",
+        page_size: int = 100,
+        prefetch: bool = True
+    ) -> AsyncIterator[List[Dict[str, Any]]]:
         """
-        Use Academic Graph's paper bulk search with filters and sorting.
+        Stream Academic Graph bulk search results page by page.
+
+        The next page (identified by the continuation token) is requested
+        as soon as the current one arrives, so it downloads while the
+        consumer processes the current page. Stopping early cancels the
+        prefetch; use contextlib.aclosing() so that happens immediately.
+        Consumers that usually stop after the first page can turn the
+        prefetch off, so the next page is requested only when asked for.
 
         Args:
             query: Search query (supports advanced syntax)
-            limit: Max results to fetch
+            limit: Max papers to yield across all pages (None = all)
             fields: Fields to return
             year_filter: Year range (e.g., "2023-" for 2023 onwards)
             sort: Sort by citationCount, publicationDate, or paperId
+            page_size: Papers requested per page (max 100)
+            prefetch: Request the next page while the current one is processed
+
+        Yields:
+            Non-empty lists of papers, in result order
         """
         if not fields:
             fields = [
@@ -63,43 +87,93 @@ class SemanticScholarService:
         params = {
             "query": query,
             "fields": ",".join(fields),
-            "limit": min(limit, 100),  # Max 100 per request
+            "limit": min(limit or page_size, page_size, 100),  # Max 100 per request
             "sort": sort
         }
 
         if year_filter:
             params["year"] = year_filter
 
-        papers = []
+        url = f"{self.base_url}/paper/search/bulk"
+
+        async def fetch_page(token: Optional[str]) -> Optional[Dict[str, Any]]:
+            page_params = dict(params, token=token) if token else params
+            # Rate limiting and 429 backoff happen in the client layer
+            response = await self.http_clients.request(
+                "semantic_scholar", "GET", url, params=page_params, headers=self.headers
+            )
+
+            if response.status_code != 200:
+                print(f"S2 API error: {response.status_code}")
+                return None
+
+            return response.json()
+
+        pending: Optional[asyncio.Future] = asyncio.ensure_future(fetch_page(None))
+        yielded = 0
 
         try:
-            async with httpx.AsyncClient(timeout=60.0) as client:
-                url = f"{self.base_url}/paper/search/bulk"
+            while pending is not None:
+                data = await pending
+                pending = None
+
+                if not data:
+                    return
+
+                papers = data.get("data", [])
+                if limit is not None:
+                    papers = papers[:limit - yielded]
 
-                while len(papers) < limit:
-                    response = await client.get(url, params=params, headers=self.headers)
+                token = data.get("token")
+                if not (token and papers and (limit is None or yielded + len(papers) < limit)):
+                    token = None
 
-                    if response.status_code == 429:
-                        # Rate limit - wait and retry
-                        await asyncio.sleep(1)
-                        continue
+                # Prefetch the next page before handing this one over
+                if token and prefetch:
+                    pending = asyncio.ensure_future(fetch_page(token))
 
-                    if response.status_code != 200:
-                        print(f"S2 API error: {response.status_code}")
-                        break
+                if papers:
+                    yielded += len(papers)
+                    yield papers
 
-                    data = response.json()
-                    papers.extend(data.get("data", []))
+                if token and not prefetch:
+                    pending = asyncio.ensure_future(fetch_page(token))
+        finally:
+            if pending is not None and not pending.done():
+                pending.cancel()
 
-                    # Check for pagination token
-                    token = data.get("token")
-                    if not token or len(papers) >= limit:
-                        break
+    async def search_papers_bulk(
+        self,
+        query: str,
+        limit: int = 100,
+        fields: Optional[List[str]] = None,
+        year_filter: Optional[str] = None,
+        sort: str = "citationCount"
+    ) -> List[Dict[str, Any]]:
+        """
+        Use Academic Graph's paper bulk search with filters and sorting.
+
+        Collects iter_papers_bulk() into a list.
+
+        Args:
+            query: Search query (supports advanced syntax)
+            limit: Max results to fetch
+            fields: Fields to return
+            year_filter: Year range (e.g., "2023-" for 2023 onwards)
+            sort: Sort by citationCount, publicationDate, or paperId
+        """
+        papers = []
 
-                    params["token"] = token
+        try:
+            pages = self.iter_papers_bulk(query, limit, fields, year_filter, sort)
+            async with aclosing(pages):
+                async for page in pages:
+                    papers.extend(page)
 
-                return papers[:limit]
+            return papers
 
+        except UpstreamUnavailableError:
+            raise
         except Exception as e:
             print(f"Error searching Semantic Scholar: {e}")
             return []
@@ -119,32 +193,35 @@ class SemanticScholarService:
             limit: Max recommendations (up to 500)
         """
         try:
-            async with httpx.AsyncClient(timeout=60.0) as client:
-                url = "https://api.semanticscholar.org/recommendations/v1/papers"
-
-                data = {
-                    "positivePaperIds": positive_paper_ids,
-                    "negativePaperIds": negative_paper_ids or []
-                }
-
-                params = {
-                    "fields": "paperId,title,abstract,year,citationCount,authors,url",
-                    "limit": min(limit, 500)
-                }
-
-                response = await client.post(
-                    url,
-                    json=data,
-                    params=params,
-                    headers=self.headers
-                )
-
-                if response.status_code == 200:
-                    return response.json().get("recommendedPapers", [])
-
-                print(f"Recommendations API error: {response.status_code}")
-                return []
+            url = "https://api.semanticscholar.org/recommendations/v1/papers"
+
+            data = {
+                "positivePaperIds": positive_paper_ids,
+                "negativePaperIds": negative_paper_ids or []
+            }
+
+            params = {
+                "fields": "paperId,title,abstract,year,citationCount,authors,url",
+                "limit": min(limit, 500)
+            }
+
+            response = await self.http_clients.request(
+                "semantic_scholar",
+                "POST",
+                url,
+                json=data,
+                params=params,
+                headers=self.headers
+            )
+
+            if response.status_code == 200:
+                return response.json().get("recommendedPapers", [])
+
+            print(f"Recommendations API error: {response.status_code}")
+            return []
 
+        except UpstreamUnavailableError:
+            raise
         except Exception as e:
             print(f"Error getting recommendations: {e}")
             return []
@@ -173,21 +250,24 @@ class SemanticScholarService:
         query = field if field else "computer science"
 
         try:
-            async with httpx.AsyncClient(timeout=60.0) as client:
-                url = f"{self.base_url}/paper/search"
-                params = {
-                    "query": query,
-                    "limit": 100,
-                    "fields": "paperId,title,abstract,year,citationCount,publicationDate,url,authors"
-                }
-
-                response = await client.get(url, params=params, headers=self.headers)
-                if response.status_code == 200:
-                    data = response.json()
-                    papers = data.get("data", [])
-                else:
-                    print(f"S2 search error: {response.status_code}")
-                    papers = []
+            url = f"{self.base_url}/paper/search"
+            params = {
+                "query": query,
+                "limit": 100,
+                "fields": "paperId,title,abstract,year,citationCount,publicationDate,url,authors"
+            }
+
+            response = await self.http_clients.request(
+                "semantic_scholar", "GET", url, params=params, headers=self.headers, hedge=True
+            )
+            if response.status_code == 200:
+                data = response.json()
+                papers = data.get("data", [])
+            else:
+                print(f"S2 search error: {response.status_code}")
+                papers = []
+        except UpstreamUnavailableError:
+            raise
         except Exception as e:
             print(f"Error searching S2: {e}")
             papers = []
@@ -268,52 +348,39 @@ class SemanticScholarService:
         flagged_sections = []
         similar_sources = []
 
-        if check_online:
+        # Without chunk embeddings nothing can be compared, so skip the search
+        if check_online and chunk_embeddings:
             # Step 3: Search S2 for potentially similar papers
             keywords = self._extract_keywords(text)
             query = " ".join(keywords[:5])
 
-            papers = await self.search_papers_bulk(
+            # Step 4: Score each page against the chunks; only a page that flagged
+            # something new earns the next one, until enough sections are flagged
+            pages = self.iter_papers_bulk(
                 query=query,
-                limit=20,
-                fields=["paperId", "title", "abstract", "url", "year", "authors"]
+                limit=PLAGIARISM_MAX_CANDIDATES,
+                fields=["paperId", "title", "abstract", "url", "year", "authors"],
+                page_size=PLAGIARISM_PAGE_SIZE,
+                prefetch=False
             )
 
-            # Step 4: Generate embeddings for paper abstracts
-            abstracts = [p.get("abstract", "") for p in papers if p.get("abstract")]
-            if abstracts:
-                abstract_embeddings = await self._generate_embeddings(abstracts)
-
-                # Step 5: Compare chunk embeddings with paper embeddings
-                for i, chunk in enumerate(chunks):
-                    if not chunk_embeddings or i >= len(chunk_embeddings):
-                        continue
-
-                    chunk_emb = chunk_embeddings[i]
-
-                    for j, paper in enumerate(papers):
-                        if not abstract_embeddings or j >= len(abstract_embeddings):
-                            continue
-
-                        abstract_emb = abstract_embeddings[j]
-                        similarity = self._cosine_similarity(chunk_emb, abstract_emb)
-
-                        # Flag if similarity > 75%
-                        if similarity > 0.75:
-                            start_idx = text.find(chunk)
-
-                            flagged_sections.append({
-                                "text": chunk[:200],  # First 200 chars
-                                "start_index": start_idx if start_idx >= 0 else 0,
-                                "end_index": start_idx + len(chunk) if start_idx >= 0 else len(chunk),
-                                "similarity": round(similarity * 100, 2),
-                                "source": paper.get("title", "Unknown"),
-                                "source_url": paper.get("url"),
-                                "source_year": paper.get("year")
-                            })
-
-                            if paper not in similar_sources:
-                                similar_sources.append(paper)
+            try:
+                async with aclosing(pages):
+                    async for page in pages:
+                        abstracts = [p["abstract"] for p in page if p.get("abstract")]
+                        abstract_embeddings = await self._generate_embeddings(abstracts)
+                        flagged_before = len(flagged_sections)
+                        self._flag_similar_sections(
+                            text, chunks, chunk_embeddings, page, abstract_embeddings,
+                            flagged_sections, similar_sources
+                        )
+                        flagged = len(flagged_sections)
+                        if flagged == flagged_before or flagged >= PLAGIARISM_MAX_FLAGGED:
+                            break
+            except UpstreamUnavailableError:
+                raise
+            except Exception as e:
+                print(f"Error searching Semantic Scholar: {e}")
 
         # Calculate originality score
         if flagged_sections:
@@ -397,6 +464,47 @@ class SemanticScholarService:
 
     # Helper methods
 
+    def _flag_similar_sections(
+        self,
+        text: str,
+        chunks: List[str],
+        chunk_embeddings: List[List[float]],
+        papers: List[Dict[str, Any]],
+        abstract_embeddings: List[List[float]],
+        flagged_sections: List[Dict[str, Any]],
+        similar_sources: List[Dict[str, Any]]
+    ) -> None:
+        """Compare text chunks with one page of papers, adding matches above 75% similarity."""
+        papers_with_abstracts = [p for p in papers if p.get("abstract")]
+        if len(abstract_embeddings) != len(papers_with_abstracts):
+            return
+
+        for i, chunk in enumerate(chunks):
+            if not chunk_embeddings or i >= len(chunk_embeddings):
+                continue
+
+            chunk_emb = chunk_embeddings[i]
+
+            for paper, abstract_emb in zip(papers_with_abstracts, abstract_embeddings):
+                similarity = self._cosine_similarity(chunk_emb, abstract_emb)
+
+                # Flag if similarity > 75%
+                if similarity > 0.75:
+                    start_idx = text.find(chunk)
+
+                    flagged_sections.append({
+                        "text": chunk[:200],  # First 200 chars
+                        "start_index": start_idx if start_idx >= 0 else 0,
+                        "end_index": start_idx + len(chunk) if start_idx >= 0 else len(chunk),
+                        "similarity": round(similarity * 100, 2),
+                        "source": paper.get("title", "Unknown"),
+                        "source_url": paper.get("url"),
+                        "source_year": paper.get("year")
+                    })
+
+                    if paper not in similar_sources:
+                        similar_sources.append(paper)
+
     def _chunk_text(self, text: str, max_size: int = 500) -> List[str]:
         """Split text into chunks for comparison."""
         import re
@@ -427,24 +535,27 @@ class SemanticScholarService:
             return []
 
         try:
-            async with httpx.AsyncClient(timeout=60.0) as client:
-                response = await client.post(
-                    f"{self.hf_api_url}/{self.embedding_model}",
-                    headers=self.hf_headers,
-                    json={"inputs": texts}
-                )
-
-                if response.status_code == 200:
-                    embeddings = response.json()
-                    if isinstance(embeddings, list):
-                        if embeddings and isinstance(embeddings[0], list):
-                            return embeddings
-                        elif embeddings and isinstance(embeddings[0], (int, float)):
-                            return [embeddings]
-                    return []
-                else:
-                    return []
+            response = await self.http_clients.request(
+                "huggingface",
+                "POST",
+                f"{self.hf_api_url}/{self.embedding_model}",
+                headers=self.hf_headers,
+                json={"inputs": texts}
+            )
+
+            if response.status_code == 200:
+                embeddings = response.json()
+                if isinstance(embeddings, list):
+                    if embeddings and isinstance(embeddings[0], list):
+                        return embeddings
+                    elif embeddings and isinstance(embeddings[0], (int, float)):
+                        return [embeddings]
+                return []
+            else:
+                return []
 
+        except UpstreamUnavailableError:
+            raise
         except Exception as e:
             print(f"Embedding error: {e}")
             return []
@@ -1,15 +1,17 @@
 """Topic discovery service using Semantic Scholar and arXiv APIs."""
 import asyncio
 import math
-import httpx
 from typing import List, Optional, Dict, Any
 from ..core.config import settings
+from ..core.exceptions import UpstreamUnavailableError
+from ..core.http_clients import HTTPClientRegistry, http_clients as default_http_clients
 
 
 class TopicsService:
     """Service for discovering research topics."""
 
-    def __init__(self):
+    def __init__(self, http_clients: Optional[HTTPClientRegistry] = None):
+        self.http_clients = http_clients or default_http_clients
         self.semantic_scholar_base = "https://api.semanticscholar.org/graph/v1"
         self.arxiv_base = "https://export.arxiv.org/api"  # Changed to https
         self.headers = {
@@ -31,13 +33,16 @@ class TopicsService:
         Combines results from Semantic Scholar and arXiv.
         """
         # Search both APIs in parallel
-        async with httpx.AsyncClient(timeout=30.0, follow_redirects=True) as client:
-            tasks = [
-                self._search_semantic_scholar(client, query, limit),
-                self._search_arxiv(client, query, limit)
-            ]
+        tasks = [
+            self._search_semantic_scholar(query, limit),
+            self._search_arxiv(query, limit)
+        ]
 
-            results = await asyncio.gather(*tasks, return_exceptions=True)
+        results = await asyncio.gather(*tasks, return_exceptions=True)
+
+        # One provider down still leaves the other's topics; both rejected fails fast (503)
+        if all(isinstance(result, UpstreamUnavailableError) for result in results):
+            raise results[0]
 
         topics = []
 
@@ -67,7 +72,6 @@ class TopicsService:
 
     async def _search_semantic_scholar(
         self,
-        client: httpx.AsyncClient,
         query: str,
         limit: int
     ) -> Dict[str, Any]:
@@ -80,13 +84,14 @@ class TopicsService:
             "fields": "title,year,citationCount"
         }
 
-        response = await client.get(url, params=params, headers=self.headers)
+        response = await self.http_clients.request(
+            "semantic_scholar", "GET", url, params=params, headers=self.headers, timeout=30.0, hedge=True
+        )
         response.raise_for_status()
         return response.json()
 
     async def _search_arxiv(
         self,
-        client: httpx.AsyncClient,
         query: str,
         limit: int
     ) -> str:
@@ -100,7 +105,7 @@ class TopicsService:
             "sortOrder": "descending"
         }
 
-        response = await client.get(url, params=params)
+        response = await self.http_clients.request("arxiv", "GET", url, params=params, hedge=True)
         response.raise_for_status()
         return response.text
 
@@ -219,18 +224,19 @@ class TopicsService:
         current_year = datetime.now(timezone.utc).year
         start_year = current_year - years
 
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            url = f"{self.semantic_scholar_base}/paper/search"
-            params = {
-                "query": topic,
-                "year": f"{start_year}-{current_year}",
-                "limit": 100,
-                "fields": "year,citationCount"
-            }
-
-            response = await client.get(url, params=params, headers=self.headers)
-            response.raise_for_status()
-            data = response.json()
+        url = f"{self.semantic_scholar_base}/paper/search"
+        params = {
+            "query": topic,
+            "year": f"{start_year}-{current_year}",
+            "limit": 100,
+            "fields": "year,citationCount"
+        }
+
+        response = await self.http_clients.request(
+            "semantic_scholar", "GET", url, params=params, headers=self.headers, timeout=30.0, hedge=True
+        )
+        response.raise_for_status()
+        data = response.json()
 
         # Aggregate by year
         year_data = {}
@@ -0,0 +1,160 @@
+"""
+Schema-driven extraction of translatable fields.
+
+A field spec describes which leaves of a payload are translatable:
+
+- TEXT: a string leaf
+- {"key": spec, ...}: an object with named properties
+- {ANY_KEY: spec}: an object with arbitrary keys (e.g. a glossary)
+- [spec]: a list whose items follow spec
+
+Specs are compiled once from a JSON schema (PAPER_ANALYSIS_SCHEMA) or
+from field paths such as "sources[].title". extract() walks a payload in
+a single traversal and returns every translatable leaf as a path tuple,
+and write_back() stores the translations in one pass.
+"""
+
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
+
+from ..prompts.paper_analysis_prompt import PAPER_ANALYSIS_SCHEMA
+
+
+TEXT = "text"
+ANY_KEY = "*"
+ITEMS = "[]"
+
+Path = Tuple[Union[str, int], ...]
+Spec = Union[str, Dict[str, Any], List[Any]]
+
+
+def _path_tokens(path: str) -> List[str]:
+    """Split "sources[].title" into ["sources", "[]", "title"]."""
+    tokens = []
+    for part in path.split("."):
+        name = part.split("[", 1)[0]
+        if name:
+            tokens.append(name)
+        tokens.extend([ITEMS] * part.count("[]"))
+    return tokens
+
+
+def _freeze(tree: Dict[str, Any]) -> Spec:
+    if not tree:
+        return TEXT
+    if ITEMS in tree:
+        return [_freeze(tree[ITEMS])]
+    return {key: _freeze(child) for key, child in tree.items()}
+
+
+def paths_spec(paths: Iterable[str]) -> Spec:
+    """
+    Compile field paths into a spec.
+
+    Path segments are dict keys; a "[]" suffix iterates a list, e.g.
+    "sources[].title", "[].name" (list at the root) or "keywords[]".
+    """
+    tree: Dict[str, Any] = {}
+    for path in paths:
+        node = tree
+        for token in _path_tokens(path):
+            node = node.setdefault(token, {})
+    return _freeze(tree)
+
+
+def schema_spec(schema: Dict[str, Any], exclude: Iterable[str] = (), _path: str = "") -> Optional[Spec]:
+    """
+    Compile a JSON schema into a spec.
+
+    Every free-text string is translatable; enums, numbers, booleans and
+    the excluded paths (same syntax as paths_spec) are not. Objects
+    without declared properties are treated as {key: text} maps.
+
+    Returns:
+        The spec, or None if nothing under the schema is translatable
+    """
+    exclude = set(exclude)
+    if _path in exclude:
+        return None
+
+    kind = schema.get("type")
+    if kind == "string":
+        return None if "enum" in schema else TEXT
+
+    if kind == "array":
+        items = schema_spec(schema.get("items", {}), exclude, f"{_path}[]")
+        return [items] if items is not None else None
+
+    if kind == "object":
+        properties = schema.get("properties")
+        if properties is None:
+            return {ANY_KEY: TEXT}
+
+        spec = {}
+        for key, child in properties.items():
+            child_spec = schema_spec(child, exclude, f"{_path}.{key}" if _path else key)
+            if child_spec is not None:
+                spec[key] = child_spec
+        return spec or None
+
+    return None
+
+
+def extract(payload: Any, spec: Spec) -> List[Tuple[Path, str]]:
+    """
+    Collect the translatable leaves of a payload.
+
+    Missing keys and type mismatches are skipped, as are empty strings.
+
+    Returns:
+        [(path tuple, text)] in spec order
+    """
+    found: List[Tuple[Path, str]] = []
+
+    def walk(node: Any, spec: Spec, path: Path) -> None:
+        if isinstance(spec, str):
+            if isinstance(node, str) and node.strip():
+                found.append((path, node))
+        elif isinstance(spec, list):
+            if isinstance(node, list):
+                for index, item in enumerate(node):
+                    walk(item, spec[0], path + (index,))
+        elif isinstance(node, dict):
+            if ANY_KEY in spec:
+                for key, value in node.items():
+                    walk(value, spec[ANY_KEY], path + (key,))
+            else:
+                for key, child_spec in spec.items():
+                    if key in node:
+                        walk(node[key], child_spec, path + (key,))
+
+    walk(payload, spec, ())
+    return found
+
+
+def write_back(payload: Any, paths: Iterable[Path], values: Iterable[str]) -> Any:
+    """Store values at paths previously returned by extract() (in place)."""
+    for path, value in zip(paths, values):
+        node = payload
+        for key in path[:-1]:
+            node = node[key]
+        node[path[-1]] = value
+    return payload
+
+
+# Paper analysis: every free-text field except names and bibliographic data
+PAPER_ANALYSIS_FIELDS = schema_spec(
+    PAPER_ANALYSIS_SCHEMA,
+    exclude=["authors", "venue", "citation", "related_work[].citation", "reproducibility.license"]
+)
+
+JOURNAL_FIELDS = paths_spec(["[].name", "[].description"])
+
+TOPIC_FIELDS = paths_spec(["[].title", "[].description"])
+
+PLAGIARISM_FIELDS = paths_spec([
+    "sources[].title",
+    "sources[].snippet",
+    "flagged_sections[].text",
+    "flagged_sections[].source",
+    "flagged_sections[].snippet",
+])
@@ -0,0 +1,216 @@
+"""
+Segment-level translation memory.
+
+Stores translations keyed by (source language, target language, hash of
+the normalized segment) so strings that recur across requests and
+features (journal names, paper titles, glossary terms, source titles) are
+translated once. An in-process LRU sits in front of a SQLite store that
+persists across restarts and is shared by worker processes.
+"""
+
+import hashlib
+import sqlite3
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+from typing import Dict, Iterable, Optional
+
+from ..core.config import settings
+from ..core.sqlite import connect_sqlite, database_size_bytes
+
+
+SCHEMA = [
+    """CREATE TABLE IF NOT EXISTS translation_memory (
+        key TEXT PRIMARY KEY,
+        source_lang TEXT NOT NULL,
+        target_lang TEXT NOT NULL,
+        translation TEXT NOT NULL,
+        last_used REAL NOT NULL
+    )""",
+    "CREATE INDEX IF NOT EXISTS idx_translation_memory_last_used ON translation_memory(last_used)",
+]
+
+
+def normalize_segment(text: str) -> str:
+    """Canonical form of a segment: NFC, trimmed, whitespace runs collapsed."""
+    return " ".join(unicodedata.normalize("NFC", text).split())
+
+
+def segment_key(source_lang: str, target_lang: str, text: str) -> str:
+    """Memory key for a segment in a language pair."""
+    digest = hashlib.sha256(normalize_segment(text).encode("utf-8")).hexdigest()
+    return f"{source_lang}:{target_lang}:{digest}"
+
+
+class TranslationMemory:
+    """LRU + SQLite translation memory with bounded size."""
+
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        max_entries: Optional[int] = None,
+        max_mb: Optional[int] = None
+    ):
+        self.path = path if path is not None else settings.TRANSLATION_MEMORY_PATH
+        self.max_entries = max_entries if max_entries is not None else settings.TRANSLATION_MEMORY_MAX_ENTRIES
+        self.max_bytes = (max_mb if max_mb is not None else settings.TRANSLATION_MEMORY_MAX_MB) * 1024 * 1024
+
+        # Evict this fraction of rows (least recently used first) when over the limit
+        self.eviction_fraction = 0.1
+
+        self._lru: "OrderedDict[str, str]" = OrderedDict()
+        self.persistent = bool(self.path)
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+
+    def _connection(self) -> Optional[sqlite3.Connection]:
+        """Open the database and create the schema on first use."""
+        if self._conn is not None or not self.persistent:
+            return self._conn
+
+        try:
+            conn = connect_sqlite(self.path)
+            for statement in SCHEMA:
+                conn.execute(statement)
+            self._conn = conn
+        except sqlite3.Error as e:
+            print(f"⚠️  Persistent translation memory disabled: {e}")
+            self.persistent = False
+
+        return self._conn
+
+    def _remember(self, key: str, translation: str) -> None:
+        self._lru[key] = translation
+        self._lru.move_to_end(key)
+        while len(self._lru) > self.max_entries:
+            self._lru.popitem(last=False)
+
+    def get_many(self, source_lang: str, target_lang: str, texts: Iterable[str]) -> Dict[str, str]:
+        """
+        Look up segments.
+
+        Args:
+            source_lang: Source language code
+            target_lang: Target language code
+            texts: Segments to look up
+
+        Returns:
+            {segment: translation} for the segments found
+        """
+        keys = {}
+        for text in texts:
+            keys.setdefault(segment_key(source_lang, target_lang, text), []).append(text)
+
+        found: Dict[str, str] = {}
+        missing = []
+
+        with self._lock:
+            for key, originals in keys.items():
+                translation = self._lru.get(key)
+                if translation is None:
+                    missing.append(key)
+                    continue
+                self._lru.move_to_end(key)
+                for text in originals:
+                    found[text] = translation
+
+            conn = self._connection()
+            if conn is None or not missing:
+                return found
+
+            # SQLite limits the number of bound parameters per statement
+            rows = []
+            for start in range(0, len(missing), 500):
+                batch = missing[start:start + 500]
+                placeholders = ",".join("?" * len(batch))
+                rows.extend(conn.execute(
+                    f"SELECT key, translation FROM translation_memory WHERE key IN ({placeholders})",
+                    batch
+                ).fetchall())
+
+            if rows:
+                now = time.time()
+                conn.executemany(
+                    "UPDATE translation_memory SET last_used = ? WHERE key = ?",
+                    [(now, row["key"]) for row in rows]
+                )
+
+            for row in rows:
+                self._remember(row["key"], row["translation"])
+                for text in keys[row["key"]]:
+                    found[text] = row["translation"]
+
+        return found
+
+    def put_many(self, source_lang: str, target_lang: str, translations: Dict[str, str]) -> None:
+        """
+        Store translated segments.
+
+        Args:
+            source_lang: Source language code
+            target_lang: Target language code
+            translations: {segment: translation}
+        """
+        if not translations:
+            return
+
+        now = time.time()
+        rows = [
+            (segment_key(source_lang, target_lang, text), source_lang, target_lang, translation, now)
+            for text, translation in translations.items()
+        ]
+
+        with self._lock:
+            for key, _, _, translation, _ in rows:
+                self._remember(key, translation)
+
+            conn = self._connection()
+            if conn is None:
+                return
+
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                conn.executemany(
+                    """INSERT INTO translation_memory (key, source_lang, target_lang, translation, last_used)
+                       VALUES (?, ?, ?, ?, ?)
+                       ON CONFLICT(key) DO UPDATE SET
+                           translation = excluded.translation,
+                           last_used = excluded.last_used""",
+                    rows
+                )
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+
+            self._enforce_size_limit(conn)
+
+    def _enforce_size_limit(self, conn: sqlite3.Connection) -> None:
+        """Evict least recently used segments until the database fits in max_bytes."""
+        if self.max_bytes <= 0:
+            return
+
+        while database_size_bytes(conn) > self.max_bytes:
+            total = conn.execute("SELECT COUNT(*) FROM translation_memory").fetchone()[0]
+            if total == 0:
+                break
+
+            evict = max(1, int(total * self.eviction_fraction))
+            conn.execute(
+                """DELETE FROM translation_memory WHERE key IN (
+                       SELECT key FROM translation_memory ORDER BY last_used ASC LIMIT ?
+                   )""",
+                (evict,)
+            )
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+# Global translation memory instance
+translation_memory = TranslationMemory()
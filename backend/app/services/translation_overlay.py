@@ -0,0 +1,101 @@
+"""
+Sparse translation overlays.
+
+A translation of a nested document (e.g. a paper analysis) is stored as
+{JSON pointer: translated string} instead of a full copy per language.
+Numbers, lists of references and other structural fields are never
+duplicated. When serving, the overlay is merged over the English document
+by copying only the containers on the translated paths; untouched
+subtrees are shared with the original.
+"""
+
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+
+def _escape(part: Union[str, int]) -> str:
+    part = str(part)
+    if "~" in part or "/" in part:
+        part = part.replace("~", "~0").replace("/", "~1")
+    return part
+
+
+def _unescape(part: str) -> str:
+    if "~" in part:
+        part = part.replace("~1", "/").replace("~0", "~")
+    return part
+
+
+def json_pointer(parts: List[Union[str, int]]) -> str:
+    """Build an RFC 6901 JSON pointer from path parts."""
+    return "".join(["/" + _escape(part) for part in parts])
+
+
+def parse_pointer(pointer: str) -> List[str]:
+    """Split an RFC 6901 JSON pointer into (unescaped) path parts."""
+    if not pointer:
+        return []
+    return [_unescape(part) for part in pointer[1:].split("/")]
+
+
+def _child_key(container: Any, part: str) -> Union[str, int, None]:
+    """Resolve a pointer part to a key that exists in container, or None."""
+    if isinstance(container, dict):
+        return part if part in container else None
+    if isinstance(container, list) and part.isdigit() and int(part) < len(container):
+        return int(part)
+    return None
+
+
+def apply_overlay(base: Any, overlay: Dict[str, str]) -> Any:
+    """
+    Merge a translation overlay over a document without mutating it.
+
+    Only the dicts/lists on the path to a translated value are copied, and
+    each parent path is resolved once however many values it holds.
+    Pointers that no longer resolve in the document are ignored.
+
+    Args:
+        base: Original (English) document
+        overlay: {JSON pointer: translated string}
+
+    Returns:
+        The translated document (base itself when the overlay is empty)
+    """
+    if not overlay:
+        return base
+
+    root = base.copy()
+    # {parent pointer: (original container, copied container) or None if unresolvable}
+    resolved: Dict[str, Optional[Tuple[Any, Any]]] = {"": (base, root)}
+
+    def resolve(pointer: str) -> Optional[Tuple[Any, Any]]:
+        if pointer in resolved:
+            return resolved[pointer]
+
+        parent_pointer, _, part = pointer.rpartition("/")
+        parent = resolve(parent_pointer)
+        result = None
+        if parent is not None:
+            original, node = parent
+            key = _child_key(original, _unescape(part))
+            if key is not None and isinstance(original[key], (dict, list)):
+                clone = original[key].copy()
+                node[key] = clone
+                result = (original[key], clone)
+
+        resolved[pointer] = result
+        return result
+
+    for pointer, text in overlay.items():
+        parent_pointer, _, part = pointer.rpartition("/")
+        if not part:
+            continue
+        parent = resolve(parent_pointer)
+        if parent is None:
+            continue
+        original, node = parent
+        key = _child_key(original, _unescape(part))
+        if key is not None:
+            node[key] = text
+
+    return root
@@ -0,0 +1,173 @@
+"""
+Speculative translation prefetch.
+
+After a paper is processed, its analysis is pre-translated into the
+uploader's preferred languages and the institution-wide default languages
+(PREFETCH_TRANSLATION_LANGUAGES), so the first language switch on the
+paper page is served from the translation cache.
+
+Prefetching runs at low priority: a single background worker handles one
+(paper, language) at a time, and only starts the next one while no
+foreground paper analysis (openrouter) or translation (google_translate)
+is in flight. Within a paper, translation requests go out one at a time
+through the prefetcher's slot, each only once the foreground is idle, so
+a user request arriving mid-prefetch is not competing with a burst of
+prefetch chunks.
+"""
+
+import asyncio
+from typing import Any, Awaitable, Callable, List, Optional
+
+from ..core.config import settings
+from ..core.http_clients import HTTPClientRegistry, http_clients as default_http_clients
+from ..core.metrics import metrics
+from ..core.supabase import supabase_admin
+
+
+# Upstreams whose foreground traffic takes precedence over prefetching
+FOREGROUND_UPSTREAMS = ["openrouter", "openrouter_translate", "google_translate"]
+
+
+class PrefetchSlot:
+    """
+    Low-priority stand-in for the translation semaphore.
+
+    One request at a time, each started only while the foreground is idle.
+    """
+
+    def __init__(self, prefetcher: "TranslationPrefetcher"):
+        self.prefetcher = prefetcher
+        self._lock = asyncio.Lock()
+
+    async def __aenter__(self) -> None:
+        await self._lock.acquire()
+        try:
+            await self.prefetcher._wait_for_idle()
+        except BaseException:
+            self._lock.release()
+            raise
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        self._lock.release()
+
+
+class TranslationPrefetcher:
+    """Low-priority background queue that pre-translates processed papers."""
+
+    def __init__(
+        self,
+        translate: Callable[[str, str], Awaitable[Any]],
+        http_clients: Optional[HTTPClientRegistry] = None,
+        default_languages: Optional[List[str]] = None,
+        idle_poll_seconds: float = 1.0,
+        max_queued: int = 1000
+    ):
+        """
+        Args:
+            translate: Coroutine function (paper_id, language) that translates
+                a paper and stores the result in the translation cache; it
+                should make its upstream requests under `slot`, and raise if
+                the translation is incomplete
+            http_clients: Registry whose bulkheads signal foreground activity
+            default_languages: Languages prefetched for every paper
+                (default: PREFETCH_TRANSLATION_LANGUAGES)
+            idle_poll_seconds: How often to re-check for foreground work
+            max_queued: Papers waiting beyond this are dropped (best effort)
+        """
+        self.translate = translate
+        self.http_clients = http_clients or default_http_clients
+        self.default_languages = (
+            default_languages if default_languages is not None
+            else settings.prefetch_translation_languages
+        )
+        self.idle_poll_seconds = idle_poll_seconds
+        self.max_queued = max_queued
+        self.slot = PrefetchSlot(self)
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+
+    def _user_languages(self, paper_id: str) -> List[str]:
+        """Preferred languages of the paper's uploader (empty if unknown)."""
+        upload = supabase_admin.table("uploads").select("user_id").eq("id", paper_id).limit(1).execute()
+        if not upload.data:
+            return []
+
+        user = supabase_admin.table("users").select(
+            "preferred_languages"
+        ).eq("id", upload.data[0]["user_id"]).limit(1).execute()
+        if not user.data:
+            return []
+
+        return user.data[0].get("preferred_languages") or []
+
+    async def languages_for(self, paper_id: str) -> List[str]:
+        """Languages to prefetch for a paper: uploader's first, then defaults."""
+        try:
+            user_languages = await asyncio.to_thread(self._user_languages, paper_id)
+        except Exception as e:
+            # Unknown or demo users (non-UUID ids) have no profile
+            print(f"⚠️  Could not read preferred languages for paper {paper_id}: {e}")
+            user_languages = []
+
+        languages = [code for code in user_languages + self.default_languages if code and code != "en"]
+        return list(dict.fromkeys(languages))
+
+    def is_idle(self) -> bool:
+        """True when no foreground analysis or translation is running or queued."""
+        for name in FOREGROUND_UPSTREAMS:
+            bulkhead = self.http_clients.bulkheads.get(name)
+            if bulkhead is not None and (bulkhead.active or bulkhead.waiting):
+                return False
+        return True
+
+    async def _wait_for_idle(self) -> None:
+        while not self.is_idle():
+            metrics.increment("translation_prefetch_deferred")
+            await asyncio.sleep(self.idle_poll_seconds)
+
+    def schedule(self, paper_id: str) -> None:
+        """Queue a processed paper for prefetching (never blocks the caller)."""
+        if self._queue is None:
+            self._queue = asyncio.Queue(maxsize=self.max_queued)
+        if self._worker is None or self._worker.done():
+            self._worker = asyncio.create_task(self._run())
+
+        try:
+            self._queue.put_nowait(paper_id)
+        except asyncio.QueueFull:
+            metrics.increment("translation_prefetch_dropped")
+
+    async def _prefetch(self, paper_id: str) -> None:
+        for language in await self.languages_for(paper_id):
+            await self._wait_for_idle()
+            try:
+                await self.translate(paper_id, language)
+                metrics.increment("translation_prefetch_completed", language=language)
+            except Exception as e:
+                metrics.increment("translation_prefetch_failed", language=language)
+                print(f"⚠️  Prefetch of {language} translation failed for paper {paper_id}: {e}")
+
+    async def _run(self) -> None:
+        while True:
+            paper_id = await self._queue.get()
+            try:
+                await self._prefetch(paper_id)
+            finally:
+                self._queue.task_done()
+
+    async def join(self) -> None:
+        """Wait until every queued paper has been prefetched."""
+        if self._queue is not None:
+            await self._queue.join()
+
+    async def stop(self) -> None:
+        """Cancel the worker; queued prefetches are dropped."""
+        if self._worker is None:
+            return
+        self._worker.cancel()
+        try:
+            await self._worker
+        except asyncio.CancelledError:
+            pass
+        self._worker = None
+        self._queue = None
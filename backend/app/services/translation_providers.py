@@ -0,0 +1,270 @@
+"""
+Pluggable translation providers and a latency-aware router.
+
+A provider translates one request's worth of text (possibly several
+[[n]]-tagged segments of a batch). Two are built in: Google Translate
+(through deep-translator, in a thread pool) and Gemini (through
+OpenRouter).
+
+The router picks a provider per request. Each provider keeps a rolling
+window of recent calls (outcome, latency, characters), and the router
+ranks providers by expected time for the payload:
+
+    seconds per character (window, or a built-in prior) x payload size
+    / success rate, x (1 + queued calls / bulkhead slots)
+
+Providers whose circuit breaker is open, that are not configured, or
+whose request size limit the payload exceeds are skipped. If the chosen
+provider fails, the same request is retried on the next one, so a batch
+fails over chunk by chunk while the rest of it keeps going.
+"""
+
+import asyncio
+import time
+from abc import ABC, abstractmethod
+from collections import deque
+from concurrent.futures import Executor
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple
+
+from ..core.bulkhead import BulkheadFullError
+from ..core.circuit_breaker import OPEN, CircuitBreaker, CircuitOpenError
+from ..core.exceptions import UpstreamUnavailableError
+from ..core.http_clients import HTTPClientRegistry, http_clients as default_http_clients
+from ..core.metrics import metrics
+from .gemini_service_v2 import EnhancedGeminiService, enhanced_gemini_service
+
+
+class TranslationProvider(ABC):
+    """Interface for a translation backend."""
+
+    name = ""
+    upstream = ""  # Bulkhead (see http_clients.BULKHEADS) the provider's calls go through
+    max_chars = 5000  # Largest request the provider accepts
+    default_seconds_per_char = 0.001  # Prior latency until calls have been observed
+    slow_call_seconds = 15.0  # Calls slower than this count against the circuit breaker
+
+    @property
+    def configured(self) -> bool:
+        """Whether the provider can be called at all (e.g. has an API key)."""
+        return True
+
+    @abstractmethod
+    async def translate(self, source: str, target: str, text: str) -> Optional[str]:
+        """
+        Translate text (may contain [[n]] segment markers, which must be kept).
+
+        Returns:
+            Translated text, or None/empty if the provider returned nothing
+        """
+
+
+class GoogleTranslateProvider(TranslationProvider):
+    """Google Translate via deep-translator (blocking, run in a thread pool)."""
+
+    name = "google"
+    upstream = "google_translate"
+    max_chars = 5000
+    default_seconds_per_char = 0.0002
+    slow_call_seconds = 10.0
+
+    def __init__(
+        self,
+        translate: Callable[[str, str, str], Optional[str]],
+        executor: Callable[[], Executor],
+        http_clients: Optional[HTTPClientRegistry] = None
+    ):
+        """
+        Args:
+            translate: Blocking call (source, target, text) -> translation
+            executor: Returns the thread pool to run it in
+            http_clients: Registry whose bulkhead bounds concurrent calls
+        """
+        self._translate = translate
+        self._executor = executor
+        self.http_clients = http_clients or default_http_clients
+
+    async def translate(self, source: str, target: str, text: str) -> Optional[str]:
+        loop = asyncio.get_running_loop()
+        async with self.http_clients.bulkhead(self.upstream):
+            return await loop.run_in_executor(self._executor(), self._translate, source, target, text)
+
+
+class GeminiTranslationProvider(TranslationProvider):
+    """Gemini via OpenRouter (larger requests, slower, keeps markers reliably)."""
+
+    name = "gemini"
+    upstream = "openrouter_translate"
+    max_chars = 5000  # Keeps the reply within translate_text's max_tokens, even for Indic scripts
+    default_seconds_per_char = 0.001
+    slow_call_seconds = 15.0
+
+    def __init__(self, gemini_service: Optional[EnhancedGeminiService] = None):
+        self.gemini_service = gemini_service or enhanced_gemini_service
+
+    @property
+    def configured(self) -> bool:
+        return self.gemini_service.api_key_configured
+
+    async def translate(self, source: str, target: str, text: str) -> Optional[str]:
+        return await self.gemini_service.translate_text(text, target, source)
+
+
+class ProviderStats:
+    """Rolling window of recent calls (outcome, latency, size) for one provider."""
+
+    def __init__(self, window_size: int = 50, window_seconds: float = 300.0):
+        """
+        Args:
+            window_size: Most recent calls considered
+            window_seconds: Calls older than this are forgotten, so a provider
+                that was slow a while ago gets traffic (and a fresh estimate) again
+        """
+        self.window_seconds = window_seconds
+        self._calls: Deque[Tuple[float, bool, float, int]] = deque(maxlen=window_size)
+
+    def record(self, success: bool, seconds: float, chars: int) -> None:
+        self._calls.append((time.monotonic(), success, seconds, chars))
+
+    def _recent(self) -> List[Tuple[float, bool, float, int]]:
+        cutoff = time.monotonic() - self.window_seconds
+        return [call for call in self._calls if call[0] >= cutoff]
+
+    def error_rate(self) -> float:
+        recent = self._recent()
+        if not recent:
+            return 0.0
+        return sum(1 for _, ok, _, _ in recent if not ok) / len(recent)
+
+    def seconds_per_char(self) -> Optional[float]:
+        """Observed latency per character of successful calls (None without samples)."""
+        successes = [(seconds, chars) for _, ok, seconds, chars in self._recent() if ok]
+        if not successes:
+            return None
+        return sum(seconds for seconds, _ in successes) / max(1, sum(chars for _, chars in successes))
+
+    def snapshot(self) -> Dict[str, Any]:
+        recent = self._recent()
+        per_char = self.seconds_per_char()
+        return {
+            "recent_calls": len(recent),
+            "error_rate": round(self.error_rate(), 3),
+            "seconds_per_1k_chars": round(per_char * 1000, 3) if per_char is not None else None
+        }
+
+
+class TranslationProviderRouter:
+    """Routes each translation request to the provider expected to answer fastest."""
+
+    def __init__(
+        self,
+        providers: List[TranslationProvider],
+        http_clients: Optional[HTTPClientRegistry] = None
+    ):
+        """
+        Args:
+            providers: Candidate providers, in order of preference for ties
+            http_clients: Registry whose bulkheads show provider saturation
+        """
+        self.providers = providers
+        self.http_clients = http_clients or default_http_clients
+        self.stats: Dict[str, ProviderStats] = {provider.name: ProviderStats() for provider in providers}
+        self.breakers: Dict[str, CircuitBreaker] = {
+            provider.name: CircuitBreaker(
+                f"translation:{provider.name}", slow_call_seconds=provider.slow_call_seconds
+            )
+            for provider in providers
+        }
+
+    def expected_seconds(self, provider: TranslationProvider, chars: int) -> float:
+        """Expected time for a provider to translate chars characters, retries and queueing included."""
+        stats = self.stats[provider.name]
+        per_char = stats.seconds_per_char()
+        if per_char is None:
+            per_char = provider.default_seconds_per_char
+
+        success_rate = max(0.05, 1.0 - stats.error_rate())
+        expected = per_char * max(chars, 1) / success_rate
+
+        bulkhead = self.http_clients.bulkheads.get(provider.upstream)
+        if bulkhead is not None:
+            expected *= 1 + bulkhead.waiting / bulkhead.max_concurrent
+
+        return expected
+
+    def rank(self, chars: int) -> List[TranslationProvider]:
+        """Usable providers for a payload size, best first."""
+        candidates = [
+            (self.expected_seconds(provider, chars), index, provider)
+            for index, provider in enumerate(self.providers)
+            if provider.configured
+            and chars <= provider.max_chars
+            and self.breakers[provider.name].state != OPEN
+        ]
+        return [provider for _, _, provider in sorted(candidates, key=lambda c: (c[0], c[1]))]
+
+    async def translate(self, source: str, target: str, text: str) -> str:
+        """
+        Translate with the best provider, failing over to the others in turn.
+
+        Raises:
+            The last provider error if every provider failed, or
+            UpstreamUnavailableError if none could take the request
+        """
+        last_error: Optional[Exception] = None
+
+        for provider in self.rank(len(text)):
+            if last_error is not None:
+                metrics.increment("translation_provider_failovers", provider=provider.name)
+
+            breaker = self.breakers[provider.name]
+            try:
+                breaker.allow()
+            except CircuitOpenError as e:
+                last_error = e
+                continue
+
+            metrics.increment("translation_provider_requests", provider=provider.name)
+            started = time.monotonic()
+            try:
+                translated = await provider.translate(source, target, text)
+            except BulkheadFullError as e:
+                # Saturated, not broken: try another provider without penalizing this one
+                breaker.release()
+                last_error = e
+                continue
+            except Exception as e:
+                elapsed = time.monotonic() - started
+                breaker.record(False, elapsed)
+                self.stats[provider.name].record(False, elapsed, len(text))
+                metrics.increment("translation_provider_failures", provider=provider.name)
+                print(f"⚠️  {provider.name} translation failed: {str(e)}")
+                last_error = e
+                continue
+            except BaseException:
+                breaker.release()
+                raise
+
+            elapsed = time.monotonic() - started
+            success = bool(translated and translated.strip())
+            breaker.record(success, elapsed)
+            self.stats[provider.name].record(success, elapsed, len(text))
+            if success:
+                return translated
+
+            metrics.increment("translation_provider_failures", provider=provider.name)
+            last_error = Exception(f"{provider.name} returned an empty translation")
+
+        if last_error is not None:
+            raise last_error
+        raise UpstreamUnavailableError("translation", "No translation provider is available right now")
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """Breaker state and rolling window per provider, for /health."""
+        return {
+            provider.name: {
+                "configured": provider.configured,
+                "state": self.breakers[provider.name].state,
+                **self.stats[provider.name].snapshot()
+            }
+            for provider in self.providers
+        }
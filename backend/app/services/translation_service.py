@@ -1,14 +1,81 @@
-"""Translation service using Google Translate (via deep-translator)."""
+"""Translation service using Google Translate (via deep-translator) and Gemini, routed by latency."""
+import asyncio
+import re
 import httpx
-from typing import Dict, List, Optional, Any
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, AsyncContextManager, Dict, List, Optional, Tuple
 from app.core.config import settings
+from app.core.http_clients import HTTPClientRegistry, http_clients as default_http_clients
+from app.core.metrics import metrics
+from app.services.language_detector import LanguageDetector, language_detector as default_language_detector
+from app.services.translatable_fields import Path, Spec, extract, paths_spec, write_back
+from app.services.translation_memory import TranslationMemory, translation_memory as default_translation_memory
+from app.services.translation_providers import (
+    GeminiTranslationProvider,
+    GoogleTranslateProvider,
+    TranslationProviderRouter,
+)
 from deep_translator import GoogleTranslator
 
 
+# Numbered segment markers, e.g. "[[3]]". Matching tolerates the spacing,
+# full-width brackets and native digits Google sometimes produces.
+SEGMENT_MARKER = re.compile(r"[\[［]\s*[\[［]\s*(\d+)\s*[\]］]\s*[\]］]")
+MARKER_OVERHEAD = 10  # Characters a marker and separator add per segment
+
+
+def _join_segments(segments: List[str]) -> str:
+    """Combine segments into one request, each prefixed by its numbered marker."""
+    return "\n\n".join(f"[[{i}]] {text}" for i, text in enumerate(segments))
+
+
+def _split_segments(translated: str, count: int) -> Tuple[List[Optional[str]], List[Tuple[int, int]]]:
+    """
+    Split a translated request back into segments using its markers.
+
+    Returns:
+        Per-segment translations (None where not recoverable) and the
+        [start, end) index ranges whose markers were lost, merged or
+        reordered
+    """
+    parts: List[Optional[str]] = [None] * count
+    matches = list(SEGMENT_MARKER.finditer(translated))
+    indices = [int(match.group(1)) for match in matches]
+
+    if not matches or indices[-1] >= count or any(b <= a for a, b in zip(indices, indices[1:])):
+        return parts, [(0, count)]
+
+    bad = []
+    if indices[0] > 0:
+        bad.append((0, indices[0]))
+
+    for k, match in enumerate(matches):
+        index = indices[k]
+        next_index = indices[k + 1] if k + 1 < len(matches) else count
+        end = matches[k + 1].start() if k + 1 < len(matches) else len(translated)
+        text = translated[match.end():end].strip()
+
+        if next_index == index + 1 and text:
+            parts[index] = text
+        else:
+            # Markers between index and next_index went missing
+            bad.append((index, next_index))
+
+    return parts, bad
+
+
 class TranslationService:
-    """Service for translating text using Google Translate."""
+    """Service for translating text using Google Translate (or Gemini when faster)."""
 
-    def __init__(self):
+    def __init__(
+        self,
+        translation_memory: Optional[TranslationMemory] = None,
+        language_detector: Optional[LanguageDetector] = None,
+        http_clients: Optional[HTTPClientRegistry] = None
+    ):
+        self.translation_memory = translation_memory or default_translation_memory
+        self.http_clients = http_clients or default_http_clients
+        self.language_detector = language_detector or default_language_detector
         self.api_url = "https://api.lingo.dev/v1"
         self.api_key = settings.LINGO_API_KEY
         self.headers = {
@@ -41,6 +108,156 @@ class TranslationService:
             'en': 'en'      # English
         }
 
+        # deep-translator is blocking, so calls run in a dedicated bounded pool
+        self.max_threads = settings.TRANSLATION_THREADS
+        self.parallelism = settings.TRANSLATION_PARALLELISM
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+        # Each request goes to the provider currently expected to answer fastest
+        providers = {
+            "google": GoogleTranslateProvider(
+                lambda source, target, text: self._google_translate(source, target, text),
+                self._get_executor,
+                self.http_clients
+            ),
+            "gemini": GeminiTranslationProvider(),
+        }
+        enabled = [providers[name] for name in settings.translation_providers if name in providers]
+        if not enabled:
+            print("⚠️  TRANSLATION_PROVIDERS has no known provider - using google")
+            enabled = [providers["google"]]
+        self.router = TranslationProviderRouter(enabled, self.http_clients)
+
+        # Characters per request: shrinks when markers get mangled, grows back otherwise
+        self.max_chunk_chars = 4500  # Leave buffer below Google's 5000 limit
+        self.min_chunk_chars = 1000
+        self.chunk_chars = self.max_chunk_chars
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.max_threads,
+                thread_name_prefix="translate"
+            )
+        return self._executor
+
+    @staticmethod
+    def _google_translate(source: str, target: str, text: str) -> Optional[str]:
+        # A translator per call: GoogleTranslator keeps request state on the instance
+        return GoogleTranslator(source=source, target=target).translate(text)
+
+    async def _translate(self, source: str, target: str, text: str) -> Optional[str]:
+        """Translate one request's worth of text with the best available provider."""
+        return await self.router.translate(source, target, text)
+
+    def _adapt_chunk_size(self, mismatch: bool) -> None:
+        """Shrink chunks after a marker mismatch; grow them back slowly after clean ones."""
+        if mismatch:
+            self.chunk_chars = max(self.min_chunk_chars, int(self.chunk_chars * 0.7))
+        else:
+            self.chunk_chars = min(self.max_chunk_chars, int(self.chunk_chars * 1.05) + 1)
+
+    async def _translate_segments(
+        self,
+        source: str,
+        target: str,
+        segments: List[str],
+        semaphore: AsyncContextManager[Any]
+    ) -> List[Optional[str]]:
+        """
+        Translate segments in one request using numbered markers.
+
+        If some markers come back lost or merged, only the affected
+        sub-ranges are bisected and retried; the rest of the request is
+        kept.
+
+        Returns:
+            Translation per segment, or None where it failed
+        """
+        if len(segments) == 1:
+            try:
+                async with semaphore:
+                    translated = await self._translate(source, target, segments[0])
+                return [translated.strip() if translated and translated.strip() else None]
+            except Exception as e:
+                print(f"⚠️  Segment translation failed: {str(e)}")
+                return [None]
+
+        try:
+            async with semaphore:
+                translated = await self._translate(source, target, _join_segments(segments))
+        except Exception as e:
+            # Upstream failure, not a marker problem - retrying halves would only multiply it
+            print(f"⚠️  Chunk translation failed: {str(e)}")
+            return [None] * len(segments)
+
+        if not translated:
+            return [None] * len(segments)
+
+        parts, bad_ranges = _split_segments(translated, len(segments))
+        self._adapt_chunk_size(bool(bad_ranges))
+
+        if bad_ranges:
+            metrics.increment("translation_marker_mismatches", target=target)
+
+        for start, end in bad_ranges:
+            sub_range = segments[start:end]
+            if len(sub_range) == 1:
+                retried = await self._translate_segments(source, target, sub_range, semaphore)
+            else:
+                metrics.increment("translation_bisections", target=target)
+                middle = len(sub_range) // 2
+                halves = await asyncio.gather(
+                    self._translate_segments(source, target, sub_range[:middle], semaphore),
+                    self._translate_segments(source, target, sub_range[middle:], semaphore)
+                )
+                retried = halves[0] + halves[1]
+            parts[start:end] = retried
+
+        return parts
+
+    async def _recall(self, source: str, target: str, texts: List[str]) -> Dict[str, str]:
+        """Translations already in the translation memory ({} if it is unavailable)."""
+        try:
+            found = await asyncio.to_thread(self.translation_memory.get_many, source, target, texts)
+        except Exception as e:
+            print(f"⚠️  Translation memory lookup failed: {str(e)}")
+            found = {}
+
+        hits = sum(1 for text in texts if text in found)
+        metrics.increment("translation_memory_hits", hits, target=target)
+        metrics.increment("translation_memory_misses", len(texts) - hits, target=target)
+        return found
+
+    async def _remember(self, source: str, target: str, translations: Dict[str, str]) -> None:
+        """Add fresh translations to the translation memory."""
+        try:
+            await asyncio.to_thread(self.translation_memory.put_many, source, target, translations)
+        except Exception as e:
+            print(f"⚠️  Translation memory update failed: {str(e)}")
+
+    def _already_in(self, text: str, target_language: str) -> bool:
+        """Whether text is already in the target language (no upstream call needed)."""
+        metrics.increment("translation_language_checks")
+        if self.language_detector.is_language(text, target_language):
+            metrics.increment("translation_language_skips", target=target_language)
+            return True
+        return False
+
+    def skip_rate(self) -> float:
+        """Fraction of checked texts that skipped translation (already in the target language)."""
+        checks = metrics.get("translation_language_checks")
+        if not checks:
+            return 0.0
+        skips = sum(metrics.snapshot().get("translation_language_skips", {}).values())
+        return round(skips / checks, 4)
+
+    def shutdown(self) -> None:
+        """Stop the translation thread pool (called on app shutdown)."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
     async def translate_text(
         self,
         text: str,
@@ -68,14 +285,17 @@ class TranslationService:
         if not text or text.strip() == "":
             return text
 
+        # Already in the target language (e.g. English typed with a Hindi UI)
+        if self._already_in(text, target_language):
+            return text
+
         try:
             # Map language codes
             source = self.lang_map.get(source_language, source_language)
             target = self.lang_map.get(target_language, target_language)
 
             # Use Google Translate
-            translator = GoogleTranslator(source=source, target=target)
-            translated = translator.translate(text)
+            translated = await self._translate(source, target, text)
             return translated if translated else text
 
         except Exception as e:
@@ -90,36 +310,63 @@ class TranslationService:
         source_language: str = "en",
         context: Optional[List[str]] = None,
     ) -> List[str]:
+        """
+        Translate multiple texts (see translate_batch_with_failures).
+
+        Texts that could not be translated keep their original text.
+
+        Returns:
+            List of translated texts
+        """
+        translated, _ = await self.translate_batch_with_failures(texts, target_language, source_language)
+        return translated
+
+    async def translate_batch_with_failures(
+        self,
+        texts: List[str],
+        target_language: str,
+        source_language: str = "en",
+        slots: Optional[AsyncContextManager[Any]] = None,
+    ) -> Tuple[List[str], List[int]]:
         """
         Translate multiple texts using Google Translate (smart chunking).
 
         Chunks texts into batches under 4500 chars each to stay within
         Google Translate's 5000 character limit while minimizing API calls.
+        Segments in a chunk are tagged with numbered markers; if Google
+        mangles some of them, only those sub-ranges are retried, and chunk
+        size adapts to the observed mismatch rate.
+        Repeated segments are translated once and fanned back out, and
+        segments already in the translation memory are not sent upstream.
+        Chunks are translated concurrently (up to TRANSLATION_PARALLELISM at
+        a time) and results keep the input order. Each chunk goes to the
+        provider the router expects to be fastest and fails over to the
+        next one if that provider errors or its circuit is open.
 
         Args:
             texts: List of texts to translate
             target_language: Target language code
             source_language: Source language code (default: 'en')
-            context: Optional context tags (not used)
+            slots: Held around every upstream request instead of the default
+                TRANSLATION_PARALLELISM semaphore (e.g. the prefetcher's
+                low-priority slot)
 
         Returns:
-            List of translated texts
+            Translated texts, and the indices of texts that could not be
+            translated (those keep their original text). A translation equal
+            to its original (e.g. a brand name) is not a failure.
         """
         if target_language == source_language:
-            return texts
+            return texts, []
 
         if not texts:
-            return texts
+            return texts, []
 
         try:
             # Map language codes
             source = self.lang_map.get(source_language, source_language)
             target = self.lang_map.get(target_language, target_language)
 
-            # Use a unique delimiter that won't appear in the text
-            DELIMITER = "\n\n\n"
-            MAX_CHARS = 4500  # Leave buffer below 5000 limit
-
             # Filter out empty texts and track their positions
             non_empty_texts = []
             non_empty_indices = []
@@ -129,18 +376,34 @@ class TranslationService:
                     non_empty_indices.append(i)
 
             if not non_empty_texts:
-                return texts
+                return texts, []
+
+            # Each distinct segment is handled once (first-occurrence order)
+            unique_texts = list(dict.fromkeys(non_empty_texts))
+            metrics.increment(
+                "translation_duplicate_segments", len(non_empty_texts) - len(unique_texts), target=target
+            )
 
-            # Create chunks that fit within character limit
+            # Segments already in the target language are kept as they are
+            translations = {text: text for text in unique_texts if self._already_in(text, target_language)}
+
+            # Only segments missing from the translation memory go upstream
+            translations.update(await self._recall(
+                source, target, [text for text in unique_texts if text not in translations]
+            ))
+            pending_texts = [text for text in unique_texts if text not in translations]
+
+            # Create chunks that fit within the (adaptive) character limit
+            max_chars = self.chunk_chars
             chunks = []
             current_chunk = []
             current_length = 0
 
-            for text in non_empty_texts:
-                text_length = len(text) + len(DELIMITER)
+            for text in pending_texts:
+                text_length = len(text) + MARKER_OVERHEAD
 
                 # If adding this text exceeds limit, start new chunk
-                if current_length + text_length > MAX_CHARS and current_chunk:
+                if current_length + text_length > max_chars and current_chunk:
                     chunks.append(current_chunk)
                     current_chunk = [text]
                     current_length = len(text)
@@ -152,67 +415,115 @@ class TranslationService:
             if current_chunk:
                 chunks.append(current_chunk)
 
-            print(f"📝 Translating {len(non_empty_texts)} segments in {len(chunks)} batch(es)...")
-
-            # Translate each chunk
-            translator = GoogleTranslator(source=source, target=target)
-            all_translated = []
-
-            for i, chunk in enumerate(chunks):
-                # Combine chunk texts
-                combined_text = DELIMITER.join(chunk)
-
-                # Translate the chunk
-                try:
-                    translated_combined = translator.translate(combined_text)
+            print(
+                f"📝 Translating {len(pending_texts)} segments in {len(chunks)} batch(es) "
+                f"({len(non_empty_texts) - len(unique_texts)} duplicates, "
+                f"{len(unique_texts) - len(pending_texts)} already translated or in target language)..."
+            )
 
-                    if not translated_combined:
-                        # If translation fails, use originals
-                        all_translated.extend(chunk)
-                        continue
+            # Translate chunks concurrently
+            semaphore = slots or asyncio.Semaphore(self.parallelism)
 
-                    # Split the translated chunk
-                    translated_parts = translated_combined.split(DELIMITER)
+            translated_chunks = await asyncio.gather(*[
+                self._translate_segments(source, target, chunk, semaphore) for chunk in chunks
+            ])
 
-                    # Validate split
-                    if len(translated_parts) != len(chunk):
-                        print(f"⚠️  Chunk {i+1} split mismatch: expected {len(chunk)}, got {len(translated_parts)}")
-                        # Use original texts for this chunk
-                        all_translated.extend(chunk)
-                    else:
-                        all_translated.extend(translated_parts)
+            fresh = {
+                text: translated
+                for chunk, translated_parts in zip(chunks, translated_chunks)
+                for text, translated in zip(chunk, translated_parts)
+                if translated is not None
+            }
 
-                except Exception as e:
-                    print(f"⚠️  Chunk {i+1} translation failed: {str(e)}")
-                    # Use original texts for this chunk
-                    all_translated.extend(chunk)
+            await self._remember(source, target, fresh)
+            translations.update(fresh)
+            failed = [idx for idx in non_empty_indices if texts[idx] not in translations]
 
             # Build result list with translated texts in correct positions
+            # (segments that could not be translated keep their original text)
             result = list(texts)  # Copy original list
-            for idx, translated_text in zip(non_empty_indices, all_translated):
-                result[idx] = translated_text
+            for idx in non_empty_indices:
+                result[idx] = translations.get(texts[idx], texts[idx])
 
             print(f"✅ Translated {len(non_empty_texts)} segments in {len(chunks)} batch(es)!")
-            return result
+            return result, failed
 
         except Exception as e:
             print(f"❌ Batch translation failed: {str(e)}")
             print("⚠️  Falling back to individual translation...")
 
             # Fallback to individual translation
-            translated = []
-            translator = GoogleTranslator(source=source, target=target)
-            for text in texts:
+            semaphore = slots or asyncio.Semaphore(self.parallelism)
+
+            async def translate_one(text: str) -> Tuple[str, bool]:
                 if not text or text.strip() == "":
-                    translated.append(text)
-                else:
-                    try:
-                        result = translator.translate(text)
-                        translated.append(result if result else text)
-                    except Exception as e:
-                        print(f"⚠️  Individual translation failed: {str(e)}")
-                        translated.append(text)
-            return translated
+                    return text, True
+                try:
+                    async with semaphore:
+                        result = await self._translate(source, target, text)
+                    return (result, True) if result else (text, False)
+                except Exception as e:
+                    print(f"⚠️  Individual translation failed: {str(e)}")
+                    return text, False
+
+            outcomes = await asyncio.gather(*[translate_one(text) for text in texts])
+            return [text for text, _ in outcomes], [i for i, (_, ok) in enumerate(outcomes) if not ok]
+
+    async def translate_fields(
+        self,
+        payload: Any,
+        fields: Spec,
+        target_language: str,
+        source_language: str = "en",
+    ) -> Any:
+        """
+        Translate string fields across a nested response in a single batch.
+
+        All leaves matched by the field spec are gathered into one
+        translate_batch call (deduplicated, chunked and translated
+        concurrently) and the results are written back in place.
+
+        Args:
+            payload: Dict or list to translate (modified in place)
+            fields: Field spec, e.g. PLAGIARISM_FIELDS or paths_spec(["[].name"])
+            target_language: Target language code
+            source_language: Source language code (default: 'en')
+
+        Returns:
+            The payload, with translated fields
+        """
+        payload, _ = await self.translate_fields_with_failures(payload, fields, target_language, source_language)
+        return payload
+
+    async def translate_fields_with_failures(
+        self,
+        payload: Any,
+        fields: Spec,
+        target_language: str,
+        source_language: str = "en",
+    ) -> Tuple[Any, List[Path]]:
+        """
+        Like translate_fields, but also report the fields left untranslated.
+
+        Returns:
+            The payload, and the paths of fields that could not be
+            translated (they keep their original text)
+        """
+        if target_language == source_language:
+            return payload, []
+
+        leaves = extract(payload, fields)
+        if not leaves:
+            return payload, []
+
+        translated, failed = await self.translate_batch_with_failures(
+            [text for _, text in leaves],
+            target_language,
+            source_language
+        )
+
+        paths = [path for path, _ in leaves]
+        return write_back(payload, paths, translated), [paths[i] for i in failed]
 
     async def translate_query(
         self, query: str, target_language: str = "en", source_language: str = "auto"
@@ -262,28 +573,10 @@ class TranslationService:
             return results
 
         try:
-            # Collect all texts to translate
-            texts_to_translate = []
-            for result in results:
-                for field in fields:
-                    if field in result and result[field]:
-                        texts_to_translate.append(str(result[field]))
-
-            # Translate all texts in batch
-            translated_texts = await self.translate_batch(
-                texts_to_translate, target_language
+            return await self.translate_fields(
+                results, paths_spec(f"[].{field}" for field in fields), target_language
             )
 
-            # Map translated texts back to results
-            text_index = 0
-            for result in results:
-                for field in fields:
-                    if field in result and result[field]:
-                        result[field] = translated_texts[text_index]
-                        text_index += 1
-
-            return results
-
         except Exception as e:
             print(f"Result translation failed: {str(e)}")
             return results
@@ -4,12 +4,14 @@ from typing import Dict, Any, Optional, List
 from datetime import datetime, timezone
 import time
 from ..core.config import settings
+from ..core.http_clients import HTTPClientRegistry, http_clients as default_http_clients
 
 
 class WinstonAIService:
     """Service for plagiarism detection using Winston AI API."""
 
-    def __init__(self):
+    def __init__(self, http_clients: Optional[HTTPClientRegistry] = None):
+        self.http_clients = http_clients or default_http_clients
         self.api_url = "https://api.gowinston.ai/v2/plagiarism"
         self.api_key = settings.WINSTON_API_KEY
 
@@ -78,29 +80,30 @@ class WinstonAIService:
                 payload["excluded_sources"] = excluded_sources
 
             # Make API request
-            async with httpx.AsyncClient(timeout=120.0) as client:
-                response = await client.post(
-                    self.api_url,
-                    headers={
-                        "Authorization": f"Bearer {self.api_key}",
-                        "Content-Type": "application/json"
-                    },
-                    json=payload
+            response = await self.http_clients.request(
+                "winston",
+                "POST",
+                self.api_url,
+                headers={
+                    "Authorization": f"Bearer {self.api_key}",
+                    "Content-Type": "application/json"
+                },
+                json=payload
+            )
+
+            if response.status_code != 200:
+                error_data = response.json() if response.text else {}
+                raise Exception(
+                    f"Winston AI API error (status {response.status_code}): "
+                    f"{error_data.get('message', response.text)}"
                 )
 
-                if response.status_code != 200:
-                    error_data = response.json() if response.text else {}
-                    raise Exception(
-                        f"Winston AI API error (status {response.status_code}): "
-                        f"{error_data.get('message', response.text)}"
-                    )
+            result = response.json()
 
-                result = response.json()
+            # Extract and format the response
+            formatted_result = self._format_response(result, start_time, text)
 
-                # Extract and format the response
-                formatted_result = self._format_response(result, start_time, text)
-
-                return formatted_result
+            return formatted_result
 
         except httpx.TimeoutException:
             raise Exception("Winston AI API request timed out. Please try again.")
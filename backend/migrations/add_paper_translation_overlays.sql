@@ -0,0 +1,9 @@
+-- Migration: Sparse Paper Translation Overlays
+-- Date: 2026-10-19
+-- Description: Store paper translations as {JSON pointer: translated string} overlays
+-- merged over the English analysis, instead of a full analysis copy per language
+
+ALTER TABLE public.paper_translations ADD COLUMN IF NOT EXISTS overlay JSONB;
+
+-- Full copies (analysis) are still served for rows written before this migration
+ALTER TABLE public.paper_translations ALTER COLUMN analysis DROP NOT NULL;
@@ -0,0 +1,6 @@
+-- Migration: Add Preferred Languages to Users
+-- Date: 2026-10-19
+-- Description: Languages a user's processed papers are pre-translated into
+-- (settable via PUT /api/v1/auth/me, e.g. {"preferred_languages": ["hi", "es"]})
+
+ALTER TABLE public.users ADD COLUMN IF NOT EXISTS preferred_languages TEXT[] DEFAULT '{}';
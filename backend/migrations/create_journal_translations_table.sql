@@ -0,0 +1,33 @@
+-- Migration: Create Journal Translations Table
+-- Date: 2026-10-19
+-- Description: Precomputed journal names/descriptions per language, filled by a background job
+
+CREATE TABLE IF NOT EXISTS public.journal_translations (
+    journal_id UUID NOT NULL REFERENCES public.journals(id) ON DELETE CASCADE,
+    language TEXT NOT NULL,
+    name TEXT,
+    description TEXT,
+    source_hash TEXT NOT NULL,  -- sha256 of the English name/description it was translated from
+    updated_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+    PRIMARY KEY (journal_id, language)
+);
+
+CREATE INDEX IF NOT EXISTS idx_journal_translations_language ON public.journal_translations(language);
+
+-- Enable Row Level Security (RLS)
+ALTER TABLE public.journal_translations ENABLE ROW LEVEL SECURITY;
+
+-- Create policy to allow all operations (for demo/hackathon)
+CREATE POLICY "Allow all for journal_translations" ON public.journal_translations FOR ALL USING (true);
+
+-- Add trigger for updated_at (handle_updated_at() is created by create_users_table.sql)
+DROP TRIGGER IF EXISTS set_journal_translations_updated_at ON public.journal_translations;
+CREATE TRIGGER set_journal_translations_updated_at
+    BEFORE UPDATE ON public.journal_translations
+    FOR EACH ROW
+    EXECUTE FUNCTION public.handle_updated_at();
+
+-- Grant permissions
+GRANT ALL ON public.journal_translations TO postgres, anon, authenticated, service_role;
+
+SELECT 'Journal translations table created successfully!' AS status;
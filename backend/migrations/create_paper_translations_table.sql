@@ -0,0 +1,32 @@
+-- Migration: Create Paper Translations Table
+-- Date: 2026-10-19
+-- Description: Store paper analysis translations as one row per (paper, language)
+-- instead of rewriting the uploads.translation_cache JSONB blob for every new language
+
+CREATE TABLE IF NOT EXISTS public.paper_translations (
+    paper_id UUID NOT NULL REFERENCES public.uploads(id) ON DELETE CASCADE,
+    language TEXT NOT NULL,
+    analysis JSONB NOT NULL,
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+    PRIMARY KEY (paper_id, language)
+);
+
+-- Copy existing cached translations over
+INSERT INTO public.paper_translations (paper_id, language, analysis)
+SELECT u.id, t.key, t.value
+FROM public.uploads u, jsonb_each(COALESCE(u.translation_cache, '{}'::jsonb)) AS t
+ON CONFLICT (paper_id, language) DO NOTHING;
+
+-- Enable Row Level Security (RLS)
+ALTER TABLE public.paper_translations ENABLE ROW LEVEL SECURITY;
+
+-- Create policy to allow all operations (for demo/hackathon)
+CREATE POLICY "Allow all for paper_translations" ON public.paper_translations FOR ALL USING (true);
+
+-- Grant permissions
+GRANT ALL ON public.paper_translations TO postgres, anon, authenticated, service_role;
+
+-- uploads.translation_cache is no longer read or written; drop it once the copy is verified:
+-- ALTER TABLE public.uploads DROP COLUMN translation_cache;
+
+SELECT 'Paper translations table created successfully!' AS status;
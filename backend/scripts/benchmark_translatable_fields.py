@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+"""
+Benchmark translatable-field extraction for paper analyses.
+
+Compares the schema-driven walker (extract + sparse overlay) with the
+previous hand-coded implementation, which built "results.key_findings[3]"
+style keys, re-parsed them with split/int/rstrip and wrote translations
+into a deep copy of the analysis. Translation itself is replaced by
+str.upper so only the extraction and write-back cost is measured.
+
+Usage:
+    python scripts/benchmark_translatable_fields.py [--items N] [--repeat N]
+"""
+
+import argparse
+import copy
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from app.services.translatable_fields import PAPER_ANALYSIS_FIELDS, extract  # noqa: E402
+from app.services.translation_overlay import apply_overlay, json_pointer  # noqa: E402
+
+
+def make_analysis(items):
+    """Synthetic analysis with `items` entries in every list section."""
+    sentence = "The proposed method improves accuracy on the benchmark by a wide margin. "
+    return {
+        "title": "A Study of Things",
+        "authors": [f"Author {i}" for i in range(8)],
+        "year": 2024,
+        "venue": "Conference",
+        "citation": "Author, A. (2024). A Study of Things.",
+        "tldr": sentence * 2,
+        "abstract": sentence * 6,
+        "introduction": sentence * 10,
+        "research_question": sentence,
+        "methods": {key: sentence * 3 for key in ["overview", "data_sources", "sample_size",
+                                                  "study_design", "statistical_analysis"]},
+        "results": {
+            "summary": sentence * 3,
+            "key_findings": [sentence] * items,
+            "quantitative_results": [f"Metric {i}: {i * 1.5} (p<0.05)" for i in range(items)],
+        },
+        "discussion": sentence * 8,
+        "conclusion": sentence * 4,
+        "limitations": [sentence] * items,
+        "related_work": [{"citation": f"Ref {i}", "comparison": sentence} for i in range(items)],
+        "contributions": [sentence] * items,
+        "practical_takeaways": [sentence] * items,
+        "future_work": [sentence] * items,
+        "glossary": {f"term {i}": sentence for i in range(items)},
+        "qa_pairs": [{"question": sentence, "answer": sentence * 2} for i in range(items)],
+        "plain_summary": sentence * 3,
+        "practitioner_summary": sentence * 3,
+        "word_count": 9000,
+    }
+
+
+def legacy_translate(analysis):
+    """The hand-coded implementation get_paper_analysis used before the walker."""
+    texts_to_translate = []
+    text_keys = []
+
+    for key in ["title", "abstract", "tldr", "introduction", "research_question",
+               "discussion", "conclusion"]:
+        if key in analysis and analysis[key]:
+            texts_to_translate.append(str(analysis[key]))
+            text_keys.append(key)
+
+    for key in ["contributions", "limitations", "practical_takeaways", "future_work"]:
+        if key in analysis and isinstance(analysis[key], list):
+            for idx, item in enumerate(analysis[key]):
+                if item:
+                    texts_to_translate.append(str(item))
+                    text_keys.append(f"{key}[{idx}]")
+
+    if "glossary" in analysis and isinstance(analysis["glossary"], dict):
+        for term, definition in analysis["glossary"].items():
+            if definition:
+                texts_to_translate.append(str(definition))
+                text_keys.append(f"glossary.{term}")
+
+    if "methods" in analysis and isinstance(analysis["methods"], dict):
+        for method_key in ["overview", "study_design", "data_sources", "sample_size"]:
+            if method_key in analysis["methods"] and analysis["methods"][method_key]:
+                texts_to_translate.append(str(analysis["methods"][method_key]))
+                text_keys.append(f"methods.{method_key}")
+
+    if "results" in analysis and isinstance(analysis["results"], dict):
+        if "summary" in analysis["results"] and analysis["results"]["summary"]:
+            texts_to_translate.append(str(analysis["results"]["summary"]))
+            text_keys.append("results.summary")
+        for list_key in ["key_findings", "quantitative_results"]:
+            if list_key in analysis["results"] and isinstance(analysis["results"][list_key], list):
+                for idx, item in enumerate(analysis["results"][list_key]):
+                    if item:
+                        texts_to_translate.append(str(item))
+                        text_keys.append(f"results.{list_key}[{idx}]")
+
+    translated_texts = [text.upper() for text in texts_to_translate]
+    translated = copy.deepcopy(analysis)
+
+    for i, key in enumerate(text_keys):
+        if "[" in key:
+            if "." in key:
+                parts = key.split(".")
+                field_name = parts[0]
+                array_part = parts[1]
+                array_name = array_part.split("[")[0]
+                idx = int(array_part.split("[")[1].rstrip("]"))
+                while len(translated[field_name][array_name]) <= idx:
+                    translated[field_name][array_name].append(None)
+                translated[field_name][array_name][idx] = translated_texts[i]
+            else:
+                array_name = key.split("[")[0]
+                idx = int(key.split("[")[1].rstrip("]"))
+                while len(translated[array_name]) <= idx:
+                    translated[array_name].append(None)
+                translated[array_name][idx] = translated_texts[i]
+        elif "." in key:
+            parts = key.split(".")
+            if parts[0] == "glossary":
+                translated["glossary"][parts[1]] = translated_texts[i]
+            else:
+                translated[parts[0]][parts[1]] = translated_texts[i]
+        else:
+            translated[key] = translated_texts[i]
+
+    return translated, len(text_keys)
+
+
+def walker_translate(analysis):
+    """Schema-driven extraction, sparse overlay and lazy merge."""
+    leaves = extract(analysis, PAPER_ANALYSIS_FIELDS)
+    overlay = {json_pointer(list(path)): text.upper() for path, text in leaves}
+    return apply_overlay(analysis, overlay), len(leaves)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark translatable-field extraction")
+    parser.add_argument("--items", type=int, default=20, help="Entries per list section")
+    parser.add_argument("--repeat", type=int, default=2000, help="Iterations per implementation")
+    args = parser.parse_args()
+
+    analysis = make_analysis(args.items)
+    _, legacy_fields = legacy_translate(analysis)
+    _, walker_fields = walker_translate(analysis)
+
+    print(f"📄 Analysis with {args.items} items per list section")
+    print(f"   Legacy: {legacy_fields} fields translated")
+    print(f"   Walker: {walker_fields} fields translated (incl. qa_pairs, summaries, related work)")
+
+    for name, func in [("legacy", legacy_translate), ("walker", walker_translate)]:
+        seconds = min(timeit.repeat(lambda: func(analysis), number=args.repeat, repeat=3))
+        per_call = seconds / args.repeat * 1e6
+        per_field = per_call / (legacy_fields if name == "legacy" else walker_fields)
+        print(f"⏱️  {name}: {per_call:8.1f} µs/analysis, {per_field:5.2f} µs/field")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Bulk-import CrossRef metadata into the local citation store.
+
+Reads JSONL dumps (optionally gzip-compressed) line by line, so files of
+any size can be imported with constant memory. Each line may be a single
+CrossRef work item, an API response ({"message": {"items": [...]}}) or an
+object with an "items" list.
+
+Usage:
+    python scripts/import_citations.py dump1.jsonl.gz dump2.jsonl [--db PATH] [--max-mb N]
+"""
+
+import argparse
+import gzip
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from app.services.citation_store import CitationStore, work_from_crossref  # noqa: E402
+
+
+def iter_items(path):
+    """Yield CrossRef work items from a JSONL dump."""
+    opener = gzip.open if path.endswith(".gz") else open
+
+    with opener(path, "rt", encoding="utf-8") as f:
+        for line_number, line in enumerate(f, 1):
+            line = line.strip()
+            if not line:
+                continue
+
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                print(f"⚠️  {path}:{line_number}: invalid JSON, skipped")
+                continue
+
+            if "message" in record and isinstance(record["message"], dict):
+                record = record["message"]
+
+            if isinstance(record.get("items"), list):
+                yield from record["items"]
+            else:
+                yield record
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Import CrossRef JSONL dumps into the citation store")
+    parser.add_argument("files", nargs="+", help="JSONL dump files (.jsonl or .jsonl.gz)")
+    parser.add_argument("--db", help="Citation store path (default: CITATION_STORE_PATH)")
+    parser.add_argument("--max-mb", type=int, help="Disk budget in MB (default: CITATION_STORE_MAX_MB)")
+    parser.add_argument("--batch-size", type=int, default=5000, help="Records per transaction")
+    args = parser.parse_args()
+
+    store = CitationStore(path=args.db, max_mb=args.max_mb)
+    if not store.enabled:
+        print("❌ Citation store is disabled (CITATION_STORE_PATH is empty)")
+        sys.exit(1)
+
+    print(f"📚 Importing into {store.path}...")
+    start_time = time.time()
+    imported = 0
+    skipped = 0
+
+    for path in args.files:
+        batch = []
+
+        for item in iter_items(path):
+            work = work_from_crossref(item)
+            if not work:
+                skipped += 1
+                continue
+
+            batch.append(work)
+            if len(batch) >= args.batch_size:
+                imported += store.add_works(batch)
+                batch = []
+                print(f"   {imported:,} works imported...")
+
+        imported += store.add_works(batch)
+        print(f"✅ {path} done")
+
+    elapsed = time.time() - start_time
+    print(f"\n✅ Imported {imported:,} works ({skipped:,} skipped) in {elapsed:.1f}s")
+    print(f"📦 Store now holds {store.count():,} works")
+    store.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -2,6 +2,7 @@
 import pytest
 from fastapi.testclient import TestClient
 from unittest.mock import patch, AsyncMock
+from app.core.circuit_breaker import CircuitOpenError
 from app.main import app
 
 
@@ -161,6 +162,24 @@ class TestJournalsEndpoints:
         assert "journals" in data
         assert "count" in data
 
+    @patch('app.api.v1.journals.semantic_scholar_service')
+    @patch('app.api.v1.journals.journals_service')
+    def test_unavailable_upstream_returns_503(self, mock_journals_service, mock_s2_service):
+        """An open circuit fails fast with 503 instead of a generic 500."""
+        mock_journals_service._get_journals_from_db = AsyncMock(return_value=[{"id": "j1", "name": "Nature"}])
+        mock_s2_service.recommend_journals_hybrid = AsyncMock(
+            side_effect=CircuitOpenError("huggingface", "huggingface circuit is open")
+        )
+
+        response = client.post("/api/v1/journals/recommend", json={
+            "abstract": "A novel deep learning approach for image classification.",
+            "keywords": ["deep learning"]
+        })
+
+        assert response.status_code == 503
+        assert response.json()["upstream"] == "huggingface"
+        assert response.headers["Retry-After"] == "5"
+
     @patch('app.api.v1.journals.journals_service')
     def test_search_journals(self, mock_service):
         """Test journal search endpoint."""
@@ -0,0 +1,89 @@
+"""Unit tests for per-upstream bulkheads."""
+import asyncio
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+from app.core.bulkhead import Bulkhead, BulkheadFullError
+from app.core.http_clients import HTTPClientRegistry
+from app.main import create_app
+
+
+class TestBulkhead:
+    """Test concurrency limiting."""
+
+    @pytest.mark.asyncio
+    async def test_limits_concurrency(self):
+        """No more than max_concurrent calls run at once."""
+        bulkhead = Bulkhead("test", max_concurrent=2, max_wait=5.0)
+        peak = 0
+
+        async def call():
+            nonlocal peak
+            async with bulkhead:
+                peak = max(peak, bulkhead.active)
+                await asyncio.sleep(0.01)
+
+        await asyncio.gather(*[call() for _ in range(6)])
+
+        assert peak == 2
+        assert bulkhead.snapshot() == {"max_concurrent": 2, "active": 0, "waiting": 0}
+
+    @pytest.mark.asyncio
+    async def test_fails_fast_when_saturated(self):
+        """A call that cannot get a slot within max_wait is rejected."""
+        bulkhead = Bulkhead("test", max_concurrent=1, max_wait=0.01)
+        release = asyncio.Event()
+
+        async def hold():
+            async with bulkhead:
+                await release.wait()
+
+        holder = asyncio.create_task(hold())
+        await asyncio.sleep(0)
+
+        with pytest.raises(BulkheadFullError):
+            async with bulkhead:
+                pass
+
+        release.set()
+        await holder
+        assert bulkhead.active == 0
+
+    @pytest.mark.asyncio
+    async def test_registry_applies_bulkhead(self):
+        """Requests beyond an upstream's limit are rejected by the registry."""
+        release = asyncio.Event()
+
+        async def handler(request):
+            await release.wait()
+            return httpx.Response(200, json={})
+
+        registry = HTTPClientRegistry()
+        registry._create_client = lambda name: httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        registry.bulkheads["winston"] = Bulkhead("winston", max_concurrent=1, max_wait=0.01)
+
+        first = asyncio.create_task(registry.request("winston", "POST", "https://api.gowinston.ai/v2/plagiarism"))
+        await asyncio.sleep(0.01)
+
+        with pytest.raises(BulkheadFullError):
+            await registry.request("winston", "POST", "https://api.gowinston.ai/v2/plagiarism")
+
+        release.set()
+        assert (await first).status_code == 200
+        assert registry.breakers["winston"].snapshot()["recent_failures"] == 0
+        await registry.aclose()
+
+
+def test_unavailable_upstream_maps_to_503():
+    """Bulkhead rejections surface as 503 with Retry-After."""
+    app = create_app()
+
+    @app.get("/_test/saturated")
+    async def saturated():
+        raise BulkheadFullError("openrouter", "openrouter is at capacity")
+
+    response = TestClient(app).get("/_test/saturated")
+
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == "5"
+    assert response.json()["upstream"] == "openrouter"
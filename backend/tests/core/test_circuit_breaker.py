@@ -0,0 +1,85 @@
+"""Unit tests for per-upstream circuit breakers."""
+import httpx
+import pytest
+from unittest.mock import patch
+from app.core.circuit_breaker import CLOSED, HALF_OPEN, OPEN, CircuitBreaker, CircuitOpenError
+from app.core.http_clients import HTTPClientRegistry
+
+
+class TestCircuitBreaker:
+    """Test breaker state transitions."""
+
+    def test_opens_on_error_rate(self):
+        """The breaker opens once the failure rate crosses the threshold."""
+        breaker = CircuitBreaker("test", min_calls=4, failure_rate=0.5)
+
+        for success in (True, True, False):
+            breaker.allow()
+            breaker.record(success, 0.1)
+        assert breaker.state == CLOSED
+
+        breaker.allow()
+        breaker.record(False, 0.1)
+        assert breaker.state == OPEN
+
+        with pytest.raises(CircuitOpenError):
+            breaker.allow()
+
+    def test_opens_on_slow_calls(self):
+        """Successful but slow calls also open the breaker."""
+        breaker = CircuitBreaker("test", min_calls=2, slow_call_seconds=1.0, slow_call_rate=1.0)
+
+        for _ in range(2):
+            breaker.allow()
+            breaker.record(True, 5.0)
+
+        assert breaker.state == OPEN
+
+    def test_half_open_probe(self):
+        """After the cool-down one probe is allowed; its outcome decides the state."""
+        breaker = CircuitBreaker("test", min_calls=1, open_seconds=10.0)
+        breaker.allow()
+        breaker.record(False, 0.1)
+
+        with patch("app.core.circuit_breaker.time.monotonic", return_value=breaker._opened_at + 11):
+            assert breaker.state == HALF_OPEN
+            breaker.allow()
+            with pytest.raises(CircuitOpenError):
+                breaker.allow()
+
+            breaker.record(False, 0.1)
+            assert breaker.state == OPEN
+
+        with patch("app.core.circuit_breaker.time.monotonic", return_value=breaker._opened_at + 11):
+            breaker.allow()
+            breaker.record(True, 0.1)
+            assert breaker.state == CLOSED
+            assert breaker.snapshot()["recent_calls"] == 0
+
+
+class TestRegistryBreakers:
+    """Test circuit breaking in the shared client layer."""
+
+    @pytest.mark.asyncio
+    async def test_open_breaker_fails_fast(self):
+        """Once the upstream keeps failing, calls are rejected without reaching it."""
+        calls = []
+
+        def handler(request):
+            calls.append(request)
+            return httpx.Response(503)
+
+        registry = HTTPClientRegistry()
+        registry._create_client = lambda name: httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        breaker = registry.breakers["winston"]
+
+        for _ in range(breaker.min_calls):
+            response = await registry.request("winston", "POST", "https://api.gowinston.ai/v2/plagiarism")
+            assert response.status_code == 503
+
+        with pytest.raises(CircuitOpenError):
+            await registry.request("winston", "POST", "https://api.gowinston.ai/v2/plagiarism")
+
+        assert len(calls) == breaker.min_calls
+        assert registry.health()["winston"]["state"] == OPEN
+        await registry.aclose()
@@ -0,0 +1,178 @@
+"""Unit tests for latency tracking and hedged requests."""
+import asyncio
+import httpx
+import pytest
+from app.core.hedging import LatencyTracker, hedged
+from app.core.http_clients import HTTPClientRegistry
+from app.core.metrics import metrics
+from app.core.rate_limiter import TokenBucket
+
+
+async def always():
+    return True
+
+
+async def never():
+    return False
+
+
+class TestLatencyTracker:
+    """Test percentile tracking."""
+
+    def test_percentile_needs_samples(self):
+        """No percentile is reported until min_samples are recorded."""
+        tracker = LatencyTracker(min_samples=5)
+        for i in range(4):
+            tracker.record(i)
+        assert tracker.percentile(0.9) is None
+
+    def test_p90(self):
+        """p90 is taken over the recorded window."""
+        tracker = LatencyTracker(window_size=10, min_samples=1)
+        for i in range(1, 21):
+            tracker.record(float(i))
+
+        assert tracker.percentile(0.9) == 19.0
+
+
+class TestHedged:
+    """Test the hedging helper."""
+
+    @pytest.mark.asyncio
+    async def test_fast_primary_is_not_hedged(self):
+        """A primary answering before the delay is never hedged."""
+        calls = []
+
+        async def call():
+            calls.append(1)
+            return "primary"
+
+        assert await hedged("test", call, 0.5, always) == "primary"
+        assert len(calls) == 1
+
+    @pytest.mark.asyncio
+    async def test_hedge_wins_when_primary_is_slow(self):
+        """A slow primary is hedged and the faster hedge's result is used."""
+        delays = [1.0, 0.0]
+
+        async def call():
+            await asyncio.sleep(delays.pop(0))
+            return "done"
+
+        before = metrics.get("hedge_wins", upstream="test")
+        assert await hedged("test", call, 0.01, always) == "done"
+        assert metrics.get("hedge_wins", upstream="test") == before + 1
+
+    @pytest.mark.asyncio
+    async def test_no_budget_skips_hedge(self):
+        """Without rate-limit budget the primary is awaited alone."""
+        calls = []
+
+        async def call():
+            calls.append(1)
+            await asyncio.sleep(0.05)
+            return "primary"
+
+        assert await hedged("test", call, 0.01, never) == "primary"
+        assert len(calls) == 1
+
+    @pytest.mark.asyncio
+    async def test_failed_hedge_falls_back_to_primary(self):
+        """If the hedge fails, the primary's result is still returned."""
+        attempts = []
+
+        async def call():
+            attempts.append(1)
+            if len(attempts) == 2:
+                raise RuntimeError("hedge failed")
+            await asyncio.sleep(0.05)
+            return "primary"
+
+        assert await hedged("test", call, 0.01, always) == "primary"
+
+    @pytest.mark.asyncio
+    async def test_losing_hedge_does_not_beat_slow_primary(self):
+        """A fast losing result (e.g. a 429) waits for the other call."""
+        attempts = []
+
+        async def call():
+            attempts.append(1)
+            if len(attempts) == 2:
+                return 429
+            await asyncio.sleep(0.05)
+            return 200
+
+        assert await hedged("test", call, 0.01, always, lambda status: status == 429) == 200
+
+    @pytest.mark.asyncio
+    async def test_all_losing_returns_first_loss(self):
+        """If neither call wins, the first losing result is returned, not raised."""
+        attempts = []
+
+        async def call():
+            attempts.append(1)
+            if len(attempts) == 2:
+                raise RuntimeError("hedge failed")
+            await asyncio.sleep(0.05)
+            return 503
+
+        assert await hedged("test", call, 0.01, always, lambda status: status >= 500) == 503
+
+
+class TestRegistryHedging:
+    """Test hedging in the shared client layer."""
+
+    @pytest.mark.asyncio
+    async def test_hedged_get_spends_spare_token(self):
+        """Hedges are sent once p90 has passed and take a token from the limiter."""
+        calls = []
+
+        async def handler(request):
+            calls.append(request)
+            if len(calls) == 1:
+                await asyncio.sleep(1.0)
+            return httpx.Response(200, json={"call": len(calls)})
+
+        registry = HTTPClientRegistry()
+        registry.response_cache.backend = None
+        registry._create_client = lambda name: httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        registry.rate_limiters["semantic_scholar"] = TokenBucket(rate=1.0, burst=2)
+        for _ in range(registry.latency["semantic_scholar"].min_samples):
+            registry.latency["semantic_scholar"].record(0.01)
+
+        response = await registry.request(
+            "semantic_scholar", "GET", "https://api.semanticscholar.org/graph/v1/paper/search", hedge=True
+        )
+
+        assert response.json() == {"call": 2}
+        assert len(calls) == 2
+        assert not await registry.rate_limiters["semantic_scholar"].try_acquire()
+        await registry.aclose()
+
+    @pytest.mark.asyncio
+    async def test_rate_limited_hedge_loses_to_slow_primary(self):
+        """A fast 429 from the hedge does not beat the primary's slower 200."""
+        calls = []
+
+        async def handler(request):
+            calls.append(request)
+            if len(calls) == 1:
+                await asyncio.sleep(0.2)
+                return httpx.Response(200, json={"call": 1})
+            return httpx.Response(429)
+
+        registry = HTTPClientRegistry()
+        registry.response_cache.backend = None
+        registry._create_client = lambda name: httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        registry.upstreams = {**registry.upstreams, "semantic_scholar": {**registry.upstreams["semantic_scholar"], "retry": None}}
+        registry.rate_limiters["semantic_scholar"] = TokenBucket(rate=1.0, burst=2)
+        for _ in range(registry.latency["semantic_scholar"].min_samples):
+            registry.latency["semantic_scholar"].record(0.01)
+
+        response = await registry.request(
+            "semantic_scholar", "GET", "https://api.semanticscholar.org/graph/v1/paper/search", hedge=True
+        )
+
+        assert response.status_code == 200
+        assert len(calls) == 2
+        await registry.aclose()
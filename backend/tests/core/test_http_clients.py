@@ -0,0 +1,56 @@
+"""Unit tests for the shared upstream HTTP client registry."""
+import httpx
+import pytest
+from app.core.http_clients import HTTPClientRegistry
+
+
+@pytest.fixture
+def registry():
+    """Create a client registry."""
+    return HTTPClientRegistry()
+
+
+class TestHTTPClientRegistry:
+    """Test client pooling and lifecycle."""
+
+    @pytest.mark.asyncio
+    async def test_client_is_reused(self, registry):
+        """The same pooled client is returned for an upstream."""
+        client = registry.client("semantic_scholar")
+
+        assert registry.client("semantic_scholar") is client
+        assert registry.client("crossref") is not client
+        assert client.timeout.read == 60.0
+
+        await registry.aclose()
+        assert client.is_closed
+
+    @pytest.mark.asyncio
+    async def test_unknown_upstream(self, registry):
+        """Unknown upstream names are rejected."""
+        with pytest.raises(KeyError):
+            registry.client("nope")
+
+    @pytest.mark.asyncio
+    async def test_request_uses_pooled_client(self):
+        """Requests are sent through the upstream's client."""
+        def handler(request):
+            return httpx.Response(200, json={"path": request.url.path})
+
+        registry = HTTPClientRegistry()
+        registry._create_client = lambda name: httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+        response = await registry.request("arxiv", "GET", "https://export.arxiv.org/api/query")
+
+        assert response.status_code == 200
+        assert response.json() == {"path": "/api/query"}
+        await registry.aclose()
+
+    @pytest.mark.asyncio
+    async def test_start_opens_all_clients(self, registry):
+        """Startup opens a client for every upstream."""
+        await registry.start()
+
+        assert set(registry._clients) == set(registry.upstreams)
+        await registry.aclose()
+        assert registry._clients == {}
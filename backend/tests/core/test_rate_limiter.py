@@ -0,0 +1,164 @@
+"""Unit tests for rate limiting and retry backoff."""
+import asyncio
+import time
+import httpx
+import pytest
+from unittest.mock import AsyncMock, patch
+from app.core.http_clients import HTTPClientRegistry
+from app.core.rate_limiter import (
+    SharedTokenBucket,
+    TokenBucket,
+    backoff_delay,
+    parse_retry_after,
+)
+
+
+class TestTokenBucket:
+    """Test token bucket behavior."""
+
+    @pytest.mark.asyncio
+    async def test_burst_then_empty(self):
+        """A full bucket allows `burst` calls back to back."""
+        bucket = TokenBucket(rate=1.0, burst=3)
+
+        assert [await bucket.try_acquire() for _ in range(4)] == [True, True, True, False]
+
+    @pytest.mark.asyncio
+    async def test_try_acquire_does_not_jump_the_queue(self):
+        """While a caller waits in acquire(), try_acquire() takes nothing."""
+        bucket = TokenBucket(rate=20.0, burst=1)
+        await bucket.acquire()
+
+        waiter = asyncio.create_task(bucket.acquire())
+        await asyncio.sleep(0)
+
+        assert not await bucket.try_acquire()
+        await waiter
+
+    @pytest.mark.asyncio
+    async def test_acquire_waits_for_refill(self):
+        """acquire() waits for the next token instead of failing."""
+        bucket = TokenBucket(rate=20.0, burst=1)
+
+        start = time.monotonic()
+        await bucket.acquire()
+        await bucket.acquire()
+
+        assert time.monotonic() - start >= 0.04
+
+    @pytest.mark.asyncio
+    async def test_shared_bucket_across_instances(self, tmp_path):
+        """Two buckets on the same file share one quota."""
+        path = str(tmp_path / "limits.db")
+        first = SharedTokenBucket(rate=0.01, burst=2, path=path, name="s2")
+        second = SharedTokenBucket(rate=0.01, burst=2, path=path, name="s2")
+
+        assert await first.try_acquire()
+        assert await second.try_acquire()
+        assert not await first.try_acquire()
+
+    @pytest.mark.asyncio
+    async def test_shared_try_acquire_runs_off_the_event_loop(self, tmp_path):
+        """The shared bucket's SQLite transaction runs in a worker thread."""
+        bucket = SharedTokenBucket(rate=1.0, burst=1, path=str(tmp_path / "limits.db"), name="s2")
+
+        with patch("app.core.rate_limiter.asyncio.to_thread", wraps=asyncio.to_thread) as to_thread:
+            assert await bucket.try_acquire()
+
+        to_thread.assert_called_once_with(bucket._take)
+
+
+    @pytest.mark.asyncio
+    async def test_shared_takes_do_not_overlap(self, tmp_path):
+        """Concurrent acquire/try_acquire transactions on one connection are serialized."""
+        bucket = SharedTokenBucket(rate=0.01, burst=400, path=str(tmp_path / "limits.db"), name="s2")
+
+        def take_many():
+            return [bucket._take() for _ in range(50)]
+
+        taken = await asyncio.gather(*[asyncio.to_thread(take_many) for _ in range(8)])
+
+        assert [wait for waits in taken for wait in waits] == [0.0] * 400
+        assert not await bucket.try_acquire()
+
+class TestBackoff:
+    """Test Retry-After parsing and backoff delays."""
+
+    def test_parse_retry_after(self):
+        """Seconds and HTTP dates are both accepted."""
+        assert parse_retry_after("5") == 5.0
+        assert parse_retry_after(None) is None
+        assert parse_retry_after("soon") is None
+        assert parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT") == 0.0
+
+    def test_backoff_delay(self):
+        """Delays are jittered, capped, and never below Retry-After."""
+        for attempt in range(6):
+            assert 0 <= backoff_delay(attempt, 1.0, 8.0) <= 8.0
+
+        assert backoff_delay(0, 1.0, 8.0, retry_after=3.0) >= 3.0
+
+
+class TestRetryingRequests:
+    """Test retries in the shared client layer."""
+
+    @pytest.mark.asyncio
+    async def test_retries_429_honoring_retry_after(self):
+        """429 responses are retried after the server-requested delay."""
+        responses = [
+            httpx.Response(429, headers={"Retry-After": "2"}),
+            httpx.Response(200, json={"data": []}),
+        ]
+
+        registry = HTTPClientRegistry()
+        registry.rate_limiters = {}
+        registry._create_client = lambda name: httpx.AsyncClient(
+            transport=httpx.MockTransport(lambda request: responses.pop(0))
+        )
+
+        with patch("app.core.http_clients.asyncio.sleep", new_callable=AsyncMock) as mock_sleep:
+            response = await registry.request("semantic_scholar", "GET", "https://api.semanticscholar.org/x")
+
+        assert response.status_code == 200
+        assert mock_sleep.await_args.args[0] >= 2.0
+        await registry.aclose()
+
+    @pytest.mark.asyncio
+    async def test_retry_budget_is_enforced(self):
+        """After max_retries the last 429 response is returned."""
+        calls = []
+
+        def handler(request):
+            calls.append(request)
+            return httpx.Response(429)
+
+        registry = HTTPClientRegistry()
+        registry.rate_limiters = {}
+        registry._create_client = lambda name: httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        max_retries = registry.upstreams["semantic_scholar"]["retry"]["max_retries"]
+
+        with patch("app.core.http_clients.asyncio.sleep", new_callable=AsyncMock):
+            with patch("app.core.http_clients.backoff_delay", return_value=0.1):
+                response = await registry.request("semantic_scholar", "GET", "https://api.semanticscholar.org/x")
+
+        assert response.status_code == 429
+        assert len(calls) == max_retries + 1
+        await registry.aclose()
+
+    @pytest.mark.asyncio
+    async def test_upstreams_without_policy_are_not_retried(self):
+        """Only upstreams with a retry policy are retried."""
+        calls = []
+
+        def handler(request):
+            calls.append(request)
+            return httpx.Response(429)
+
+        registry = HTTPClientRegistry()
+        registry._create_client = lambda name: httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+        response = await registry.request("crossref", "GET", "https://api.crossref.org/works")
+
+        assert response.status_code == 429
+        assert len(calls) == 1
+        await registry.aclose()
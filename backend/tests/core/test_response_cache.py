@@ -0,0 +1,147 @@
+"""Unit tests for the upstream response cache."""
+import asyncio
+import time
+import httpx
+import pytest
+from app.core.http_clients import HTTPClientRegistry
+from app.core.response_cache import MemoryCacheBackend, ResponseCache, SQLiteCacheBackend
+
+
+def make_entry(content: bytes, stored_at: float = None):
+    return {
+        "status": 200,
+        "headers": {"content-type": "application/json"},
+        "content": content,
+        "stored_at": stored_at if stored_at is not None else time.time()
+    }
+
+
+def make_registry(handler, **kwargs):
+    registry = HTTPClientRegistry(response_cache=ResponseCache(MemoryCacheBackend(100, 1024 * 1024)), **kwargs)
+    registry.rate_limiters = {}
+    registry._create_client = lambda name: httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    return registry
+
+
+class TestCacheBackends:
+    """Test size-bounded cache backends."""
+
+    def test_memory_lru_eviction(self):
+        """The least recently used entry is evicted past max_entries."""
+        backend = MemoryCacheBackend(max_entries=2, max_bytes=1024)
+        backend.set("a", make_entry(b"1"))
+        backend.set("b", make_entry(b"2"))
+        backend.get("a")
+        backend.set("c", make_entry(b"3"))
+
+        assert backend.get("a") is not None
+        assert backend.get("b") is None
+        assert backend.get("c") is not None
+
+    def test_memory_byte_budget(self):
+        """Entries are evicted to stay under max_bytes."""
+        backend = MemoryCacheBackend(max_entries=100, max_bytes=10)
+        backend.set("a", make_entry(b"x" * 6))
+        backend.set("b", make_entry(b"y" * 6))
+        backend.set("huge", make_entry(b"z" * 20))
+
+        assert backend.get("a") is None
+        assert backend.get("b")["content"] == b"y" * 6
+        assert backend.get("huge") is None
+
+    def test_sqlite_roundtrip_and_eviction(self, tmp_path):
+        """The SQLite backend is shared across instances and size-bounded."""
+        path = str(tmp_path / "cache.db")
+        writer = SQLiteCacheBackend(path, max_bytes=10)
+        writer.set("a", make_entry(b"x" * 6))
+        writer.set("b", make_entry(b"y" * 6))
+
+        reader = SQLiteCacheBackend(path, max_bytes=10)
+        assert reader.get("a") is None
+        assert reader.get("b")["content"] == b"y" * 6
+        assert reader.get("b")["headers"] == {"content-type": "application/json"}
+
+        writer.close()
+        reader.close()
+
+
+class TestCachedRequests:
+    """Test caching in the shared client layer."""
+
+    @pytest.mark.asyncio
+    async def test_fresh_responses_are_served_from_cache(self):
+        """A second identical GET does not reach the upstream."""
+        calls = []
+
+        def handler(request):
+            calls.append(request)
+            return httpx.Response(200, json={"n": len(calls)})
+
+        registry = make_registry(handler)
+        url = "https://api.semanticscholar.org/graph/v1/paper/search"
+
+        first = await registry.request("semantic_scholar", "GET", url, params={"query": "gnn"})
+        second = await registry.request("semantic_scholar", "GET", url, params={"query": "gnn"})
+
+        assert len(calls) == 1
+        assert second.json() == first.json() == {"n": 1}
+        second.raise_for_status()
+        await registry.aclose()
+
+    @pytest.mark.asyncio
+    async def test_errors_and_bypass_are_not_cached(self):
+        """Only 200 responses are cached, and cache=False skips the cache."""
+        calls = []
+
+        def handler(request):
+            calls.append(request)
+            return httpx.Response(404 if len(calls) == 1 else 200, json={})
+
+        registry = make_registry(handler)
+        url = "https://api.crossref.org/works"
+
+        assert (await registry.request("crossref", "GET", url)).status_code == 404
+        assert (await registry.request("crossref", "GET", url)).status_code == 200
+        await registry.request("crossref", "GET", url)
+        await registry.request("crossref", "GET", url, cache=False)
+
+        assert len(calls) == 3
+        await registry.aclose()
+
+    @pytest.mark.asyncio
+    async def test_stale_entry_is_served_and_refreshed(self):
+        """Stale entries are returned at once while a refresh runs in the background."""
+        def handler(request):
+            return httpx.Response(200, text="<feed>new</feed>")
+
+        registry = make_registry(handler)
+        url = "https://export.arxiv.org/api/query"
+        key = repr(("arxiv", "GET", url, ()))
+        policy = registry.upstreams["arxiv"]["cache"]
+
+        stale = make_entry(b"<feed>old</feed>", stored_at=time.time() - policy["ttl"] - 1)
+        registry.response_cache.backend.set(key, stale)
+
+        response = await registry.request("arxiv", "GET", url)
+        assert response.text == "<feed>old</feed>"
+
+        await asyncio.gather(*registry._refreshing.values())
+        response = await registry.request("arxiv", "GET", url)
+        assert response.text == "<feed>new</feed>"
+        await registry.aclose()
+
+    @pytest.mark.asyncio
+    async def test_upstreams_without_policy_are_not_cached(self):
+        """Upstreams without a cache policy always hit the network."""
+        calls = []
+
+        def handler(request):
+            calls.append(request)
+            return httpx.Response(200, json={})
+
+        registry = make_registry(handler)
+        for _ in range(2):
+            await registry.request("winston", "GET", "https://api.gowinston.ai/v2/x")
+
+        assert len(calls) == 2
+        await registry.aclose()
@@ -0,0 +1,103 @@
+"""Unit tests for single-flight request coalescing."""
+import asyncio
+import httpx
+import pytest
+from app.core.http_clients import HTTPClientRegistry
+from app.core.metrics import metrics
+from app.core.single_flight import SingleFlight, request_key
+
+
+@pytest.fixture(autouse=True)
+def reset_metrics():
+    """Start every test with empty counters."""
+    metrics.reset()
+    yield
+    metrics.reset()
+
+
+class TestSingleFlight:
+    """Test call coalescing."""
+
+    def test_request_key_normalizes_params(self):
+        """Parameter order and whitespace do not change the key."""
+        a = request_key("arxiv", "get", "https://export.arxiv.org/api/query?start=0", {"q": "deep  learning "})
+        b = request_key("arxiv", "GET", "https://export.arxiv.org/api/query", {"q": "deep learning", "start": 0})
+        c = request_key("arxiv", "GET", "https://export.arxiv.org/api/query", {"q": "graphs", "start": 0})
+
+        assert a == b
+        assert a != c
+
+    @pytest.mark.asyncio
+    async def test_concurrent_calls_are_collapsed(self):
+        """Concurrent identical calls share one execution."""
+        flight = SingleFlight()
+        calls = 0
+
+        async def fetch():
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.01)
+            return "result"
+
+        results = await asyncio.gather(*[flight.do(("s2", "q"), fetch) for _ in range(5)])
+
+        assert results == ["result"] * 5
+        assert calls == 1
+        assert metrics.get("single_flight_calls", upstream="s2") == 5
+        assert metrics.get("single_flight_collapsed", upstream="s2") == 4
+        assert flight.inflight() == 0
+
+    @pytest.mark.asyncio
+    async def test_errors_are_shared(self):
+        """Every waiting caller sees the leader's error."""
+        flight = SingleFlight()
+
+        async def fail():
+            await asyncio.sleep(0.01)
+            raise ValueError("boom")
+
+        results = await asyncio.gather(
+            flight.do(("s2", "q"), fail),
+            flight.do(("s2", "q"), fail),
+            return_exceptions=True
+        )
+
+        assert all(isinstance(r, ValueError) for r in results)
+
+    @pytest.mark.asyncio
+    async def test_caller_cancellation_does_not_cancel_others(self):
+        """Cancelling one waiter leaves the shared call running."""
+        flight = SingleFlight()
+
+        async def fetch():
+            await asyncio.sleep(0.02)
+            return "ok"
+
+        first = asyncio.ensure_future(flight.do(("s2", "q"), fetch))
+        second = asyncio.ensure_future(flight.do(("s2", "q"), fetch))
+        await asyncio.sleep(0)
+        first.cancel()
+
+        assert await second == "ok"
+
+    @pytest.mark.asyncio
+    async def test_registry_coalesces_identical_gets(self):
+        """Identical concurrent GETs reach the upstream once."""
+        calls = []
+
+        async def handler(request):
+            calls.append(request)
+            await asyncio.sleep(0.01)
+            return httpx.Response(200, text="<feed/>")
+
+        registry = HTTPClientRegistry()
+        registry._create_client = lambda name: httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+        responses = await asyncio.gather(*[
+            registry.request("arxiv", "GET", "https://export.arxiv.org/api/query", params={"search_query": "all:gnn"})
+            for _ in range(3)
+        ])
+
+        assert len(calls) == 1
+        assert all(r.text == "<feed/>" for r in responses)
+        await registry.aclose()
@@ -0,0 +1,161 @@
+"""Unit tests for the paper analysis job queue."""
+import asyncio
+import pytest
+from unittest.mock import patch
+from app.core.exceptions import UpstreamUnavailableError
+from app.services.analysis_jobs import DONE, FAILED, QUEUED, RUNNING, AnalysisJobQueue, JobStore
+
+
+@pytest.fixture
+def store(tmp_path):
+    return JobStore(path=str(tmp_path / "jobs.db"))
+
+
+async def wait_for_status(queue, job_id, statuses, timeout=2.0):
+    """Poll a job until it reaches one of statuses."""
+    deadline = asyncio.get_running_loop().time() + timeout
+    while True:
+        job = await queue.get(job_id)
+        if job["status"] in statuses or asyncio.get_running_loop().time() > deadline:
+            return job
+        await asyncio.sleep(0.01)
+
+
+class TestAnalysisJobQueue:
+    """Test background paper analysis jobs."""
+
+    @pytest.mark.asyncio
+    async def test_submit_returns_immediately_and_runs_in_background(self, store):
+        """Submitting queues the job; a worker runs it to completion."""
+        release = asyncio.Event()
+        ran = []
+
+        async def run(job):
+            await release.wait()
+            ran.append(job["paper_id"])
+
+        queue = AnalysisJobQueue(run, store=store, workers=1, poll_seconds=0.05)
+        job = await queue.submit("p1", "u1")
+
+        assert job["status"] == QUEUED
+        assert (await wait_for_status(queue, job["id"], [RUNNING]))["status"] == RUNNING
+
+        release.set()
+        finished = await wait_for_status(queue, job["id"], [DONE])
+        await queue.stop()
+
+        assert finished["status"] == DONE
+        assert finished["attempts"] == 1
+        assert ran == ["p1"]
+
+    @pytest.mark.asyncio
+    async def test_duplicate_submit_reuses_pending_job(self, store):
+        """A paper that is already queued keeps its job."""
+        queue = AnalysisJobQueue(lambda job: asyncio.sleep(0), store=store)
+        queue._ensure_workers = lambda: setattr(queue, "_wakeup", asyncio.Event())
+
+        first = await queue.submit("p1", "u1")
+        second = await queue.submit("p1", "u1")
+
+        assert first["id"] == second["id"]
+
+    @pytest.mark.asyncio
+    async def test_failure_is_recorded(self, store):
+        """A failing job ends failed and the failure hook sees its error."""
+        failures = []
+
+        async def run(job):
+            raise ValueError("Invalid JSON response from Gemini")
+
+        queue = AnalysisJobQueue(run, on_failure=failures.append, store=store, workers=1, poll_seconds=0.05)
+        job = await queue.submit("p1", "u1")
+        finished = await wait_for_status(queue, job["id"], [FAILED])
+        await asyncio.sleep(0.05)
+        await queue.stop()
+
+        assert finished["error"] == "Invalid JSON response from Gemini"
+        assert failures[0]["paper_id"] == "p1"
+        assert failures[0]["error"] == "Invalid JSON response from Gemini"
+
+    @pytest.mark.asyncio
+    async def test_upstream_rejection_is_retried(self, store):
+        """Saturated providers requeue the job instead of failing it."""
+        calls = []
+
+        async def run(job):
+            calls.append(job["attempts"])
+            if len(calls) == 1:
+                raise UpstreamUnavailableError("openrouter", "openrouter is at capacity")
+
+        queue = AnalysisJobQueue(run, store=store, workers=1, poll_seconds=0.02)
+        with patch("app.services.analysis_jobs.backoff_delay", return_value=0.0):
+            job = await queue.submit("p1", "u1")
+            finished = await wait_for_status(queue, job["id"], [DONE])
+        await queue.stop()
+
+        assert finished["status"] == DONE
+        assert calls == [1, 2]
+
+    @pytest.mark.asyncio
+    async def test_interrupted_jobs_recover_after_restart(self, tmp_path):
+        """Jobs left running by a dead process are picked up again on start."""
+        path = str(tmp_path / "jobs.db")
+        crashed = JobStore(path=path)
+        job, _ = crashed.create("p1", "u1", "research")
+        crashed.claim()  # Process dies mid-analysis
+
+        ran = []
+
+        async def run(job):
+            ran.append(job["paper_id"])
+
+        queue = AnalysisJobQueue(run, store=JobStore(path=path), workers=1, stale_seconds=-1, poll_seconds=0.05)
+        await queue.start()
+        finished = await wait_for_status(queue, job["id"], [DONE])
+        await queue.stop()
+
+        assert ran == ["p1"]
+        assert finished["attempts"] == 2
+
+    def test_repeatedly_interrupted_job_fails(self, store):
+        """A job interrupted max_attempts times is failed rather than requeued."""
+        job, _ = store.create("p1", "u1", "research")
+        store.claim()
+
+        requeued, failed = store.recover(stale_seconds=-1, max_attempts=1)
+
+        assert requeued == 0
+        assert failed[0]["id"] == job["id"]
+        assert store.get(job["id"])["status"] == FAILED
+
+    @pytest.mark.asyncio
+    async def test_stop_requeues_running_job(self, store):
+        """Shutting down hands the running job back to the queue."""
+        started = asyncio.Event()
+
+        async def run(job):
+            started.set()
+            await asyncio.sleep(10)
+
+        queue = AnalysisJobQueue(run, store=store, workers=1)
+        job = await queue.submit("p1", "u1")
+        await asyncio.wait_for(started.wait(), timeout=1.0)
+        await queue.stop()
+
+        assert store.get(job["id"])["status"] == QUEUED
+        assert store.counts() == {QUEUED: 1}
+
+    def test_latest_job_per_paper(self, store):
+        """The paper list sees each paper's most recent job."""
+        first, _ = store.create("p1", "u1", "research")
+        store.claim()
+        store.finish(first["id"], error="Invalid JSON response from Gemini")
+        retry, _ = store.create("p1", "u1", "research")
+        other, _ = store.create("p2", "u1", "research")
+
+        latest = store.latest(["p1", "p2", "p3"])
+
+        assert latest["p1"]["id"] == retry["id"]
+        assert latest["p2"]["id"] == other["id"]
+        assert "p3" not in latest
+        assert store.latest([]) == {}
@@ -0,0 +1,91 @@
+"""Unit tests for the local citation store."""
+import pytest
+from app.services.citation_store import CitationStore, work_from_crossref
+
+
+@pytest.fixture
+def store(tmp_path):
+    """Create a citation store in a temporary directory."""
+    store = CitationStore(path=str(tmp_path / "citations.db"), max_mb=64)
+    yield store
+    store.close()
+
+
+def make_work(doi, title, abstract=None):
+    """Build a store record."""
+    return {"doi": doi, "title": title, "abstract": abstract, "authors": None, "year": 2024, "journal": None}
+
+
+class TestCitationStore:
+    """Test citation store methods."""
+
+    def test_work_from_crossref(self):
+        """Test CrossRef item normalization."""
+        item = {
+            "DOI": "10.1000/ABC",
+            "title": ["Deep Residual Learning"],
+            "author": [{"given": "Kaiming", "family": "He"}, {"given": "X", "family": ""}],
+            "published": {"date-parts": [[2016, 6]]},
+            "container-title": ["CVPR"],
+            "abstract": "<jats:p>Deeper neural networks are harder to train.</jats:p>"
+        }
+
+        work = work_from_crossref(item)
+
+        assert work["doi"] == "10.1000/abc"
+        assert work["title"] == "Deep Residual Learning"
+        assert work["authors"] == "Kaiming He"
+        assert work["year"] == 2016
+        assert work["journal"] == "CVPR"
+        assert work["abstract"] == "Deeper neural networks are harder to train."
+
+        assert work_from_crossref({"DOI": "10.1/x", "title": []}) is None
+
+    def test_add_and_search(self, store):
+        """Test full-text search over titles and abstracts."""
+        store.add_works([
+            make_work("10.1/a", "Transformers for machine translation", "Attention is all you need"),
+            make_work("10.1/b", "Protein folding with deep learning"),
+            make_work("10.1/c", "Graph neural networks", "Message passing for molecules"),
+        ])
+
+        results = store.search(["attention", "translation"], limit=10)
+
+        assert [r["doi"] for r in results] == ["10.1/a"]
+        assert results[0]["score"] > 0
+        assert store.search(["molecules"])[0]["doi"] == "10.1/c"
+        assert store.search(["!!!"]) == []
+
+    def test_search_match_all(self, store):
+        """match_all only returns works containing every term."""
+        store.add_works([
+            make_work("10.1/a", "Transformers for machine translation", "Attention is all you need"),
+            make_work("10.1/b", "Statistical machine translation"),
+        ])
+
+        assert len(store.search(["attention", "translation"])) == 2
+        assert [r["doi"] for r in store.search(["attention", "translation"], match_all=True)] == ["10.1/a"]
+
+    def test_upsert_keeps_existing_fields(self, store):
+        """Re-adding a work updates it without losing known metadata."""
+        store.add_works([make_work("10.1/a", "Old title", "Some abstract")])
+        store.add_works([make_work("10.1/a", "New title")])
+
+        results = store.search(["title"])
+
+        assert store.count() == 1
+        assert results[0]["title"] == "New title"
+        assert results[0]["abstract"] == "Some abstract"
+
+    def test_size_limit_evicts_least_recently_used(self, tmp_path):
+        """The store evicts old works to stay within its disk budget."""
+        store = CitationStore(path=str(tmp_path / "small.db"), max_mb=1)
+
+        for batch in range(10):
+            store.add_works([
+                make_work(f"10.1/{batch}-{i}", f"Paper {batch} {i}", "x" * 400)
+                for i in range(500)
+            ])
+
+        assert 0 < store.count() < 5000
+        store.close()
@@ -0,0 +1,138 @@
+"""Unit tests for precomputed journal translations."""
+import pytest
+from unittest.mock import patch
+from app.services.journal_translations_service import JournalTranslationsService, source_hash
+from app.services.translation_memory import TranslationMemory
+from app.services.translation_service import TranslationService
+
+
+CATALOG = [
+    {"id": "j1", "name": "Nature", "description": "Multidisciplinary science journal"},
+    {"id": "j2", "name": "Cell", "description": "Leading journal in life sciences"},
+]
+
+
+def fake_translate(source, target, text):
+    return text.upper()
+
+
+@pytest.fixture
+def translator():
+    service = TranslationService(translation_memory=TranslationMemory(path=""))
+    service.lang_map = {"es": "es", "fr": "fr", "en": "en"}
+    yield service
+    service.shutdown()
+
+
+@pytest.fixture
+def service(translator):
+    service = JournalTranslationsService(translation_service=translator, refresh_seconds=0)
+    service.saved = []
+    service._fetch_catalog = lambda: [dict(journal) for journal in CATALOG]
+    service._fetch_translations = lambda: []
+    service._save_translations = service.saved.extend
+    return service
+
+
+class TestJournalTranslationsService:
+    """Test catalog pre-translation and overlay."""
+
+    @pytest.mark.asyncio
+    async def test_refresh_translates_every_language(self, service):
+        """Every journal is materialized for every non-English language."""
+        with patch.object(TranslationService, "_google_translate", side_effect=fake_translate):
+            written = await service.refresh()
+
+        assert written == 4
+        assert {(row["journal_id"], row["language"]) for row in service.saved} == {
+            ("j1", "es"), ("j2", "es"), ("j1", "fr"), ("j2", "fr")
+        }
+        hashes = {journal["id"]: source_hash(journal) for journal in CATALOG}
+        assert all(row["source_hash"] == hashes[row["journal_id"]] for row in service.saved)
+
+    @pytest.mark.asyncio
+    async def test_refresh_only_retranslates_changed_rows(self, service):
+        """Unchanged journals are skipped; an edited description is refreshed."""
+        with patch.object(TranslationService, "_google_translate", side_effect=fake_translate):
+            await service.refresh()
+            assert await service.refresh() == 0
+
+            edited = [dict(CATALOG[0]), dict(CATALOG[1], description="Cell biology")]
+            service._fetch_catalog = lambda: edited
+            service.saved.clear()
+            assert await service.refresh() == 2
+
+        assert {row["journal_id"] for row in service.saved} == {"j2"}
+        assert service.saved[0]["description"] == "CELL BIOLOGY"
+
+    @pytest.mark.asyncio
+    async def test_failed_translations_are_not_stored(self, service):
+        """Rows that came back untranslated are retried on the next run."""
+        with patch.object(TranslationService, "_google_translate", side_effect=RuntimeError("down")):
+            assert await service.refresh() == 0
+
+        assert service.saved == []
+
+    @pytest.mark.asyncio
+    async def test_identity_translations_are_stored(self, service):
+        """Journals that translate to themselves are stored and served from the snapshot."""
+        def keep_nature(source, target, text):
+            translated = text.upper()
+            for field in ("name", "description"):
+                translated = translated.replace(CATALOG[0][field].upper(), CATALOG[0][field])
+            return translated
+
+        with patch.object(TranslationService, "_google_translate", side_effect=keep_nature):
+            assert await service.refresh() == 4
+            assert await service.refresh() == 0
+
+        journals = [dict(CATALOG[0])]
+        assert service.apply(journals, "es") == []
+        assert journals[0]["name"] == "Nature"
+        assert journals[0]["description"] == "Multidisciplinary science journal"
+
+    @pytest.mark.asyncio
+    async def test_translate_journals_uses_snapshot(self, service):
+        """Responses are served from the snapshot without calling the translator."""
+        with patch.object(TranslationService, "_google_translate", side_effect=fake_translate):
+            await service.refresh()
+
+        journals = [dict(journal, fit_score=80.0) for journal in CATALOG]
+        with patch.object(TranslationService, "_google_translate") as mock_translate:
+            await service.translate_journals(journals, "es")
+
+        mock_translate.assert_not_called()
+        assert journals[0]["name"] == "NATURE"
+        assert journals[1]["description"] == "LEADING JOURNAL IN LIFE SCIENCES"
+        assert journals[0]["fit_score"] == 80.0
+
+    @pytest.mark.asyncio
+    async def test_stale_or_unknown_journals_translated_on_the_fly(self, service):
+        """Journals edited or added since the last refresh fall back to live translation."""
+        with patch.object(TranslationService, "_google_translate", side_effect=fake_translate):
+            await service.refresh()
+
+        journals = [
+            dict(CATALOG[0]),
+            dict(CATALOG[1], description="Cell biology"),
+            {"id": "j3", "name": "Science", "description": None},
+        ]
+        with patch.object(TranslationService, "_google_translate", side_effect=fake_translate) as mock_translate:
+            await service.translate_journals(journals, "fr")
+
+        assert mock_translate.call_count == 1
+        assert [journal["name"] for journal in journals] == ["NATURE", "CELL", "SCIENCE"]
+        assert journals[1]["description"] == "CELL BIOLOGY"
+
+    @pytest.mark.asyncio
+    async def test_load_restores_stored_translations(self, service):
+        """Translations stored by another worker are picked up on load."""
+        service._fetch_translations = lambda: [{
+            "journal_id": "j1", "language": "es", "name": "Naturaleza",
+            "description": "Revista", "source_hash": source_hash(CATALOG[0]),
+        }]
+        await service.load()
+
+        journals = [dict(CATALOG[0])]
+        assert service.apply(journals, "es") == []
+        assert journals[0]["name"] == "Naturaleza"
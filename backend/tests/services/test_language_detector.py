@@ -0,0 +1,39 @@
+"""Unit tests for local language identification."""
+import pytest
+from app.services.language_detector import LanguageDetector
+
+
+@pytest.fixture
+def detector():
+    return LanguageDetector()
+
+
+class TestLanguageDetector:
+    """Test script and trigram based detection."""
+
+    @pytest.mark.parametrize("text,language", [
+        ("We introduce a benchmark for evaluating reasoning in large language models.", "en"),
+        ("federated learning with differential privacy", "en"),
+        ("Introducimos un punto de referencia para evaluar el razonamiento en modelos de lenguaje grandes.", "es"),
+        ("Nous introduisons un banc d'essai pour évaluer le raisonnement des grands modèles de langage.", "fr"),
+        ("Wir stellen einen Benchmark zur Bewertung des Denkvermögens großer Sprachmodelle vor.", "de"),
+        ("redes neurais para geração de moléculas", "pt"),
+        ("机器学习中的神经网络", "zh"),
+        ("機械学習におけるニューラルネットワーク", "ja"),
+        ("머신 러닝의 신경망", "ko"),
+        ("இயந்திர கற்றல்", "ta"),
+    ])
+    def test_detects_language(self, detector, text, language):
+        """Supported languages are identified from short academic text."""
+        assert detector.detect(text) == language
+
+    @pytest.mark.parametrize("text", ["Nature", "", "12345", "मशीन लर्निंग में तंत्रिका नेटवर्क"])
+    def test_undecided_for_short_or_ambiguous_text(self, detector, text):
+        """Short text, digits and scripts shared by several languages are left undecided."""
+        assert detector.detect(text) is None
+
+    def test_is_language(self, detector):
+        """Only confident matches count as already being in the target language."""
+        assert detector.is_language("graph neural networks for molecule generation", "en")
+        assert not detector.is_language("graph neural networks for molecule generation", "hi")
+        assert not detector.is_language("Cell", "en")
@@ -0,0 +1,357 @@
+"""Unit tests for paper analysis translations."""
+import asyncio
+import time
+import pytest
+from unittest.mock import MagicMock, patch
+from app.core.bulkhead import Bulkhead
+from app.core.config import settings
+from app.services.papers_service_v2 import EnhancedPapersService
+from app.services.translation_memory import TranslationMemory
+from app.services.translation_service import TranslationService, translation_service
+
+
+ANALYSIS = {
+    "title": "Attention is all you need",
+    "abstract": "We propose the Transformer.",
+    "year": 2017,
+    "results": {"key_findings": ["BLEU 28.4", "Faster training"], "tables": [{"rows": 3}]},
+    "glossary": {"attention/self": "Relating positions of a sequence"},
+}
+
+
+class FakeTable:
+    """Chainable stand-in for a Supabase table query that records calls."""
+
+    def __init__(self, rows):
+        self.rows = rows
+        self.calls = []
+
+    def __getattr__(self, name):
+        def method(*args, **kwargs):
+            self.calls.append((name, args, kwargs))
+            return self
+        return method
+
+    def execute(self):
+        return MagicMock(data=self.rows)
+
+
+@pytest.fixture
+def tables():
+    return {
+        "uploads": FakeTable([{
+            "id": "p1", "processed": True, "analysis": ANALYSIS,
+            "paper_title": "Attention", "year": 2017, "authors": [], "venue": "NeurIPS"
+        }]),
+        "paper_translations": FakeTable([]),
+    }
+
+
+@pytest.fixture
+def service(tables):
+    with patch("app.services.papers_service_v2.supabase_admin") as admin, \
+            patch.object(translation_service, "translation_memory", TranslationMemory(path="")):
+        admin.table.side_effect = lambda name: tables[name]
+        yield EnhancedPapersService()
+
+
+class TestPaperTranslations:
+    """Test per-language translation storage."""
+
+    @pytest.mark.asyncio
+    async def test_reads_only_requested_language(self, service, tables):
+        """A cached translation is read by (paper_id, language) without the full uploads row."""
+        tables["paper_translations"].rows = [{"overlay": {"/title": "Atención"}, "analysis": None}]
+
+        result = await service.get_paper_analysis("p1", "es")
+
+        assert result["analysis"]["title"] == "Atención"
+        assert result["analysis"]["results"] is ANALYSIS["results"]
+        assert ANALYSIS["title"] == "Attention is all you need"
+        assert result["from_cache"] is True
+        select = next(call for call in tables["uploads"].calls if call[0] == "select")
+        assert "*" not in select[1][0] and "translation_cache" not in select[1][0]
+        filters = [call[1] for call in tables["paper_translations"].calls if call[0] == "eq"]
+        assert filters == [("paper_id", "p1"), ("language", "es")]
+
+    @pytest.mark.asyncio
+    async def test_new_language_inserts_one_row(self, service, tables):
+        """A new translation is written as a single row and uploads is not rewritten."""
+        with patch.object(TranslationService, "_google_translate", side_effect=lambda s, t, text: text.upper()):
+            result = await service.get_paper_analysis("p1", "fr")
+
+        assert result["analysis"]["abstract"] == "WE PROPOSE THE TRANSFORMER."
+        assert result["analysis"]["year"] == 2017
+
+        assert result["analysis"]["results"]["key_findings"] == ["BLEU 28.4", "FASTER TRAINING"]
+        assert result["analysis"]["glossary"]["attention/self"] == "RELATING POSITIONS OF A SEQUENCE"
+        assert ANALYSIS["results"]["key_findings"][1] == "Faster training"
+
+        upsert = next(call for call in tables["paper_translations"].calls if call[0] == "upsert")
+        assert upsert[1][0]["overlay"] == {
+            "/title": "ATTENTION IS ALL YOU NEED",
+            "/abstract": "WE PROPOSE THE TRANSFORMER.",
+            "/glossary/attention~1self": "RELATING POSITIONS OF A SEQUENCE",
+            "/results/key_findings/1": "FASTER TRAINING",
+        }
+        assert upsert[1][0]["language"] == "fr"
+        assert upsert[1][0]["paper_id"] == "p1"
+        assert upsert[2] == {"on_conflict": "paper_id,language", "ignore_duplicates": True}
+        assert not any(call[0] == "update" for call in tables["uploads"].calls)
+
+    @pytest.mark.asyncio
+    async def test_partial_translation_is_not_cached(self, service, tables):
+        """Segments left in English by a failing provider are served but not stored."""
+        def translate(source, target, text):
+            if "Transformer" in text:
+                raise RuntimeError("rate limited")
+            return text.upper()
+
+        with patch.object(TranslationService, "_google_translate", side_effect=translate), \
+                patch.object(translation_service, "chunk_chars", 20):
+            result = await service.get_paper_analysis("p1", "fr")
+
+        assert result["analysis"]["abstract"] == "We propose the Transformer."
+        assert result["analysis"]["title"] == "ATTENTION IS ALL YOU NEED"
+        assert result["complete"] is False
+        assert not any(call[0] == "upsert" for call in tables["paper_translations"].calls)
+
+    @pytest.mark.asyncio
+    async def test_partial_prefetch_fails_without_caching(self, service, tables):
+        """A prefetch that leaves segments in English is reported failed and stores nothing."""
+        with patch.object(TranslationService, "_google_translate", side_effect=RuntimeError("down")):
+            with pytest.raises(Exception, match="could not be translated"):
+                await service._prefetch_translation("p1", "fr")
+
+        assert not any(call[0] == "upsert" for call in tables["paper_translations"].calls)
+
+    @pytest.mark.asyncio
+    async def test_legacy_full_translation_rows(self, service, tables):
+        """Rows written before overlays hold a full analysis copy and are served as is."""
+        tables["paper_translations"].rows = [{"overlay": None, "analysis": {"title": "Titre"}}]
+
+        result = await service.get_paper_analysis("p1", "fr")
+
+        assert result["analysis"] == {"title": "Titre"}
+
+
+class TestStreamPaperAnalysis:
+    """Test progressive NDJSON translation events."""
+
+    @pytest.mark.asyncio
+    async def test_streams_header_then_sections_as_completed(self, service, tables):
+        """Header comes first, fast sections overtake slow ones, the overlay is cached at the end."""
+        analysis = {
+            "title": "Title",
+            "tldr": "Short",
+            "year": 2017,
+            "abstract": "slow abstract",
+            "conclusion": "Done",
+        }
+
+        def translate(source, target, text):
+            if "slow" in text:
+                time.sleep(0.2)
+            return text.upper()
+
+        paper = dict(tables["uploads"].rows[0], analysis=analysis)
+        with patch.object(TranslationService, "_google_translate", side_effect=translate), \
+                patch.object(translation_service, "chunk_chars", 20):
+            events = [event async for event in service.stream_paper_analysis(paper, "de")]
+
+        assert events[0]["type"] == "header"
+        assert events[0]["analysis"] == {"title": "TITLE", "tldr": "SHORT"}
+        sections = [(event["section"], event["content"]) for event in events if event["type"] == "section"]
+        assert sections == [("year", 2017), ("conclusion", "DONE"), ("abstract", "SLOW ABSTRACT")]
+        assert events[-1] == {"type": "done", "language": "de", "from_cache": False, "complete": True}
+
+        upsert = next(call for call in tables["paper_translations"].calls if call[0] == "upsert")
+        assert upsert[1][0]["overlay"] == {
+            "/title": "TITLE", "/tldr": "SHORT", "/abstract": "SLOW ABSTRACT", "/conclusion": "DONE"
+        }
+
+    @pytest.mark.asyncio
+    async def test_partial_stream_is_not_cached(self, service, tables):
+        """A stream with untranslated sections ends incomplete and stores nothing."""
+        def translate(source, target, text):
+            if "Transformer" in text:
+                raise RuntimeError("rate limited")
+            return text.upper()
+
+        with patch.object(TranslationService, "_google_translate", side_effect=translate):
+            events = [event async for event in service.stream_paper_analysis(tables["uploads"].rows[0], "de")]
+
+        assert events[-1] == {"type": "done", "language": "de", "from_cache": False, "complete": False}
+        assert not any(call[0] == "upsert" for call in tables["paper_translations"].calls)
+
+    @pytest.mark.asyncio
+    async def test_small_sections_share_a_request(self, service, tables):
+        """Sections that fit in one chunk are translated in a single upstream call."""
+        keys = ["abstract", "introduction", "research_question", "discussion", "conclusion", "plain_summary"]
+        analysis = {"title": "Attention is all you need", **{key: f"The {key} of the paper" for key in keys}}
+
+        paper = dict(tables["uploads"].rows[0], analysis=analysis)
+        with patch.object(
+            TranslationService, "_google_translate", side_effect=lambda s, t, text: text.upper()
+        ) as mock_translate:
+            events = [event async for event in service.stream_paper_analysis(paper, "de")]
+
+        assert mock_translate.call_count == 2  # Header, then every other section together
+        sections = {event["section"]: event["content"] for event in events if event["type"] == "section"}
+        assert sections == {key: f"THE {key.upper()} OF THE PAPER" for key in keys}
+
+    @pytest.mark.asyncio
+    async def test_cached_translation_streams_immediately(self, service, tables):
+        """A cached language is streamed from the overlay without translating."""
+        tables["paper_translations"].rows = [{"overlay": {"/title": "Titel"}, "analysis": None}]
+
+        with patch.object(TranslationService, "_google_translate") as mock_translate:
+            events = [event async for event in service.stream_paper_analysis(tables["uploads"].rows[0], "de")]
+
+        mock_translate.assert_not_called()
+        assert events[0]["analysis"]["title"] == "Titel"
+        assert events[-1]["from_cache"] is True
+        assert {event["section"] for event in events if event["type"] == "section"} == {
+            "abstract", "year", "results", "glossary"
+        }
+
+
+class TestBatchProcessing:
+    """Test concurrent batch processing."""
+
+    @pytest.fixture
+    def pipeline(self, service):
+        """Fake download/analysis steps that log their start and end."""
+        log = []
+        running = {"now": 0, "max": 0}
+        durations = {}
+
+        async def download(paper_id, user_id):
+            log.append(("download", paper_id))
+            await asyncio.sleep(0.05)
+            return b"%PDF"
+
+        async def process(paper_id, pdf_bytes, paper_type="research"):
+            running["now"] += 1
+            running["max"] = max(running["max"], running["now"])
+            try:
+                log.append(("analyze", paper_id))
+                await asyncio.sleep(durations.get(paper_id, 0.1))
+                if paper_id == "broken":
+                    raise Exception("Paper processing failed: invalid PDF")
+                log.append(("analyzed", paper_id))
+                return {"success": True, "paper_id": paper_id}
+            finally:
+                running["now"] -= 1
+
+        service.get_paper_pdf = download
+        service.process_paper = process
+        service._mark_failed = MagicMock()
+        return log, running, durations
+
+    @pytest.mark.asyncio
+    async def test_concurrency_is_bounded_and_results_stream_as_completed(self, service, pipeline):
+        """At most BATCH_PROCESS_CONCURRENCY analyses run at once; fast papers come back first."""
+        log, running, durations = pipeline
+        durations.update({"p1": 0.3, "p2": 0.05, "p3": 0.05, "p4": 0.05})
+
+        with patch.object(settings, "BATCH_PROCESS_CONCURRENCY", 2):
+            results = [r["paper_id"] async for r in service.stream_batch_process(["p1", "p2", "p3", "p4"], "u1")]
+
+        assert running["max"] == 2
+        assert results[-1] == "p1"
+        assert sorted(results) == ["p1", "p2", "p3", "p4"]
+
+    def test_concurrency_capped_by_openrouter_budget(self, service):
+        """A configured concurrency above the OpenRouter slots left by job workers is capped."""
+        with patch.object(settings, "BATCH_PROCESS_CONCURRENCY", 50), \
+                patch.object(settings, "ANALYSIS_WORKERS", 2), \
+                patch("app.services.papers_service_v2.http_clients") as registry:
+            registry.bulkhead.return_value.max_concurrent = 4
+            assert service.batch_concurrency() == 2
+
+            registry.bulkhead.return_value.max_concurrent = 2
+            assert service.batch_concurrency() == 1
+
+    @pytest.mark.asyncio
+    async def test_downloads_overlap_analysis(self, service, pipeline):
+        """The next paper is downloaded while the current one is analyzed."""
+        log, _, _ = pipeline
+
+        with patch.object(settings, "BATCH_PROCESS_CONCURRENCY", 1):
+            await service.batch_process_papers(["p1", "p2"], "u1")
+
+        assert log.index(("download", "p2")) < log.index(("analyzed", "p1"))
+
+    @pytest.mark.asyncio
+    async def test_failures_and_timeouts_do_not_stall_the_batch(self, service, pipeline):
+        """A failing and a hanging paper are reported while the others complete."""
+        _, _, durations = pipeline
+        durations["hung"] = 10
+
+        with patch.object(settings, "BATCH_PROCESS_CONCURRENCY", 2), \
+                patch.object(settings, "BATCH_PAPER_TIMEOUT", 0.3):
+            started = time.monotonic()
+            results = await service.batch_process_papers(["hung", "broken", "p1", "p2"], "u1")
+            elapsed = time.monotonic() - started
+
+        assert [r["paper_id"] for r in results] == ["hung", "broken", "p1", "p2"]
+        assert [r["success"] for r in results] == [False, False, True, True]
+        assert "Timed out" in results[0]["error"]
+        assert "invalid PDF" in results[1]["error"]
+        # process_paper records its own failures; only the timeout is recorded here
+        service._mark_failed.assert_called_once_with("hung", results[0]["error"])
+        assert elapsed < 1.0
+
+    @pytest.fixture
+    def busy_openrouter(self, service):
+        """OpenRouter bulkhead with its only slot held by other work (e.g. an analysis job)."""
+        bulkhead = Bulkhead("openrouter", 1, 0.05)
+
+        async def process(paper_id, pdf_bytes, paper_type="research"):
+            async with bulkhead:
+                return {"success": True, "paper_id": paper_id}
+
+        async def download(paper_id, user_id):
+            return b"%PDF"
+
+        service.get_paper_pdf = download
+        service.process_paper = process
+        service._mark_failed = MagicMock()
+        with patch("app.services.papers_service_v2.backoff_delay", return_value=0.1):
+            yield bulkhead
+
+    @pytest.mark.asyncio
+    async def test_saturated_openrouter_is_retried(self, service, busy_openrouter):
+        """A paper rejected by a busy bulkhead is retried once the slot frees up."""
+        async def hold():
+            async with busy_openrouter:
+                await asyncio.sleep(0.15)
+
+        holder = asyncio.create_task(hold())
+        await asyncio.sleep(0)
+        results = await service.batch_process_papers(["p1"], "u1")
+        await holder
+
+        assert results == [{"success": True, "paper_id": "p1"}]
+        service._mark_failed.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_saturated_openrouter_failure_is_recorded(self, service, busy_openrouter):
+        """A paper that never gets a slot is failed with the reason stored on the paper."""
+        release = asyncio.Event()
+
+        async def hold():
+            async with busy_openrouter:
+                await release.wait()
+
+        holder = asyncio.create_task(hold())
+        await asyncio.sleep(0)
+        with patch.object(settings, "BATCH_PAPER_TIMEOUT", 0.3):
+            results = await service.batch_process_papers(["p1"], "u1")
+        release.set()
+        await holder
+
+        assert results[0]["success"] is False
+        assert "openrouter is at capacity" in results[0]["error"]
+        service._mark_failed.assert_called_once_with("p1", results[0]["error"])
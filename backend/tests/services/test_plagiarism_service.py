@@ -0,0 +1,164 @@
+"""Unit tests for plagiarism service."""
+import pytest
+from unittest.mock import AsyncMock, patch
+from app.services.citation_store import CitationStore
+from app.services.plagiarism_service import PlagiarismService
+
+
+@pytest.fixture
+def plagiarism_service():
+    """Create plagiarism service instance."""
+    return PlagiarismService()
+
+
+@pytest.fixture
+def citation_candidates():
+    """Citation candidates as built from CrossRef items."""
+    return [
+        {
+            "citation": {"doi": "10.1/a", "title": "Unrelated Paper", "relevance": 0.0},
+            "text": "Unrelated Paper.",
+            "score": 30.0
+        },
+        {
+            "citation": {"doi": "10.1/b", "title": "Best Match", "relevance": 0.0},
+            "text": "Best Match.",
+            "score": 10.0
+        },
+        {
+            "citation": {"doi": "10.1/c", "title": "Partial Match", "relevance": 0.0},
+            "text": "Partial Match.",
+            "score": 20.0
+        }
+    ]
+
+
+class TestCitationRanking:
+    """Test embedding-based citation relevance."""
+
+    def test_similarity_matrix(self, plagiarism_service):
+        """Test batched cosine similarity."""
+        matrix = plagiarism_service._similarity_matrix(
+            [[1.0, 0.0]],
+            [[1.0, 0.0], [0.0, 1.0], [0.0, 0.0]]
+        )
+
+        assert matrix.shape == (1, 3)
+        assert matrix[0][0] == pytest.approx(1.0)
+        assert matrix[0][1] == pytest.approx(0.0)
+        assert matrix[0][2] == pytest.approx(0.0)
+
+    @pytest.mark.asyncio
+    async def test_rank_citations_by_similarity(self, plagiarism_service, citation_candidates):
+        """Candidates are sorted by similarity, cut off and truncated to the limit."""
+        embeddings = [
+            [1.0, 0.0],   # claim
+            [0.0, 1.0],   # unrelated
+            [1.0, 0.0],   # best match
+            [1.0, 1.0],   # partial match
+        ]
+
+        with patch.object(plagiarism_service, '_generate_embeddings', AsyncMock(return_value=embeddings)) as mock_embed:
+            results = await plagiarism_service._rank_citations(
+                "claim", citation_candidates, limit=5, min_relevance=0.5
+            )
+
+        # One batched call for the claim and every candidate
+        mock_embed.assert_awaited_once()
+        assert len(mock_embed.await_args.args[0]) == 4
+
+        assert [c["doi"] for c in results] == ["10.1/b", "10.1/c"]
+        assert results[0]["relevance"] == pytest.approx(1.0)
+        assert results[1]["relevance"] == pytest.approx(0.7071, abs=0.001)
+
+    @pytest.mark.asyncio
+    async def test_rank_citations_top_k(self, plagiarism_service, citation_candidates):
+        """Only the top-k candidates are returned."""
+        embeddings = [[1.0, 0.0], [0.0, 1.0], [1.0, 0.0], [1.0, 1.0]]
+
+        with patch.object(plagiarism_service, '_generate_embeddings', AsyncMock(return_value=embeddings)):
+            results = await plagiarism_service._rank_citations(
+                "claim", citation_candidates, limit=1, min_relevance=0.0
+            )
+
+        assert [c["doi"] for c in results] == ["10.1/b"]
+
+    @pytest.mark.asyncio
+    async def test_rank_citations_without_embeddings(self, plagiarism_service, citation_candidates):
+        """Falls back to normalized CrossRef scores when embeddings fail."""
+        with patch.object(plagiarism_service, '_generate_embeddings', AsyncMock(return_value=[])):
+            results = await plagiarism_service._rank_citations(
+                "claim", citation_candidates, limit=10, min_relevance=0.5
+            )
+
+        assert [c["doi"] for c in results] == ["10.1/a", "10.1/c"]
+        assert results[0]["relevance"] == pytest.approx(1.0)
+        assert all(0 <= c["relevance"] <= 1 for c in results)
+
+    @pytest.mark.asyncio
+    async def test_rank_citations_normalizes_each_source(self, plagiarism_service):
+        """Store BM25 scores and CrossRef scores are normalized separately."""
+        candidates = [
+            {"citation": {"doi": "10.1/s", "relevance": 0.0}, "text": "S.", "score": 2.0, "source": "store"},
+            {"citation": {"doi": "10.1/c", "relevance": 0.0}, "text": "C.", "score": 80.0, "source": "crossref"},
+            {"citation": {"doi": "10.1/d", "relevance": 0.0}, "text": "D.", "score": 40.0, "source": "crossref"},
+        ]
+
+        with patch.object(plagiarism_service, '_generate_embeddings', AsyncMock(return_value=[])):
+            results = await plagiarism_service._rank_citations("claim", candidates, limit=10, min_relevance=0.0)
+
+        relevance = {c["doi"]: c["relevance"] for c in results}
+        assert relevance == {"10.1/s": 1.0, "10.1/c": 1.0, "10.1/d": 0.5}
+
+
+class TestCitationSuggestions:
+    """Test when the local store is enough and when CrossRef is called."""
+
+    @pytest.fixture
+    def store(self, tmp_path):
+        """Patch in a citation store filled with works that match only some keywords."""
+        store = CitationStore(path=str(tmp_path / "citations.db"), max_mb=64)
+        store.add_works([
+            {"doi": f"10.1/{i}", "title": f"Graphene study {i}", "abstract": None}
+            for i in range(30)
+        ])
+        with patch("app.services.plagiarism_service.citation_store", store):
+            yield store
+        store.close()
+
+    @pytest.mark.asyncio
+    async def test_weak_store_matches_do_not_skip_crossref(self, plagiarism_service, store):
+        """Plenty of partial keyword matches in the store still calls CrossRef."""
+        crossref = AsyncMock(return_value=[{"doi": "10.2/x", "title": "Graphene superconductivity", "score": 50.0}])
+
+        with patch.object(plagiarism_service, '_extract_keywords', return_value=["graphene", "superconductivity"]), \
+             patch.object(plagiarism_service, '_search_crossref', crossref), \
+             patch.object(plagiarism_service, '_generate_embeddings', AsyncMock(return_value=[])):
+            results = await plagiarism_service._get_citation_suggestions("text", limit=10, min_relevance=0.0)
+
+        crossref.assert_awaited_once()
+        assert results[0]["doi"] == "10.2/x"
+        assert store.count() == 31
+
+    @pytest.mark.asyncio
+    async def test_strong_store_matches_skip_crossref(self, plagiarism_service, store):
+        """Enough works matching every keyword are answered from the store."""
+        crossref = AsyncMock(return_value=[])
+
+        with patch.object(plagiarism_service, '_extract_keywords', return_value=["graphene", "study"]), \
+             patch.object(plagiarism_service, '_search_crossref', crossref), \
+             patch.object(plagiarism_service, '_generate_embeddings', AsyncMock(return_value=[])):
+            results = await plagiarism_service._get_citation_suggestions("text", limit=10, min_relevance=0.0)
+
+        crossref.assert_not_awaited()
+        assert len(results) == 10
+
+    @pytest.mark.asyncio
+    async def test_partial_matches_used_when_crossref_is_empty(self, plagiarism_service, store):
+        """Partial store matches are still suggested if CrossRef has nothing."""
+        with patch.object(plagiarism_service, '_extract_keywords', return_value=["graphene", "superconductivity"]), \
+             patch.object(plagiarism_service, '_search_crossref', AsyncMock(return_value=[])), \
+             patch.object(plagiarism_service, '_generate_embeddings', AsyncMock(return_value=[])):
+            results = await plagiarism_service._get_citation_suggestions("text", limit=10, min_relevance=0.0)
+
+        assert len(results) == 10
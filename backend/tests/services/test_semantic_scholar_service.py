@@ -1,14 +1,25 @@
 """Unit tests for Semantic Scholar service."""
+import asyncio
 import pytest
+from contextlib import aclosing
 from unittest.mock import AsyncMock, MagicMock, patch
 from datetime import datetime
+from app.core.circuit_breaker import CircuitOpenError
 from app.services.semantic_scholar_service import SemanticScholarService
 
 
 @pytest.fixture
-def s2_service():
+def http_clients():
+    """Mock upstream HTTP client registry."""
+    registry = MagicMock()
+    registry.request = AsyncMock()
+    return registry
+
+
+@pytest.fixture
+def s2_service(http_clients):
     """Create Semantic Scholar service instance."""
-    return SemanticScholarService()
+    return SemanticScholarService(http_clients=http_clients)
 
 
 @pytest.fixture
@@ -74,59 +85,169 @@ class TestSemanticScholarService:
         assert "machine" in keywords or "learning" in keywords
 
     @pytest.mark.asyncio
-    async def test_search_papers_bulk(self, s2_service, mock_papers):
+    async def test_search_papers_bulk(self, s2_service, http_clients, mock_papers):
         """Test bulk paper search."""
-        with patch('httpx.AsyncClient') as mock_client:
-            # Mock the HTTP response
-            mock_response = MagicMock()
-            mock_response.status_code = 200
-            mock_response.json.return_value = {"data": mock_papers, "token": None}
+        # Mock the HTTP response
+        mock_response = MagicMock()
+        mock_response.status_code = 200
+        mock_response.json.return_value = {"data": mock_papers, "token": None}
 
-            mock_client.return_value.__aenter__.return_value.get = AsyncMock(return_value=mock_response)
+        http_clients.request.return_value = mock_response
 
-            results = await s2_service.search_papers_bulk(query="deep learning", limit=10)
+        results = await s2_service.search_papers_bulk(query="deep learning", limit=10)
 
-            assert len(results) == 2
-            assert results[0]["title"] == "Test Paper on Deep Learning"
+        assert len(results) == 2
+        assert results[0]["title"] == "Test Paper on Deep Learning"
+        assert http_clients.request.await_args.args[0] == "semantic_scholar"
 
     @pytest.mark.asyncio
-    async def test_get_trending_topics(self, s2_service, mock_papers):
+    async def test_iter_papers_bulk_follows_tokens(self, s2_service, http_clients, mock_papers):
+        """Pages are yielded in order, following continuation tokens up to the limit."""
+        pages = [
+            {"data": mock_papers, "token": "t1"},
+            {"data": mock_papers, "token": "t2"},
+            {"data": mock_papers, "token": None},
+        ]
+
+        def respond(*args, **kwargs):
+            response = MagicMock()
+            response.status_code = 200
+            response.json.return_value = pages.pop(0)
+            return response
+
+        http_clients.request.side_effect = respond
+
+        results = [page async for page in s2_service.iter_papers_bulk(query="deep learning", limit=3)]
+
+        assert [len(page) for page in results] == [2, 1]
+        assert http_clients.request.await_count == 2
+        assert http_clients.request.await_args.kwargs["params"]["token"] == "t1"
+
+    @pytest.mark.asyncio
+    async def test_iter_papers_bulk_early_stop(self, s2_service, http_clients, mock_papers):
+        """Stopping early cancels the prefetched page."""
+        first = MagicMock()
+        first.status_code = 200
+        first.json.return_value = {"data": mock_papers, "token": "t1"}
+        next_page_started = asyncio.Event()
+
+        async def respond(*args, **kwargs):
+            if "token" not in kwargs["params"]:
+                return first
+            next_page_started.set()
+            await asyncio.sleep(10)
+
+        http_clients.request.side_effect = respond
+
+        pages = s2_service.iter_papers_bulk(query="deep learning")
+        async with aclosing(pages):
+            async for page in pages:
+                await next_page_started.wait()  # Next page is fetched while this one is processed
+                break
+
+        assert http_clients.request.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_get_trending_topics(self, s2_service, http_clients, mock_papers):
         """Test trending topics retrieval."""
-        with patch('httpx.AsyncClient') as mock_client:
-            # Mock the HTTP response
-            mock_response = MagicMock()
-            mock_response.status_code = 200
-            mock_response.json.return_value = {"data": mock_papers}
+        # Mock the HTTP response
+        mock_response = MagicMock()
+        mock_response.status_code = 200
+        mock_response.json.return_value = {"data": mock_papers}
 
-            mock_client.return_value.__aenter__.return_value.get = AsyncMock(return_value=mock_response)
+        http_clients.request.return_value = mock_response
 
-            results = await s2_service.get_trending_topics(field="deep learning", limit=5)
+        results = await s2_service.get_trending_topics(field="deep learning", limit=5)
 
-            assert len(results) > 0
-            assert "impact_score" in results[0]
-            assert "citation_velocity" in results[0]
+        assert len(results) > 0
+        assert "impact_score" in results[0]
+        assert "citation_velocity" in results[0]
 
     @pytest.mark.asyncio
-    async def test_detect_plagiarism_hybrid(self, s2_service):
+    async def test_detect_plagiarism_hybrid(self, s2_service, http_clients):
         """Test plagiarism detection."""
         test_text = "Deep learning is a subset of machine learning that uses neural networks."
 
         # Mock both embedding generation and the S2 search
         with patch.object(s2_service, '_generate_embeddings', return_value=[[0.1, 0.2, 0.3]]):
-            with patch('httpx.AsyncClient') as mock_client:
-                # Mock empty S2 search response
-                mock_response = MagicMock()
-                mock_response.status_code = 200
-                mock_response.json.return_value = {"data": []}
+            # Mock empty S2 search response
+            mock_response = MagicMock()
+            mock_response.status_code = 200
+            mock_response.json.return_value = {"data": []}
+
+            http_clients.request.return_value = mock_response
+
+            result = await s2_service.detect_plagiarism_hybrid(test_text, check_online=True)
+
+            assert "originality_score" in result
+            assert 0 <= result["originality_score"] <= 100
+            assert "flagged_sections" in result
+            assert "processing_time_seconds" in result
+
+    @pytest.mark.asyncio
+    async def test_detect_plagiarism_stops_paging_once_enough_is_flagged(self, s2_service, http_clients):
+        """Pages are scored as they arrive and no page is requested after the early stop."""
+        test_text = "Deep learning is a subset of machine learning that uses neural networks."
+        page = [
+            {"paperId": f"p{i}", "title": f"Paper {i}", "abstract": "Deep learning with neural networks."}
+            for i in range(10)
+        ]
+        tokens = []
+
+        def respond(*args, **kwargs):
+            tokens.append(kwargs["params"].get("token"))
+            response = MagicMock()
+            response.status_code = 200
+            response.json.return_value = {"data": page, "token": f"t{len(tokens)}"}
+            return response
+
+        http_clients.request.side_effect = respond
 
-                mock_client.return_value.__aenter__.return_value.get = AsyncMock(return_value=mock_response)
+        async def embed(texts):
+            return [[1.0, 0.0] for _ in texts]
 
-                result = await s2_service.detect_plagiarism_hybrid(test_text, check_online=True)
+        with patch.object(s2_service, "_generate_embeddings", side_effect=embed):
+            result = await s2_service.detect_plagiarism_hybrid(test_text, check_online=True)
 
-                assert "originality_score" in result
-                assert 0 <= result["originality_score"] <= 100
-                assert "flagged_sections" in result
-                assert "processing_time_seconds" in result
+        assert len(result["flagged_sections"]) == 10
+        assert tokens == [None]
+        assert http_clients.request.await_args.kwargs["params"]["limit"] == 20
+
+    @pytest.mark.asyncio
+    async def test_detect_plagiarism_clean_text_fetches_one_page(self, s2_service, http_clients):
+        """A page that flags nothing ends the search instead of paging through every candidate."""
+        test_text = "Deep learning is a subset of machine learning that uses neural networks."
+        page = [{"paperId": f"p{i}", "title": f"Paper {i}", "abstract": "Soil chemistry."} for i in range(20)]
+        tokens = []
+
+        def respond(*args, **kwargs):
+            tokens.append(kwargs["params"].get("token"))
+            response = MagicMock()
+            response.status_code = 200
+            response.json.return_value = {"data": page, "token": f"t{len(tokens)}"}
+            return response
+
+        http_clients.request.side_effect = respond
+
+        async def embed(texts):
+            return [[1.0, 0.0] if "learning" in t else [0.0, 1.0] for t in texts]
+
+        with patch.object(s2_service, "_generate_embeddings", side_effect=embed) as mock_embed:
+            result = await s2_service.detect_plagiarism_hybrid(test_text, check_online=True)
+
+        assert result["flagged_sections"] == []
+        assert tokens == [None]
+        assert mock_embed.call_count == 2  # The text's chunks, then one page of abstracts
+
+    @pytest.mark.asyncio
+    async def test_unavailable_upstream_is_not_swallowed(self, s2_service, http_clients):
+        """Open circuits propagate (503) instead of degrading to empty results."""
+        http_clients.request.side_effect = CircuitOpenError("huggingface", "huggingface circuit is open")
+
+        with pytest.raises(CircuitOpenError):
+            await s2_service._generate_embeddings(["text"])
+        with pytest.raises(CircuitOpenError):
+            await s2_service.search_papers_bulk("deep learning")
 
     @pytest.mark.asyncio
     async def test_recommend_journals_hybrid(self, s2_service):
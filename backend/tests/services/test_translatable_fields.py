@@ -0,0 +1,90 @@
+"""Unit tests for schema-driven translatable field extraction."""
+from app.services.translatable_fields import (
+    ANY_KEY,
+    PAPER_ANALYSIS_FIELDS,
+    PLAGIARISM_FIELDS,
+    TEXT,
+    extract,
+    paths_spec,
+    schema_spec,
+    write_back,
+)
+
+
+class TestTranslatableFields:
+    """Test spec compilation, extraction and write-back."""
+
+    def test_paths_spec(self):
+        """Field paths compile into a nested spec."""
+        assert paths_spec(["[].name", "[].keywords[]"]) == [{"name": TEXT, "keywords": [TEXT]}]
+        assert paths_spec(["sources[].title", "sources[].snippet"]) == {
+            "sources": [{"title": TEXT, "snippet": TEXT}]
+        }
+
+    def test_schema_spec_skips_non_text(self):
+        """Numbers, enums and excluded paths are not translatable; free-form objects are maps."""
+        schema = {
+            "type": "object",
+            "properties": {
+                "title": {"type": "string"},
+                "year": {"type": "integer"},
+                "kind": {"type": "string", "enum": ["a", "b"]},
+                "authors": {"type": "array", "items": {"type": "string"}},
+                "refs": {"type": "array", "items": {
+                    "type": "object",
+                    "properties": {"citation": {"type": "string"}, "note": {"type": "string"}}
+                }},
+                "glossary": {"type": "object"},
+            }
+        }
+
+        spec = schema_spec(schema, exclude=["authors", "refs[].citation"])
+
+        assert spec == {"title": TEXT, "refs": [{"note": TEXT}], "glossary": {ANY_KEY: TEXT}}
+
+    def test_paper_analysis_covers_all_text_sections(self):
+        """qa_pairs, plain_summary and glossary definitions are extracted; metadata is not."""
+        analysis = {
+            "title": "Title",
+            "authors": ["Ada Lovelace"],
+            "year": 2020,
+            "citation": "Lovelace, A. (2020)",
+            "plain_summary": "Plain",
+            "results": {"key_findings": ["one", "", "three"]},
+            "glossary": {"GAN": "Generative adversarial network"},
+            "qa_pairs": [{"question": "Why?", "answer": "Because"}],
+            "paper_type": "ml",
+        }
+
+        paths = [path for path, _ in extract(analysis, PAPER_ANALYSIS_FIELDS)]
+
+        assert paths == [
+            ("title",),
+            ("results", "key_findings", 0),
+            ("results", "key_findings", 2),
+            ("glossary", "GAN"),
+            ("qa_pairs", 0, "question"),
+            ("qa_pairs", 0, "answer"),
+            ("plain_summary",),
+        ]
+
+    def test_write_back_round_trip(self):
+        """Translations are stored at the extracted paths; other fields are untouched."""
+        result = {
+            "sources": [{"title": "A", "url": "https://a"}],
+            "flagged_sections": [{"text": "copied", "similarity": 91.0}],
+            "unexpected": "kept",
+        }
+
+        leaves = extract(result, PLAGIARISM_FIELDS)
+        write_back(result, [path for path, _ in leaves], [text.upper() for _, text in leaves])
+
+        assert result == {
+            "sources": [{"title": "A", "url": "https://a"}],
+            "flagged_sections": [{"text": "COPIED", "similarity": 91.0}],
+            "unexpected": "kept",
+        }
+
+    def test_type_mismatches_are_skipped(self):
+        """Payloads that do not match the spec yield nothing instead of failing."""
+        assert extract({"glossary": ["not", "a", "map"], "results": "text"}, PAPER_ANALYSIS_FIELDS) == []
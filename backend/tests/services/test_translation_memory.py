@@ -0,0 +1,45 @@
+"""Unit tests for the translation memory."""
+import pytest
+from app.services.translation_memory import TranslationMemory, normalize_segment, segment_key
+
+
+@pytest.fixture
+def memory(tmp_path):
+    """Create a translation memory backed by a temporary database."""
+    tm = TranslationMemory(path=str(tmp_path / "tm.db"), max_entries=2, max_mb=64)
+    yield tm
+    tm.close()
+
+
+class TestTranslationMemory:
+    """Test segment storage and lookup."""
+
+    def test_keys_use_normalized_segments(self):
+        """Whitespace differences map to the same key; language pairs do not."""
+        assert normalize_segment("  Deep\n learning ") == "Deep learning"
+        assert segment_key("en", "hi", "Deep learning") == segment_key("en", "hi", " Deep  learning")
+        assert segment_key("en", "hi", "Deep learning") != segment_key("en", "ta", "Deep learning")
+
+    def test_roundtrip(self, memory):
+        """Stored segments are found for the same language pair only."""
+        memory.put_many("en", "es", {"Nature": "Naturaleza", "Science": "Ciencia"})
+
+        assert memory.get_many("en", "es", ["Nature", "Cell"]) == {"Nature": "Naturaleza"}
+        assert memory.get_many("en", "fr", ["Nature"]) == {}
+
+    def test_persists_beyond_lru(self, memory, tmp_path):
+        """Segments evicted from the LRU, or stored by another process, come from SQLite."""
+        memory.put_many("en", "es", {"a": "A", "b": "B", "c": "C"})
+        assert len(memory._lru) == 2
+
+        other = TranslationMemory(path=str(tmp_path / "tm.db"), max_entries=10)
+        assert other.get_many("en", "es", ["a", "b", "c"]) == {"a": "A", "b": "B", "c": "C"}
+        other.close()
+
+    def test_lru_only(self):
+        """An empty path keeps the memory in-process."""
+        memory = TranslationMemory(path="", max_entries=10)
+        memory.put_many("en", "es", {"Nature": "Naturaleza"})
+
+        assert memory.get_many("en", "es", ["Nature"]) == {"Nature": "Naturaleza"}
+        assert memory._conn is None
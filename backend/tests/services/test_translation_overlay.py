@@ -0,0 +1,47 @@
+"""Unit tests for sparse translation overlays."""
+from app.services.translation_overlay import apply_overlay, json_pointer, parse_pointer
+
+
+DOCUMENT = {
+    "title": "Title",
+    "results": {"key_findings": ["one", "two"], "n": 42},
+    "tables": [{"caption": "Table 1", "rows": [[1, 2]]}],
+    "glossary": {"a/b": "definition"},
+}
+
+
+class TestTranslationOverlay:
+    """Test pointer encoding and lazy merging."""
+
+    def test_pointer_round_trip(self):
+        """Keys containing '/' and '~' are escaped per RFC 6901."""
+        pointer = json_pointer(["glossary", "a/b~c", 0])
+
+        assert pointer == "/glossary/a~1b~0c/0"
+        assert parse_pointer(pointer) == ["glossary", "a/b~c", "0"]
+
+    def test_merge_copies_only_translated_paths(self):
+        """Translated containers are copied; everything else is shared and base is untouched."""
+        merged = apply_overlay(DOCUMENT, {
+            "/title": "Titre",
+            "/results/key_findings/1": "deux",
+            "/glossary/a~1b": "définition",
+        })
+
+        assert merged["title"] == "Titre"
+        assert merged["results"]["key_findings"] == ["one", "deux"]
+        assert merged["results"]["n"] == 42
+        assert merged["glossary"] == {"a/b": "définition"}
+        assert merged["tables"] is DOCUMENT["tables"]
+        assert DOCUMENT["title"] == "Title"
+        assert DOCUMENT["results"]["key_findings"] == ["one", "two"]
+
+    def test_unresolvable_pointers_are_ignored(self):
+        """Pointers that no longer match the document do not change its shape."""
+        merged = apply_overlay(DOCUMENT, {"/missing/x": "y", "/results/key_findings/9": "z", "/title/0": "t"})
+
+        assert merged == DOCUMENT
+
+    def test_empty_overlay_returns_base(self):
+        """No overlay means no copy at all."""
+        assert apply_overlay(DOCUMENT, {}) is DOCUMENT
@@ -0,0 +1,110 @@
+"""Unit tests for speculative translation prefetch."""
+import asyncio
+import pytest
+from app.core.bulkhead import Bulkhead
+from app.core.http_clients import HTTPClientRegistry
+from app.services.translation_prefetch import TranslationPrefetcher
+
+
+@pytest.fixture
+def registry():
+    registry = HTTPClientRegistry()
+    registry.bulkheads["openrouter"] = Bulkhead("openrouter", max_concurrent=2, max_wait=5.0)
+    return registry
+
+
+def make_prefetcher(registry, translated, user_languages=(), default_languages=("hi",)):
+    async def translate(paper_id, language):
+        translated.append((paper_id, language))
+
+    prefetcher = TranslationPrefetcher(
+        translate,
+        http_clients=registry,
+        default_languages=list(default_languages),
+        idle_poll_seconds=0.01
+    )
+    prefetcher._user_languages = lambda paper_id: list(user_languages)
+    return prefetcher
+
+
+class TestTranslationPrefetcher:
+    """Test background pre-translation of processed papers."""
+
+    @pytest.mark.asyncio
+    async def test_prefetches_user_and_default_languages(self, registry):
+        """Uploader languages come first, defaults follow, English and duplicates are skipped."""
+        translated = []
+        prefetcher = make_prefetcher(registry, translated, user_languages=["es", "en", "hi"])
+
+        prefetcher.schedule("p1")
+        await prefetcher.join()
+        await prefetcher.stop()
+
+        assert translated == [("p1", "es"), ("p1", "hi")]
+
+    @pytest.mark.asyncio
+    async def test_waits_for_foreground_work(self, registry):
+        """Nothing is translated while a foreground analysis holds the openrouter bulkhead."""
+        translated = []
+        prefetcher = make_prefetcher(registry, translated)
+
+        async with registry.bulkhead("openrouter"):
+            prefetcher.schedule("p1")
+            await asyncio.sleep(0.05)
+            assert translated == []
+
+        await asyncio.wait_for(prefetcher.join(), timeout=1)
+        await prefetcher.stop()
+        assert translated == [("p1", "hi")]
+
+    @pytest.mark.asyncio
+    async def test_slot_waits_for_foreground_per_request(self, registry):
+        """Each prefetch request starts only while the foreground is idle, one at a time."""
+        prefetcher = make_prefetcher(registry, [])
+        in_flight = {"now": 0, "max": 0}
+
+        async def request():
+            async with prefetcher.slot:
+                in_flight["now"] += 1
+                in_flight["max"] = max(in_flight["max"], in_flight["now"])
+                await asyncio.sleep(0.01)
+                in_flight["now"] -= 1
+
+        async with registry.bulkhead("openrouter"):
+            tasks = [asyncio.create_task(request()) for _ in range(3)]
+            await asyncio.sleep(0.05)
+            assert in_flight["max"] == 0
+
+        await asyncio.wait_for(asyncio.gather(*tasks), timeout=1)
+        assert in_flight["max"] == 1
+
+    @pytest.mark.asyncio
+    async def test_failures_do_not_stop_the_worker(self, registry):
+        """A failed language is skipped and later papers are still prefetched."""
+        translated = []
+
+        async def translate(paper_id, language):
+            if paper_id == "bad":
+                raise RuntimeError("paper not found")
+            translated.append((paper_id, language))
+
+        prefetcher = make_prefetcher(registry, translated)
+        prefetcher.translate = translate
+
+        prefetcher.schedule("bad")
+        prefetcher.schedule("p2")
+        await prefetcher.join()
+        await prefetcher.stop()
+
+        assert translated == [("p2", "hi")]
+
+    @pytest.mark.asyncio
+    async def test_unknown_user_falls_back_to_defaults(self, registry):
+        """Profile lookup errors (e.g. demo users) only use the default languages."""
+        prefetcher = make_prefetcher(registry, [])
+
+        def lookup(paper_id):
+            raise ValueError("invalid input syntax for type uuid")
+
+        prefetcher._user_languages = lookup
+        assert await prefetcher.languages_for("p1") == ["hi"]
@@ -0,0 +1,211 @@
+"""Unit tests for translation provider routing."""
+import asyncio
+import pytest
+from concurrent.futures import ThreadPoolExecutor
+from app.core.bulkhead import Bulkhead
+from app.core.exceptions import UpstreamUnavailableError
+from app.core.http_clients import HTTPClientRegistry, http_clients
+from app.services.gemini_service_v2 import calculate_translation_max_tokens
+from app.services.translation_memory import TranslationMemory
+from app.services.translation_providers import (
+    GeminiTranslationProvider,
+    GoogleTranslateProvider,
+    TranslationProvider,
+    TranslationProviderRouter,
+)
+from app.services.translation_service import TranslationService
+
+
+class FakeProvider(TranslationProvider):
+    """Provider that tags its output and can be made slow or failing."""
+
+    def __init__(self, name, delay=0.0, fail=False, max_chars=5000, configured=True, seconds_per_char=0.001):
+        self.name = name
+        self.upstream = name
+        self.delay = delay
+        self.fail = fail
+        self.max_chars = max_chars
+        self.default_seconds_per_char = seconds_per_char
+        self._configured = configured
+        self.calls = []
+
+    @property
+    def configured(self):
+        return self._configured
+
+    async def translate(self, source, target, text):
+        self.calls.append(text)
+        await asyncio.sleep(self.delay)
+        if self.fail:
+            raise RuntimeError(f"{self.name} down")
+        return f"{self.name}:{text}"
+
+
+@pytest.fixture
+def registry():
+    registry = HTTPClientRegistry(upstreams={})
+    registry.bulkheads = {
+        "fast": Bulkhead("fast", 2, 1.0),
+        "slow": Bulkhead("slow", 2, 1.0),
+    }
+    return registry
+
+
+class TestTranslationProviderRouter:
+    """Test provider ranking and failover."""
+
+    @pytest.mark.asyncio
+    async def test_prefers_lower_prior_latency(self, registry):
+        """Without observations, the provider with the faster prior wins."""
+        fast = FakeProvider("fast", seconds_per_char=0.0002)
+        slow = FakeProvider("slow", seconds_per_char=0.001)
+        router = TranslationProviderRouter([slow, fast], http_clients=registry)
+
+        assert await router.translate("en", "es", "hello") == "fast:hello"
+        assert slow.calls == []
+
+    @pytest.mark.asyncio
+    async def test_observed_latency_shifts_traffic(self, registry):
+        """A provider that turns out slow loses traffic to the other one."""
+        google = FakeProvider("fast", delay=0.05, seconds_per_char=0.0002)
+        gemini = FakeProvider("slow", seconds_per_char=0.001)
+        router = TranslationProviderRouter([google, gemini], http_clients=registry)
+
+        await router.translate("en", "es", "hello")
+        assert await router.translate("en", "es", "hello") == "slow:hello"
+
+    @pytest.mark.asyncio
+    async def test_fails_over_to_next_provider(self, registry):
+        """A failing provider's request is retried on the next one."""
+        broken = FakeProvider("fast", fail=True, seconds_per_char=0.0002)
+        backup = FakeProvider("slow")
+        router = TranslationProviderRouter([broken, backup], http_clients=registry)
+
+        assert await router.translate("en", "es", "hello") == "slow:hello"
+        assert router.stats["fast"].error_rate() == 1.0
+
+    @pytest.mark.asyncio
+    async def test_open_breaker_skips_provider(self, registry):
+        """Once a provider's circuit opens, it is not called at all."""
+        broken = FakeProvider("fast", fail=True)
+        router = TranslationProviderRouter([broken], http_clients=registry)
+
+        for _ in range(5):
+            with pytest.raises(RuntimeError):
+                await router.translate("en", "es", "hello")
+
+        assert router.breakers["fast"].state == "open"
+        with pytest.raises(UpstreamUnavailableError):
+            await router.translate("en", "es", "hello")
+        assert len(broken.calls) == 5
+
+    def test_payload_size_and_configuration_filter_providers(self, registry):
+        """Providers that cannot take the payload, or lack credentials, are skipped."""
+        small = FakeProvider("fast", max_chars=100, seconds_per_char=0.0002)
+        unconfigured = FakeProvider("slow", configured=False)
+        large = FakeProvider("large", max_chars=10000)
+        router = TranslationProviderRouter([small, unconfigured, large], http_clients=registry)
+
+        assert router.rank(50) == [small, large]
+        assert router.rank(500) == [large]
+
+    def test_saturated_bulkhead_is_deprioritized(self, registry):
+        """Calls queued on a provider's bulkhead raise its expected time."""
+        fast = FakeProvider("fast", seconds_per_char=0.0002)
+        slow = FakeProvider("slow", seconds_per_char=0.0005)
+        router = TranslationProviderRouter([fast, slow], http_clients=registry)
+
+        registry.bulkheads["fast"].waiting = 6
+
+        assert router.rank(1000) == [slow, fast]
+
+    @pytest.mark.asyncio
+    async def test_all_providers_failing_raises(self, registry):
+        """The last provider error is raised when nothing succeeds."""
+        router = TranslationProviderRouter([FakeProvider("fast", fail=True)], http_clients=registry)
+
+        with pytest.raises(RuntimeError):
+            await router.translate("en", "es", "hello")
+
+        router = TranslationProviderRouter([FakeProvider("fast", configured=False)], http_clients=registry)
+        with pytest.raises(UpstreamUnavailableError):
+            await router.translate("en", "es", "hello")
+
+
+class TestGoogleTranslateProvider:
+    """Test the Google provider's isolation."""
+
+    def test_base_class_is_abstract(self):
+        """Providers must implement translate()."""
+        with pytest.raises(TypeError):
+            TranslationProvider()
+
+    @pytest.mark.asyncio
+    async def test_uses_injected_registry_bulkhead(self):
+        """Calls take slots from the injected registry, not the global one."""
+        registry = HTTPClientRegistry(upstreams={})
+        registry.bulkheads = {"google_translate": Bulkhead("google_translate", 1, 0.01)}
+        executor = ThreadPoolExecutor(max_workers=1)
+        provider = GoogleTranslateProvider(lambda source, target, text: text.upper(), lambda: executor, registry)
+
+        try:
+            assert await provider.translate("en", "es", "hola") == "HOLA"
+            async with registry.bulkhead("google_translate"):
+                with pytest.raises(UpstreamUnavailableError):
+                    await provider.translate("en", "es", "hola")
+        finally:
+            executor.shutdown()
+
+    def test_service_passes_its_registry(self):
+        """TranslationService wires its registry into the provider and router."""
+        registry = HTTPClientRegistry(upstreams={})
+        service = TranslationService(http_clients=registry)
+
+        assert service.router.http_clients is registry
+        google = [p for p in service.router.providers if isinstance(p, GoogleTranslateProvider)]
+        assert all(p.http_clients is registry for p in google)
+
+
+class TestGeminiTranslationProvider:
+    """Test the Gemini provider's limits."""
+
+    def test_uses_its_own_bulkhead(self):
+        """Translation does not take slots from paper analysis."""
+        provider = GeminiTranslationProvider()
+
+        assert provider.upstream != "openrouter"
+        assert http_clients.bulkhead(provider.upstream) is not http_clients.bulkhead("openrouter")
+
+    def test_largest_request_fits_the_token_budget(self):
+        """A full-size request in a non-Latin script cannot be truncated."""
+        text = "अ" * GeminiTranslationProvider.max_chars
+
+        assert calculate_translation_max_tokens(text) >= 2 * len(text)
+        assert calculate_translation_max_tokens("short") == 1000
+
+
+class TestBatchFailover:
+    """Test failover inside TranslationService batches."""
+
+    @pytest.mark.asyncio
+    async def test_batch_fails_over_chunk_by_chunk(self, registry):
+        """Chunks the first provider fails on are translated by the second."""
+
+        class Flaky(FakeProvider):
+            async def translate(self, source, target, text):
+                self.calls.append(text)
+                if "b" in text:
+                    raise RuntimeError("rate limited")
+                return text.upper()
+
+        service = TranslationService(translation_memory=TranslationMemory(path=""))
+        primary = Flaky("fast", seconds_per_char=0.0002)
+        backup = FakeProvider("slow")
+        service.router = TranslationProviderRouter([primary, backup], http_clients=registry)
+
+        texts = ["a" * 3000, "b" * 3000, "c" * 3000]
+        result = await service.translate_batch(texts, "es")
+
+        assert result == ["A" * 3000, "slow:" + "b" * 3000, "C" * 3000]
+        assert backup.calls == ["b" * 3000]
+        service.shutdown()
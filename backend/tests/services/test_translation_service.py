@@ -0,0 +1,189 @@
+"""Unit tests for translation service."""
+import threading
+import time
+import pytest
+from unittest.mock import patch
+from app.services.translation_memory import TranslationMemory
+from app.services.translatable_fields import paths_spec
+from app.services.translation_service import TranslationService, _split_segments
+
+
+@pytest.fixture
+def translation_service():
+    """Create translation service instance."""
+    service = TranslationService(translation_memory=TranslationMemory(path=""))
+    yield service
+    service.shutdown()
+
+
+def fake_translate(source, target, text):
+    """Upper-case 'translation' that takes a while, like a network call."""
+    time.sleep(0.05)
+    return text.upper()
+
+
+class TestTranslationService:
+    """Test Google Translate batching."""
+
+    @pytest.mark.asyncio
+    async def test_translate_text_runs_in_thread_pool(self, translation_service):
+        """Blocking translator calls run off the event loop thread."""
+        threads = []
+
+        def translate(source, target, text):
+            threads.append(threading.current_thread().name)
+            return "hola"
+
+        with patch.object(TranslationService, "_google_translate", side_effect=translate):
+            result = await translation_service.translate_text("hello", "es")
+
+        assert result == "hola"
+        assert threads[0].startswith("translate")
+
+    @pytest.mark.asyncio
+    async def test_batch_chunks_run_concurrently_in_order(self, translation_service):
+        """Chunks are translated in parallel and results keep input order."""
+        texts = [f"segment {i} " + "x" * 1500 for i in range(8)]
+
+        with patch.object(TranslationService, "_google_translate", side_effect=fake_translate) as mock_translate:
+            started = time.monotonic()
+            result = await translation_service.translate_batch(texts, "es")
+            elapsed = time.monotonic() - started
+
+        assert result == [t.upper() for t in texts]
+        assert mock_translate.call_count == 4  # 2 segments per 4500-char chunk
+        assert elapsed < 4 * 0.05
+
+    @pytest.mark.asyncio
+    async def test_failed_chunk_keeps_originals(self, translation_service):
+        """A failing chunk falls back to its original texts without affecting others."""
+        texts = ["a" * 3000, "b" * 3000]
+
+        def translate(source, target, text):
+            if text.startswith("a"):
+                raise RuntimeError("boom")
+            return text.upper()
+
+        with patch.object(TranslationService, "_google_translate", side_effect=translate):
+            result = await translation_service.translate_batch(texts, "es")
+
+        assert result == ["a" * 3000, "B" * 3000]
+
+    @pytest.mark.asyncio
+    async def test_translation_memory_skips_known_segments(self, translation_service):
+        """Segments translated before are served from memory, not upstream."""
+        with patch.object(TranslationService, "_google_translate", side_effect=fake_translate) as mock_translate:
+            await translation_service.translate_batch(["Nature", "Science"], "es")
+            result = await translation_service.translate_batch(["Science", "Cell", "Nature "], "es")
+
+        assert result == ["SCIENCE", "CELL", "NATURE"]
+        assert mock_translate.call_count == 2
+        assert mock_translate.call_args.args[2] == "Cell"
+
+    @pytest.mark.asyncio
+    async def test_failed_translations_are_not_remembered(self, translation_service):
+        """Originals kept after a failure are retried on the next request."""
+        with patch.object(TranslationService, "_google_translate", side_effect=RuntimeError("down")):
+            assert await translation_service.translate_batch(["Nature"], "es") == ["Nature"]
+
+        with patch.object(TranslationService, "_google_translate", side_effect=fake_translate):
+            assert await translation_service.translate_batch(["Nature"], "es") == ["NATURE"]
+
+    @pytest.mark.asyncio
+    async def test_duplicate_segments_are_sent_once(self, translation_service):
+        """Repeated segments are translated once and fanned back out in place."""
+        texts = ["Nature", "", "Nature", "Science", "Nature"]
+
+        with patch.object(TranslationService, "_google_translate", side_effect=fake_translate) as mock_translate:
+            result = await translation_service.translate_batch(texts, "es")
+
+        assert result == ["NATURE", "", "NATURE", "SCIENCE", "NATURE"]
+        assert mock_translate.call_count == 1
+        assert mock_translate.call_args.args[2] == "[[0]] Nature\n\n[[1]] Science"
+
+    @pytest.mark.asyncio
+    async def test_translate_fields_single_batch(self, translation_service):
+        """Fields across a nested response are translated in one batch and written back by path."""
+        result = {
+            "sources": [
+                {"title": "Source A", "snippet": "snippet a", "url": "https://a"},
+                {"title": "Source A", "snippet": ""},
+            ],
+            "flagged_sections": [{"text": "copied text", "source": "Source A", "similarity": 91.0}],
+            "originality_score": 70.0,
+        }
+
+        with patch.object(TranslationService, "_google_translate", side_effect=fake_translate) as mock_translate:
+            await translation_service.translate_fields(
+                result,
+                paths_spec(["sources[].title", "sources[].snippet", "flagged_sections[].text",
+                            "flagged_sections[].source", "flagged_sections[].snippet", "missing[].field"]),
+                target_language="es"
+            )
+
+        assert mock_translate.call_count == 1
+        assert result["sources"][0] == {"title": "SOURCE A", "snippet": "SNIPPET A", "url": "https://a"}
+        assert result["sources"][1] == {"title": "SOURCE A", "snippet": ""}
+        assert result["flagged_sections"][0]["text"] == "COPIED TEXT"
+        assert result["flagged_sections"][0]["source"] == "SOURCE A"
+        assert result["originality_score"] == 70.0
+
+    @pytest.mark.asyncio
+    async def test_translate_fields_root_list(self, translation_service):
+        """Root-level lists and lists of strings are supported."""
+        journals = [{"name": "Nature", "keywords": ["physics", "biology"]}]
+
+        with patch.object(TranslationService, "_google_translate", side_effect=fake_translate):
+            await translation_service.translate_fields(journals, paths_spec(["[].name", "[].keywords[]"]), "es")
+
+        assert journals == [{"name": "NATURE", "keywords": ["PHYSICS", "BIOLOGY"]}]
+
+    def test_split_segments_finds_damaged_ranges(self):
+        """Clean segments are kept; lost or merged markers mark only their range."""
+        parts, bad = _split_segments("[[0]] uno\n\n[[1]] dos [2] tres\n\n［［３］］ cuatro", 4)
+
+        assert parts == ["uno", None, None, "cuatro"]
+        assert bad == [(1, 3)]
+
+        parts, bad = _split_segments("no markers at all", 3)
+        assert parts == [None, None, None]
+        assert bad == [(0, 3)]
+
+    @pytest.mark.asyncio
+    async def test_marker_mismatch_retries_only_affected_range(self, translation_service):
+        """A merged marker triggers a retry of just that sub-range, and chunks shrink."""
+        texts = ["one", "two", "three", "four"]
+        requests = []
+
+        def translate(source, target, text):
+            requests.append(text)
+            if len(requests) == 1:
+                # Google merged segments 1 and 2 and dropped marker [[2]]
+                return "[[0]] ONE\n\n[[1]] TWO THREE\n\n[[3]] FOUR"
+            return text.upper()
+
+        with patch.object(TranslationService, "_google_translate", side_effect=translate):
+            result = await translation_service.translate_batch(texts, "es")
+
+        assert result == ["ONE", "TWO", "THREE", "FOUR"]
+        assert sorted(requests[1:]) == ["three", "two"]
+        assert translation_service.chunk_chars < translation_service.max_chunk_chars
+
+    @pytest.mark.asyncio
+    async def test_text_already_in_target_language_is_not_sent(self, translation_service):
+        """English typed with a non-English UI skips the upstream call."""
+        with patch.object(TranslationService, "_google_translate", side_effect=fake_translate) as mock_translate:
+            query = await translation_service.translate_text(
+                "graph neural networks for molecule generation", target_language="en", source_language="hi"
+            )
+            batch = await translation_service.translate_batch(
+                ["federated learning with differential privacy", "मशीन लर्निंग"],
+                target_language="en",
+                source_language="hi"
+            )
+
+        assert query == "graph neural networks for molecule generation"
+        assert batch == ["federated learning with differential privacy", "मशीन लर्निंग"]
+        assert mock_translate.call_count == 1
+        assert mock_translate.call_args.args[2] == "मशीन लर्निंग"
+        assert translation_service.skip_rate() > 0
@@ -12,6 +12,20 @@ import { useLingo } from '@/lib/useLingo';
 import { FileText, Upload, Loader2, Calendar, Users, ArrowRight, Sparkles } from 'lucide-react';
 import { Input } from '@/components/ui/input';
 
+// Analysis job polling: every 3s, for at most 10 minutes per job
+const JOB_POLL_INTERVAL_MS = 3000;
+const JOB_POLL_TIMEOUT_MS = 10 * 60 * 1000;
+
+interface AnalysisJob {
+  job_id: string;
+  status: 'queued' | 'running' | 'done' | 'failed';
+  error?: string | null;
+}
+
+interface TrackedJob extends AnalysisJob {
+  polledSince: number;
+}
+
 interface Paper {
   id: string;
   file_name: string;
@@ -24,8 +38,11 @@ interface Paper {
   year?: number;
   authors?: string[];
   venue?: string;
+  job?: AnalysisJob | null;
 }
 
+const isPending = (job?: AnalysisJob | null) => job?.status === 'queued' || job?.status === 'running';
+
 export default function PapersPage() {
   const apiClient = useAuthenticatedAPI();
   const router = useRouter();
@@ -35,20 +52,71 @@ export default function PapersPage() {
   const [uploading, setUploading] = useState(false);
   const [error, setError] = useState('');
   const [selectedFile, setSelectedFile] = useState<File | null>(null);
+  const [jobs, setJobs] = useState<Record<string, TrackedJob>>({});
 
   useEffect(() => {
     fetchPapers();
   }, []);
 
-  const fetchPapers = async () => {
-    setLoading(true);
+  // Poll pending analysis jobs in the background, without blocking uploads
+  useEffect(() => {
+    const active = Object.entries(jobs).filter(
+      ([, job]) => isPending(job) && Date.now() - job.polledSince < JOB_POLL_TIMEOUT_MS
+    );
+    if (active.length === 0) return;
+
+    const timer = setTimeout(async () => {
+      const updates = await Promise.all(
+        active.map(async ([paperId, job]): Promise<[string, TrackedJob]> => {
+          try {
+            const current: any = await apiClient.getJob(job.job_id);
+            return [paperId, { ...job, status: current.status, error: current.error }];
+          } catch {
+            return [paperId, { ...job }];
+          }
+        })
+      );
+
+      setJobs((prev) => ({ ...prev, ...Object.fromEntries(updates) }));
+
+      const failed = updates.find(([, job]) => job.status === 'failed');
+      if (failed) {
+        setError(failed[1].error || 'Processing failed');
+      }
+      if (updates.some(([, job]) => !isPending(job))) {
+        await fetchPapers({ quiet: true });
+      }
+    }, JOB_POLL_INTERVAL_MS);
+
+    return () => clearTimeout(timer);
+  }, [jobs]);
+
+  const jobFor = (paper: Paper): AnalysisJob | null | undefined => jobs[paper.id] || paper.job;
+
+  const trackJobs = (pending: Paper[]) => {
+    const now = Date.now();
+    setJobs((prev) => {
+      const next = { ...prev };
+      for (const paper of pending) {
+        if (paper.job && isPending(paper.job) && !prev[paper.id]) {
+          next[paper.id] = { ...paper.job, polledSince: now };
+        }
+      }
+      return next;
+    });
+  };
+
+  const fetchPapers = async ({ quiet = false }: { quiet?: boolean } = {}) => {
+    if (!quiet) setLoading(true);
     try {
       const response: any = await apiClient.listPapers({ language: locale });
-      setPapers(response.papers || []);
+      const list: Paper[] = response.papers || [];
+      setPapers(list);
+      trackJobs(list);
     } catch (err: any) {
       setError(err.message || t('errors.generic'));
     } finally {
-      setLoading(false);
+      if (!quiet) setLoading(false);
     }
   };
 
@@ -71,14 +139,18 @@ export default function PapersPage() {
       // Upload the file
       const uploadResponse = await apiClient.uploadPaper(selectedFile, { language: locale });
 
-      // Process immediately
-      await apiClient.processPaper(uploadResponse.id, { language: locale });
+      // Queue analysis right away; it runs in the background and is polled separately
+      const job: any = await apiClient.processPaper(uploadResponse.id, { language: locale });
+      setJobs((prev) => ({
+        ...prev,
+        [uploadResponse.id]: { job_id: job.job_id, status: job.status, error: job.error, polledSince: Date.now() },
+      }));
 
       setSelectedFile(null);
       const fileInput = document.getElementById('file-upload') as HTMLInputElement;
       if (fileInput) fileInput.value = '';
 
-      await fetchPapers();
+      await fetchPapers({ quiet: true });
     } catch (err: any) {
       setError(err.message || 'Upload failed');
     } finally {
@@ -131,7 +203,7 @@ export default function PapersPage() {
                 {uploading ? (
                   <>
                     <Loader2 className="mr-2 h-4 w-4 animate-spin" />
-                    Analyzing...
+                    Uploading...
                   </>
                 ) : (
                   <>
@@ -182,6 +254,15 @@ export default function PapersPage() {
                           <Sparkles className="h-3 w-3 mr-1" />
                           Analyzed
                         </Badge>
+                      ) : jobFor(paper)?.status === 'queued' ? (
+                        <Badge variant="outline">Queued</Badge>
+                      ) : jobFor(paper)?.status === 'running' ? (
+                        <Badge variant="outline">
+                          <Loader2 className="h-3 w-3 mr-1 animate-spin" />
+                          Analyzing
+                        </Badge>
+                      ) : jobFor(paper)?.status === 'failed' ? (
+                        <Badge variant="destructive">Failed</Badge>
                       ) : (
                         <Badge variant="outline">Processing</Badge>
                       )}
@@ -59,6 +59,10 @@ export function useAuthenticatedAPI() {
       return await authenticatedClient.makeRequest(() => apiClient.processPaper(paperId, options));
     },
 
+    getJob: async (jobId: string) => {
+      return await authenticatedClient.makeRequest(() => apiClient.getJob(jobId));
+    },
+
     getPaper: async (paperId: number, options?: { language?: string }) => {
       return await authenticatedClient.makeRequest(() => apiClient.getPaper(paperId, options));
     },
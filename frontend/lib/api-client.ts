@@ -146,6 +146,10 @@ class APIClient {
     });
   }
 
+  async getJob(jobId: string) {
+    return this.request(`/papers-enhanced/jobs/${jobId}`);
+  }
+
   async getPaper(paperId: number, options?: { language?: string }) {
     const queryString = options?.language ? `?language=${options.language}` : '';
     return this.request(`/papers-enhanced/${paperId}${queryString}`);